@@ -1,63 +1,347 @@
 # base_manager.py
 from openai import OpenAI
-from pinecone import Pinecone
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 import logging
 from datetime import datetime
 from config import *
 import re
-from media.utils.text_utils import create_text_chunks
+from media.utils.text_utils import create_text_chunks, iter_text_chunks
+from media.utils.embedding_cache import EmbeddingCache
+from media.utils.embedding_batcher import EmbeddingBatcher
+from media.utils.translation_utils import TranslationService
+from media.utils.vector_writer import BulkVectorWriter
+from media.utils.vector_store import create_vector_store, QueryMatch
+from media.utils.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from media.utils.tag_lexicon import get_tag_lexicon
+from media.utils.constants import (
+    EMBEDDING_MODEL,
+    VECTOR_STORE_BACKEND,
+    TRANSLATION_MODE,
+    DOCUMENT_CHUNK_SIZE,
+    DOCUMENT_CHUNK_OVERLAP,
+    DOCUMENT_EMBED_BATCH_SIZE,
+    VECTOR_WRITE_BATCH_SIZE,
+    LEXICAL_MIN_SCORE
+)
 from config import PINECONE_NAMESPACE
 import hashlib
 import os
+import threading
+from collections import defaultdict
 
 class BaseManager:
     def __init__(self, openai_api_key: str):
         # OpenAI 클라이언트 초기화
         self.client = OpenAI(api_key=openai_api_key)
+
+        # 임베딩 캐시 초기화 (메모리 LRU + 디스크)
+        self.embedding_cache = EmbeddingCache()
+
+        # 여러 스레드의 임베딩 요청을 모아 한 번에 보내는 마이크로 배처
+        self.embedding_batcher = EmbeddingBatcher(self._request_embeddings)
+
+        # 번역 메모리를 거치는 번역 서비스 (캡션/태그 번역 공용)
+        self.translator = TranslationService(self.client)
         
-        # Pinecone 초기화
+        # 벡터 저장소 초기화 (Pinecone 또는 로컬 저장소)
         try:
-            self.pc = Pinecone(api_key=PINECONE_API_KEY)
-            existing_indexes = self.pc.list_indexes().names()
-            
-            if PINECONE_INDEX_NAME not in existing_indexes:
-                print(f"인덱스 '{PINECONE_INDEX_NAME}' 생성 중...")
-                self.pc.create_index(
-                    name=PINECONE_INDEX_NAME,
-                    dimension=1536,
-                    metric='cosine',
-                    spec={"serverless": {"cloud": "aws", "region": "us-west-2"}}
-                )
-                print("인덱스 생성 완료")
-            
-            self.index = self.pc.Index(PINECONE_INDEX_NAME)
-            print("Pinecone 연결 성공")
+            self.vector_store = create_vector_store()
             
         except Exception as e:
-            print(f"Pinecone 초기화 실패: {str(e)}")
+            print(f"벡터 저장소 초기화 실패: {str(e)}")
             print("상세 오류:")
+            print(f"- 백엔드: {VECTOR_STORE_BACKEND}")
             print(f"- API 키: {'설정됨' if PINECONE_API_KEY else '설정되지 않음'}")
             print(f"- 인덱스 이름: {PINECONE_INDEX_NAME}")
-            self.pc = None
-            self.index = None
+            self.vector_store = None
+
+        # 네임스페이스별 쓰기 세대 (업서트/삭제 시 증가, 검색 캐시 무효화용)
+        self._generations = defaultdict(int)
+        self._generation_lock = threading.Lock()
+
+        # 캡션/태그/OCR/문서 청크 어휘 색인 (하이브리드 검색용)
+        self.lexical_index = LexicalIndex()
+        # 기존 벡터 어휘 색인 백필 상태 (/ready에 보고) 및 백필과 삭제가 겹치지 않게 하는 잠금
+        self.lexical_backfill = {'state': 'idle', 'indexed': 0, 'error': None}
+        self._lexical_lock = threading.Lock()
+
+        # 벡터를 모아 배치로 업서트하는 쓰기 버퍼
+        self.vector_writer = BulkVectorWriter(
+            self.vector_store,
+            on_flush=self._on_vectors_written
+        )
+
+    def get_generation(self, namespace: str = PINECONE_NAMESPACE) -> int:
+        """네임스페이스의 현재 쓰기 세대"""
+        with self._generation_lock:
+            return self._generations[namespace]
+
+    def bump_generation(self, namespace: str = PINECONE_NAMESPACE):
+        """네임스페이스 내용이 바뀌었음을 기록 (캐시된 검색 결과 무효화)"""
+        with self._generation_lock:
+            self._generations[namespace] += 1
+
+    def _on_vectors_written(self, namespace: str, batch: List[Dict]):
+        """업서트 완료된 배치를 어휘 색인에 반영하고 쓰기 세대 증가"""
+        self.lexical_index.add_vectors(namespace, batch)
+        self.bump_generation(namespace)
+
+    def write_vectors(self, vectors: List[Dict]):
+        """벡터를 쓰기 버퍼에 추가 (배치 단위로 업서트됨)"""
+        self.vector_writer.add(vectors, PINECONE_NAMESPACE)
+
+    def track_vectors(self):
+        """
+        with 블록 안에서 현재 스레드가 쓴 벡터 중 업서트가 끝난 것을 file_path별 ID 목록으로 모음 (수집 기록용)
+
+        Yields:
+            dict: file_path → 벡터 ID 목록 (블록이 끝날 때 채워짐, 업서트에 실패한 벡터가 있는 파일은 제외)
+        """
+        return self.vector_writer.track()
+
+    def move_vectors(self, ids: List[str], old_path: str, new_path: str,
+                     namespace: str = PINECONE_NAMESPACE) -> Optional[List[str]]:
+        """
+        이동/이름이 바뀐 파일의 벡터를 새 경로 기준 ID로 옮김 (임베딩은 다시 만들지 않음)
+
+        ID는 경로에서 만들어지므로 예전 ID를 그대로 두면 예전 경로에 새 파일이 생길 때 덮어써진다.
+        벡터를 새 ID로 업서트한 뒤 예전 ID를 삭제한다.
+
+        Returns:
+            list: 새 벡터 ID 목록 (벡터 일부가 없거나 실패하면 None → 다시 처리)
+        """
+        if not ids:
+            return []
+        try:
+            self.vector_writer.flush()
+            fetched = {}
+            for start in range(0, len(ids), VECTOR_WRITE_BATCH_SIZE):
+                fetched.update(self.vector_store.fetch(ids=ids[start:start + VECTOR_WRITE_BATCH_SIZE],
+                                                       namespace=namespace))
+            missing = [vector_id for vector_id in ids if vector_id not in fetched]
+            if missing:
+                logging.error(f"이동할 벡터가 저장소에 없음 ({len(missing)}개): {old_path}")
+                return None
+
+            vectors = [{
+                'id': self.rekey_vector_id(vector_id, old_path, new_path),
+                'values': fetched[vector_id]['values'],
+                'metadata': {**fetched[vector_id]['metadata'], 'file_path': new_path}
+            } for vector_id in ids]
+            for start in range(0, len(vectors), VECTOR_WRITE_BATCH_SIZE):
+                batch = vectors[start:start + VECTOR_WRITE_BATCH_SIZE]
+                self.vector_store.upsert(vectors=batch, namespace=namespace)
+                self.lexical_index.add_vectors(namespace, batch)
+
+            new_ids = [vector['id'] for vector in vectors]
+            stale = [vector_id for vector_id in ids if vector_id not in set(new_ids)]
+            if stale:
+                with self._lexical_lock:
+                    self.vector_store.delete(ids=stale, namespace=namespace)
+                    self.lexical_index.remove(namespace, stale)
+            self.bump_generation(namespace)
+            return new_ids
+        except Exception as e:
+            logging.error(f"벡터 이동 실패 ({len(ids)}개, {old_path} → {new_path}): {str(e)}")
+            return None
+
+    def rekey_vector_id(self, vector_id: str, old_path: str, new_path: str) -> str:
+        """예전 경로에서 만든 벡터 ID를 새 경로 기준 ID로 변환"""
+        old_hash, new_hash = self.path_hash(old_path), self.path_hash(new_path)
+        if vector_id.startswith(f"{old_hash}_"):
+            return new_hash + vector_id[len(old_hash):]
+        if vector_id.startswith(f"{old_path}_"):    # 경로를 그대로 ID로 쓰던 문서 청크
+            return self.create_safe_id(new_path, 'document') + vector_id[len(old_path):]
+        return vector_id
+
+    def flush_vectors(self) -> bool:
+        """버퍼에 남은 벡터를 모두 업서트 (작업 완료 시 호출)"""
+        success = self.vector_writer.flush()
+        print(f"벡터 쓰기 통계: {self.vector_writer.stats()}")
+        return success
+
+    def delete_vectors(self, ids: List[str], namespace: str = PINECONE_NAMESPACE) -> bool:
+        """지정한 벡터를 벡터 저장소와 어휘 색인에서 삭제"""
+        if not ids:
+            return True
+        try:
+            self.vector_writer.flush()
+            with self._lexical_lock:
+                self.vector_store.delete(ids=ids, namespace=namespace)
+                self.lexical_index.remove(namespace, ids)
+            self.bump_generation(namespace)
+            return True
+        except Exception as e:
+            logging.error(f"벡터 삭제 실패 ({len(ids)}개): {str(e)}")
+            return False
+
+    def backfill_lexical_index(self, namespace: str = PINECONE_NAMESPACE) -> Optional[int]:
+        """
+        벡터 저장소에는 있지만 어휘 색인에 없는 벡터를 색인 (어휘 색인 도입 전에 저장된 데이터 등)
+
+        서버가 요청을 받는 중에 백그라운드에서 실행되므로 진행 상태를 lexical_backfill에 기록하고,
+        페이지마다 조회와 색인을 벡터 삭제와 같은 잠금 안에서 해 삭제된 벡터를 다시 색인하지 않는다.
+
+        Returns:
+            int: 새로 색인한 벡터 수 (실패 시 None)
+        """
+        self.lexical_backfill = {'state': 'running', 'indexed': 0, 'error': None}
+        try:
+            added = 0
+            for page in self.vector_store.list_ids(namespace=namespace, page_size=VECTOR_WRITE_BATCH_SIZE):
+                with self._lexical_lock:
+                    indexed = self.lexical_index.indexed_ids(namespace, page)
+                    missing = [vector_id for vector_id in page if vector_id not in indexed]
+                    if not missing:
+                        continue
+                    fetched = self.vector_store.fetch(ids=missing, namespace=namespace)
+                    self.lexical_index.add_vectors(namespace, list(fetched.values()))
+                added += len(fetched)
+                self.lexical_backfill['indexed'] = added
+            if added:
+                self.bump_generation(namespace)
+            self.lexical_backfill['state'] = 'done'
+            logging.info(f"어휘 색인 백필 완료: {added}개 ({namespace})")
+            return added
+        except Exception as e:
+            self.lexical_backfill.update(state='failed', error=str(e))
+            logging.error(f"어휘 색인 백필 실패 ({namespace}): {str(e)}")
+            return None
+
+    def hybrid_query(self, query_text: str, query_embedding: List[float], top_k: int = 10,
+                     filter: Optional[Dict] = None, namespace: str = PINECONE_NAMESPACE) -> List[QueryMatch]:
+        """
+        벡터 검색 + BM25 어휘 검색 결과를 RRF로 합친 하이브리드 검색
+
+        각 검색에서 top_k의 2배 후보를 뽑아 합치며, 반환 항목의 score는 코사인 유사도
+        (어휘 검색에서만 찾은 항목은 0.0), lexical_score는 BM25 점수다.
+        """
+        candidate_k = top_k * 2
+        vector_matches = self.vector_store.query(
+            vector=query_embedding,
+            top_k=candidate_k,
+            namespace=namespace,
+            filter=filter,
+            include_metadata=True
+        ).matches
+        lexical_hits = self.lexical_index.search(namespace, query_text, candidate_k, filter)
+
+        matches = {match.id: match for match in vector_matches}
+        for doc_id, lexical_score, metadata in lexical_hits:
+            if doc_id in matches:
+                matches[doc_id].lexical_score = lexical_score
+            else:
+                matches[doc_id] = QueryMatch(doc_id, 0.0, metadata, lexical_score)
+
+        fused = reciprocal_rank_fusion([
+            [match.id for match in vector_matches],
+            [doc_id for doc_id, _, _ in lexical_hits]
+        ])
+        ranked = sorted(fused, key=fused.get, reverse=True)[:top_k]
+        return [matches[doc_id] for doc_id in ranked]
+
+    def has_lexical_match(self, query_text: str, namespace: str = PINECONE_NAMESPACE,
+                          min_score: float = LEXICAL_MIN_SCORE) -> bool:
+        """검색어와 BM25 점수가 min_score 이상인 어휘 일치가 있는지"""
+        return any(score >= min_score for _, score, _ in self.lexical_index.search(namespace, query_text, 1))
+
+    def search_vectors(self, query_text: str, query_embedding: List[float], top_k: int = 10,
+                       filter: Optional[Dict] = None, namespace: str = PINECONE_NAMESPACE) -> List[QueryMatch]:
+        """
+        검색 진입점
+
+        TRANSLATION_MODE가 'query'면 영어로 저장된 캡션/태그도 찾을 수 있도록 검색어를 영어로
+        번역(번역 메모리 사용)해 한국어/영어 하이브리드 검색 결과를 RRF로 합친다.
+        """
+        matches = self.hybrid_query(query_text, query_embedding, top_k, filter, namespace)
+        if TRANSLATION_MODE != 'query':
+            return matches
+
+        english_query = self.translator.translate_query(query_text)
+        if not english_query or english_query.strip() == query_text.strip():
+            return matches
+        english_embedding = self.create_embedding(english_query)
+        if not english_embedding:
+            return matches
+        english_matches = self.hybrid_query(english_query, english_embedding, top_k, filter, namespace)
+
+        # 같은 벡터는 더 높은 점수를 유지
+        merged = {}
+        for match in matches + english_matches:
+            current = merged.get(match.id)
+            if current is None:
+                merged[match.id] = match
+                continue
+            lexical_scores = [score for score in (current.lexical_score, match.lexical_score) if score is not None]
+            if match.score > current.score:
+                merged[match.id] = current = match
+            current.lexical_score = max(lexical_scores) if lexical_scores else None
+
+        fused = reciprocal_rank_fusion([
+            [match.id for match in matches],
+            [match.id for match in english_matches]
+        ])
+        ranked = sorted(fused, key=fused.get, reverse=True)[:top_k]
+        return [merged[doc_id] for doc_id in ranked]
+
+    def localize_metadata(self, metadatas: List[Dict]) -> List[Dict]:
+        """
+        영어로 저장된 캡션/태그를 표시용 한국어로 번역 ('query' 모드에서 검색 결과에만 적용)
+
+        원문은 caption_en, tags_en에 남기고 번역은 번역 메모리/태그 사전을 거친다.
+        """
+        targets = [index for index, metadata in enumerate(metadatas) if metadata.get('language') == 'en']
+        if not targets:
+            return metadatas
+
+        captions = self.translator.translate_many(
+            [metadatas[index].get('caption', '') for index in targets], is_caption=True
+        )
+        tag_lists = get_tag_lexicon().translate_many(
+            [metadatas[index].get('tags', []) for index in targets],
+            lambda tags: self.translator.translate_many(tags, is_caption=False)
+        )
+
+        localized = list(metadatas)
+        for index, caption, tags in zip(targets, captions, tag_lists):
+            metadata = metadatas[index]
+            localized[index] = {
+                **metadata,
+                'caption': caption,
+                'tags': tags,
+                'caption_en': metadata.get('caption', ''),
+                'tags_en': metadata.get('tags', [])
+            }
+        return localized
 
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """임베딩 API 호출 (결과는 캐시에 저장)"""
+        response = self.client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=texts
+        )
 
+        embeddings = [data.embedding for data in response.data]
+        for text, embedding in zip(texts, embeddings):
+            self.embedding_cache.put(EMBEDDING_MODEL, text, embedding)
+        return embeddings
 
     def create_embedding(self, text: str) -> List[float]:
-        """단일 텍스트의 임베딩 생성"""
+        """단일 텍스트의 임베딩 생성 (캐시 우선 조회)"""
         try:
-            # 임베딩 전 텍스트 출력
-            print("\n=== 임베딩 입력 텍스트 ===")
-            print(text)
-            print("="*50)
-            
-            response = self.client.embeddings.create(
-                model="text-embedding-3-small",  # 모델 변경 가능
-                input=text
-            )
-            
-            embedding = response.data[0].embedding
+            logging.debug(f"임베딩 입력 텍스트: {text[:200]}")
+
+            cached = self.embedding_cache.get(EMBEDDING_MODEL, text)
+            if cached is not None:
+                logging.debug(f"임베딩 캐시 히트 (벡터 크기: {len(cached)})")
+                return cached
+
+            # 단건 요청(검색어 등)은 수집 배치와 따로 우선 전송 (같은 시점의 단건 요청끼리는 묶음)
+            embedding = self.embedding_batcher.submit(text, priority=True).result()
+            if embedding is None:
+                print("임베딩 생성 실패")
+                return None
+
             print(f"임베딩 벡터 크기: {len(embedding)}")
             return embedding
             
@@ -65,115 +349,141 @@ class BaseManager:
             print(f"임베딩 생성 실패: {str(e)}")
             return None
 
+    def create_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """여러 텍스트의 임베딩 생성 (캐시에 없는 텍스트만 배치로 요청, 실패한 항목은 None)"""
+        embeddings = [self.embedding_cache.get(EMBEDDING_MODEL, text) for text in texts]
+
+        futures = {
+            i: self.embedding_batcher.submit(texts[i])
+            for i, embedding in enumerate(embeddings) if embedding is None
+        }
+        for i, future in futures.items():
+            embeddings[i] = future.result()
+
+        print(f"임베딩 {len(texts)}건 생성 (캐시 히트 {len(texts) - len(futures)}건)")
+        return embeddings
+
     def batch_create_embeddings(self, chunks: List[str]) -> List[Dict]:
         """여러 청크의 임베딩 일괄 생성"""
         try:
-            response = self.client.embeddings.create(
-                model="text-embedding-3-small",
-                input=chunks
-            )
+            embeddings = self.create_embeddings(chunks)
+            if any(embedding is None for embedding in embeddings):
+                raise Exception("일부 청크의 임베딩 생성 실패")
             
             return [{
                 'chunk_id': i,
-                'embedding': data.embedding,
+                'embedding': embedding,
                 'text': chunks[i]
-            } for i, data in enumerate(response.data)]
+            } for i, embedding in enumerate(embeddings)]
             
         except Exception as e:
             print(f"임베딩 생성 중 오류: {str(e)}")
             return []
 
+    @staticmethod
+    def path_hash(file_path: str) -> str:
+        """벡터 ID 앞부분으로 쓰는 경로 해시"""
+        return hashlib.md5(file_path.encode()).hexdigest()[:10]
+
     def create_safe_id(self, file_path: str, content_type: str) -> str:
         """안전한 벡터 ID 생성"""
-        # 파일명만 추출 (경로 제외)
-        file_name = os.path.basename(file_path)
-        
         # 파일 경로를 해시로 변환
-        path_hash = hashlib.md5(file_path.encode()).hexdigest()[:10]
+        path_hash = self.path_hash(file_path)
         
         # 안전한 ID 생성: hash_contenttype
         safe_id = f"{path_hash}_{content_type}"
         return safe_id
     
 
+    def _build_image_metadata(self, file_path: str, data: Dict) -> Dict:
+        metadata = {
+            'file_path': data.get('file_url', file_path),
+            'type': 'image',
+            'timestamp': datetime.now().isoformat(),
+            'caption': data.get('caption', ''),
+            'tags': data.get('tags', []),
+            'ocr': data.get('ocr_text', ''),  # null이면 빈 문자열로
+            'language': 'en' if TRANSLATION_MODE == 'query' else 'ko'  # 캡션/태그 언어
+        }
+
+        # OCR이 None인 경우 빈 문자열로 변경
+        if metadata['ocr'] is None:
+            metadata['ocr'] = ''
+        return metadata
+
     def create_image_embedding(self, file_path: str, data: Dict):
         """이미지 임베딩 생성 및 저장"""
-        try:
-            # 메타데이터 구성
-            metadata = {
-                'file_path': data.get('file_url', file_path),
-                'type': 'image',
-                'timestamp': datetime.now().isoformat(),
-                'caption': data.get('caption', ''),
-                'tags': data.get('tags', []),
-                'ocr': data.get('ocr_text', '')  # null이면 빈 문자열로
-            }
+        return self.create_image_embeddings([(file_path, data)])[0]
 
-            # OCR이 None인 경우 빈 문자열로 변경
-            if metadata['ocr'] is None:
-                metadata['ocr'] = ''
+    def create_image_embeddings(self, items: List[tuple]) -> List[bool]:
+        """
+        여러 이미지의 캡션/OCR 임베딩을 한 번에 생성해 저장
 
-            vectors = []
-            vector_id = self.create_safe_id(file_path, 'image')
+        Args:
+            items: (file_path, data) 목록
 
-            # 캡션 임베딩
-            caption_embedding = self.create_embedding(metadata['caption'])
-            if caption_embedding:
-                vectors.append({
-                    'id': vector_id + "_caption",
-                    'values': caption_embedding,
-                    'metadata': metadata
-                })
+        Returns:
+            이미지별 저장 성공 여부
+        """
+        try:
+            # 이미지마다 캡션, OCR(있는 경우) 텍스트를 모아 한 번에 임베딩
+            requests = []
+            for index, (file_path, data) in enumerate(items):
+                metadata = self._build_image_metadata(file_path, data)
+                vector_id = self.create_safe_id(file_path, 'image')
+                requests.append((index, vector_id + "_caption", metadata['caption'], metadata))
+                if metadata['ocr']:
+                    requests.append((index, vector_id + "_ocr", metadata['ocr'], metadata))
+
+            embeddings = self.create_embeddings([text for _, _, text, _ in requests])
 
-            # OCR 텍스트가 있는 경우 OCR 임베딩도 추가
-            if metadata['ocr']:
-                ocr_embedding = self.create_embedding(metadata['ocr'])
-                if ocr_embedding:
+            vectors = []
+            stored = [False] * len(items)
+            for (index, vector_id, _, metadata), embedding in zip(requests, embeddings):
+                if embedding:
                     vectors.append({
-                        'id': vector_id + "_ocr",
-                        'values': ocr_embedding,
+                        'id': vector_id,
+                        'values': embedding,
                         'metadata': metadata
                     })
+                    stored[index] = True
 
             if vectors:
-                self.index.upsert(
-                    vectors=vectors,
-                    namespace=PINECONE_NAMESPACE
-                )
-                return True
-
-            return False
+                self.write_vectors(vectors)
+            return stored
 
         except Exception as e:
             logging.error(f"이미지 임베딩 저장 실패: {str(e)}")
-            return False
+            return [False] * len(items)
+
+    def _build_video_metadata(self, file_url: str, frame_data: Dict) -> Dict:
+        """비디오 프레임 메타데이터 구성"""
+        return {
+            'file_path': file_url,  # 원본 URL 저장
+            'type': 'video',
+            'timestamp': datetime.now().isoformat(),
+            'frame_number': frame_data.get('frame', 0),
+            'video_timestamp': frame_data.get('timestamp', 0.0),
+            'caption': frame_data.get('caption', ''),
+            'tags': frame_data.get('tags', []),
+            'language': 'en' if TRANSLATION_MODE == 'query' else 'ko'  # 캡션/태그 언어
+        }
 
     def create_video_embedding(self, file_url: str, frame_data: Dict):
         """비디오 프레임 임베딩 생성 및 저장"""
         try:
             # 메타데이터 구성
-            metadata = {
-                'file_path': file_url,  # 원본 URL 저장
-                'type': 'video',
-                'timestamp': datetime.now().isoformat(),
-                'frame_number': frame_data.get('frame', 0),
-                'video_timestamp': frame_data.get('timestamp', 0.0),
-                'caption': frame_data.get('caption', ''),
-                'tags': frame_data.get('tags', [])
-            }
+            metadata = self._build_video_metadata(file_url, frame_data)
 
             # 캡션만 임베딩
             embedding = self.create_embedding(metadata['caption'])
             if embedding:
                 vector_id = f"{self.create_safe_id(file_url, 'video')}_{metadata['frame_number']}"
-                self.index.upsert(
-                    vectors=[{
-                        'id': vector_id,
-                        'values': embedding,
-                        'metadata': metadata
-                    }],
-                    namespace=PINECONE_NAMESPACE
-                )
+                self.write_vectors([{
+                    'id': vector_id,
+                    'values': embedding,
+                    'metadata': metadata
+                }])
                 return True
 
             return False
@@ -182,6 +492,31 @@ class BaseManager:
             logging.error(f"비디오 임베딩 저장 실패: {str(e)}")
             return False
 
+    def create_video_embeddings(self, file_url: str, frames: List[Dict]) -> List[Dict]:
+        """여러 비디오 프레임 임베딩을 배치로 생성 및 저장 (저장에 성공한 프레임 목록 반환)"""
+        try:
+            metadatas = [self._build_video_metadata(file_url, frame) for frame in frames]
+            embeddings = self.create_embeddings([metadata['caption'] for metadata in metadatas])
+
+            stored = []
+            vectors = []
+            for frame, metadata, embedding in zip(frames, metadatas, embeddings):
+                if not embedding:
+                    continue
+                vectors.append({
+                    'id': f"{self.create_safe_id(file_url, 'video')}_{metadata['frame_number']}",
+                    'values': embedding,
+                    'metadata': metadata
+                })
+                stored.append(frame)
+
+            self.write_vectors(vectors)
+            return stored
+
+        except Exception as e:
+            logging.error(f"비디오 임베딩 저장 실패: {str(e)}")
+            return []
+
 
     def create_audio_embedding(self, text: str, chunk_index: int = None) -> Dict:
         """오디오 임베딩 생성"""
@@ -252,7 +587,7 @@ class BaseManager:
                 overlap=settings['overlap']
             )
 
-            fixed_chunk_results = []
+            valid_chunks = []
             for i, chunk in enumerate(chunk_results):
                 if isinstance(chunk, str):
                     logging.error(f" 문자열이 청크 리스트에 포함됨! 변환 처리 중...: {chunk}")
@@ -262,7 +597,13 @@ class BaseManager:
                     logging.error(f" 잘못된 데이터 타입 발견: {type(chunk)}")
                     return []
 
-                embedding = self.create_embedding(chunk["text"])
+                valid_chunks.append(chunk)
+
+            # 모든 청크를 한 번에 배치 임베딩
+            embeddings = self.create_embeddings([chunk["text"] for chunk in valid_chunks])
+
+            fixed_chunk_results = []
+            for chunk, embedding in zip(valid_chunks, embeddings):
                 if embedding:
                     chunk["embedding"] = embedding
                     fixed_chunk_results.append(chunk)
@@ -281,7 +622,7 @@ class BaseManager:
 
     def check_stored_data(self):
         try:
-            stats = self.index.describe_index_stats()
+            stats = self.vector_store.describe_index_stats()
             print("\n=== 저장된 데이터 통계 ===")
             print(f"전체 벡터 수: {stats.total_vector_count}")
             print(f"차원 수: {stats.dimension}")
@@ -292,18 +633,21 @@ class BaseManager:
             print(f"데이터 확인 중 오류: {str(e)}")
 
     def delete_all_vectors(self):
-        """Pinecone 인덱스의 모든 벡터 삭제"""
+        """벡터 저장소의 모든 벡터 삭제"""
         try:
-            # 현재 벡터 수 확인
-            stats = self.index.describe_index_stats()
+            # 버퍼에 남은 벡터를 먼저 기록한 뒤 현재 벡터 수 확인
+            self.vector_writer.flush()
+            stats = self.vector_store.describe_index_stats()
             total_vectors = stats.total_vector_count
             
             if total_vectors > 0:
                 # 모든 벡터 삭제
-                self.index.delete(
+                self.vector_store.delete(
                     delete_all=True,
-                   
+                    namespace=PINECONE_NAMESPACE
                 )
+                self.lexical_index.clear(PINECONE_NAMESPACE)
+                self.bump_generation(PINECONE_NAMESPACE)
                 print(f"\n[삭제 완료] {total_vectors}개의 벡터가 삭제되었습니다.")
             else:
                 print("\n삭제할 벡터가 없습니다.")
@@ -314,90 +658,98 @@ class BaseManager:
             print(f"벡터 삭제 중 오류 발생: {str(e)}")
             return False
 
-    def create_url_embedding(self, file_url: str, data: Dict, content_type: str):
-        try:
-            # 메타데이터 기본 구성
-            metadata = {
-                'file_path': file_url,
-                'type': content_type,
-                'timestamp': datetime.now().isoformat()
-            }
+    def _build_url_vector(self, file_url: str, data: Dict, content_type: str):
+        """URL 컨텐츠 타입별 (벡터 ID, 메타데이터, 임베딩할 텍스트) 구성"""
+        # 메타데이터 기본 구성
+        metadata = {
+            'file_path': file_url,
+            'type': content_type,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        # vector_id 미리 생성
+        base_vector_id = self.create_safe_id(file_url, content_type)
+
+        # 컨텐츠 타입별 메타데이터 추가
+        if content_type == 'image':
+            metadata.update({
+                'caption': data.get('caption', ''),
+                'tags': data.get('tags', []),
+                'ocr': data.get('ocr_text', '')
+            })
+            text_for_embedding = metadata['caption']
+            vector_id = base_vector_id
+            
+        elif content_type == 'video':
+            metadata.update({
+                'frame_number': data.get('frame', 0),
+                'video_timestamp': data.get('timestamp', 0.0),
+                'caption': data.get('caption', ''),
+                'tags': data.get('tags', [])
+            })
+            text_for_embedding = metadata['caption']
+            vector_id = f"{base_vector_id}_{metadata['frame_number']}"
+            
+        elif content_type == 'audio':
+            metadata.update({
+                'caption': data.get('caption', ''),
+                'frame': data.get('frame', 0),
+                'timestamp': data.get('timestamp', datetime.now().isoformat()),
+                'start_time': data.get('start_time', 0.0),  # 원본 오디오 기준 청크 시작/끝 (초)
+                'end_time': data.get('end_time', 0.0)
+            })
+            text_for_embedding = metadata['caption']
+            vector_id = f"{base_vector_id}_{metadata['frame']}"
+            
+        elif content_type == 'video_with_audio':
+            metadata.update({
+                'caption': data.get('caption', ''),
+                'frame': data.get('frame', 0),
+                'timestamp': data.get('timestamp', datetime.now().isoformat()),
+                'video_timestamp': data.get('video_timestamp', 0.0),  # 비디오 관련 정보 추가
+                'start_time': data.get('start_time', 0.0),
+                'end_time': data.get('end_time', 0.0)
+            })
+            text_for_embedding = metadata['caption']
+            vector_id = f"{base_vector_id}_{metadata['frame']}"
+            
+        elif content_type == 'document':
+            metadata.update({
+                'title': data.get('title', ''),
+                'content': data.get('content', '')
+            })
+            text_for_embedding = metadata['content']
+            vector_id = base_vector_id
 
-            # vector_id 미리 생성
-            base_vector_id = self.create_safe_id(file_url, content_type)
+        else:
+            raise ValueError(f"지원하지 않는 컨텐츠 타입: {content_type}")
 
-            # 컨텐츠 타입별 메타데이터 추가
-            if content_type == 'image':
-                metadata.update({
-                    'caption': data.get('caption', ''),
-                    'tags': data.get('tags', []),
-                    'ocr': data.get('ocr_text', '')
-                })
-                text_for_embedding = metadata['caption']
-                vector_id = base_vector_id
-                
-            elif content_type == 'video':
-                metadata.update({
-                    'frame_number': data.get('frame', 0),
-                    'video_timestamp': data.get('timestamp', 0.0),
-                    'caption': data.get('caption', ''),
-                    'tags': data.get('tags', [])
-                })
-                text_for_embedding = metadata['caption']
-                vector_id = f"{base_vector_id}_{metadata['frame_number']}"
-                
-            elif content_type == 'audio':
-                metadata.update({
-                    'caption': data.get('caption', ''),
-                    'frame': data.get('frame', 0),
-                    'timestamp': data.get('timestamp', datetime.now().isoformat())
-                })
-                text_for_embedding = metadata['caption']
-                vector_id = f"{base_vector_id}_{metadata['frame']}"
-                
-            elif content_type == 'video_with_audio':
-                metadata.update({
-                    'caption': data.get('caption', ''),
-                    'frame': data.get('frame', 0),
-                    'timestamp': data.get('timestamp', datetime.now().isoformat()),
-                    'video_timestamp': data.get('video_timestamp', 0.0)  # 비디오 관련 정보 추가
-                })
-                text_for_embedding = metadata['caption']
-                vector_id = f"{base_vector_id}_{metadata['frame']}"
-                
-            elif content_type == 'document':
-                metadata.update({
-                    'title': data.get('title', ''),
-                    'content': data.get('content', '')
-                })
-                text_for_embedding = metadata['content']
-                vector_id = base_vector_id
+        return vector_id, metadata, text_for_embedding
+
+    def _store_url_vector(self, vector_id: str, metadata: Dict, embedding: List[float]):
+        """URL 벡터를 벡터 저장소에 저장"""
+        print(f"\n=== 벡터 저장 정보 ===")
+        print(f"Vector ID: {vector_id}")
+        print(f"Type: {metadata['type']}")
+        print(f"File Path: {metadata['file_path']}")
+        print(f"Caption: {metadata.get('caption', '')}")  # 캡션 정보 출력
+        print(f"Frame: {metadata.get('frame', '')}")      # 프레임 정보 출력
+        
+        # 쓰기 버퍼를 통해 벡터 저장소에 저장
+        self.write_vectors([{
+            'id': vector_id,
+            'values': embedding,
+            'metadata': metadata
+        }])
+
+    def create_url_embedding(self, file_url: str, data: Dict, content_type: str):
+        try:
+            vector_id, metadata, text_for_embedding = self._build_url_vector(file_url, data, content_type)
 
             # 임베딩 생성
             embedding = self.create_embedding(text_for_embedding)
             if embedding:
-                print(f"\n=== 벡터 저장 정보 ===")
-                print(f"Vector ID: {vector_id}")
-                print(f"Type: {metadata['type']}")
-                print(f"File Path: {metadata['file_path']}")
-                print(f"Caption: {metadata.get('caption', '')}")  # 캡션 정보 출력
-                print(f"Frame: {metadata.get('frame', '')}")      # 프레임 정보 출력
-                
-                # Pinecone에 저장
-                self.index.upsert(
-                    vectors=[{
-                        'id': vector_id,
-                        'values': embedding,
-                        'metadata': metadata
-                    }],
-                    namespace=PINECONE_NAMESPACE
-                )
-                
-                # 저장 후 확인
-                print(f"\n=== 저장된 벡터 확인 ===")
-                stats = self.index.describe_index_stats()
-                print(f"전체 벡터 수: {stats.total_vector_count}")
-                
+                self._store_url_vector(vector_id, metadata, embedding)
                 return True
 
             return False
@@ -406,61 +758,102 @@ class BaseManager:
             logging.error(f"URL 임베딩 저장 실패: {str(e)}")
             return False
 
+    def create_url_embeddings(self, file_url: str, items: List[Dict], content_type: str) -> List[Dict]:
+        """여러 URL 컨텐츠(오디오 청크 등)의 임베딩을 배치로 생성 및 저장 (저장에 성공한 항목 반환)"""
+        try:
+            built = [self._build_url_vector(file_url, data, content_type) for data in items]
+            embeddings = self.create_embeddings([text for _, _, text in built])
+
+            stored = []
+            for data, (vector_id, metadata, _), embedding in zip(items, built, embeddings):
+                if embedding:
+                    self._store_url_vector(vector_id, metadata, embedding)
+                    stored.append(data)
+
+            return stored
+
+        except Exception as e:
+            logging.error(f"URL 임베딩 저장 실패: {str(e)}")
+            return []
+
     def create_document_embedding(self, file_url: str, content: Dict):
         """문서 임베딩 생성 및 Pinecone에 저장"""
         try:
             logging.info(f" 문서 임베딩 저장 시작: {file_url}")
 
-            # 메타데이터 구성
-            metadata = {
-                'file_path': file_url,
-                'type': 'document',
-                'timestamp': datetime.now().isoformat(),
-                'title': content.get('title', ''),
-                'content': content.get('content', '')
-            }
-
-            if not metadata['content'].strip():
+            text = (content or {}).get('content', '')
+            if not text.strip():
                 logging.error(f" 문서 내용이 비어 있음! Pinecone에 저장 안 함. (파일: {file_url})")
                 return False
 
-            logging.info(f" 문서 원본 내용 (일부): {metadata['content'][:200]}...")
+            logging.info(f" 문서 원본 내용 (일부): {text[:200]}...")
 
-            text_for_embedding = metadata['content']
-            chunk_results = self.create_long_text_embedding(text_for_embedding, text_type='document')
-
-            if not isinstance(chunk_results, list):
-                logging.error(" 문서 임베딩 생성 실패: 반환된 값이 리스트가 아님")
+            chunks = iter_text_chunks([(None, text)], DOCUMENT_CHUNK_SIZE, DOCUMENT_CHUNK_OVERLAP)
+            if not self.create_document_chunk_embeddings(file_url, content.get('title', ''), chunks):
                 return False
 
-            for i, chunk in enumerate(chunk_results):
-                if not isinstance(chunk, dict):
-                    logging.error(f"청크 데이터 오류: 예상된 타입이 dict인데 {type(chunk)}가 반환됨. 데이터: {chunk}")
-                    return False
-
-                if 'chunk_index' not in chunk or 'embedding' not in chunk:
-                    logging.error(f"청크 데이터 오류: 필수 키가 없음. 데이터: {chunk}")
-                    return False
-
-            for chunk in chunk_results:
-                vector_id = f"{file_url}_{chunk['chunk_index']}"
-                embedding = chunk['embedding']
-
-                logging.info(f" 저장할 벡터 ID: {vector_id}, 청크 길이: {len(chunk.get('text', ''))}")
-
-                self.index.upsert(
-                    vectors=[{
-                        'id': vector_id,
-                        'values': embedding,
-                        'metadata': metadata
-                    }],
-                    namespace=PINECONE_NAMESPACE
-                )
-
             logging.info(f" 문서 Pinecone 저장 완료: {file_url}")
 
             return True
 
         except Exception as e:
             logging.error(f"문서 임베딩 저장 실패: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    def create_document_chunk_embeddings(self, file_url: str, title: str, chunks: Iterable[Dict],
+                                         batch_size: int = DOCUMENT_EMBED_BATCH_SIZE) -> int:
+        """
+        청크 이터레이터에서 batch_size개씩 받아 임베딩 후 바로 쓰기 버퍼에 전달
+
+        청크 생성(페이지 추출)과 임베딩/업서트가 번갈아 진행되므로 문서 크기와 관계없이 한 배치만
+        메모리에 남는다. 메타데이터에는 문서 전체가 아닌 청크 텍스트와 페이지 범위만 저장한다.
+
+        Returns:
+            int: 저장한 청크 수
+        """
+        metadata = {
+            'file_path': file_url,
+            'type': 'document',
+            'timestamp': datetime.now().isoformat(),
+            'title': title or ''
+        }
+
+        stored = 0
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                stored += self._store_document_chunks(file_url, metadata, batch)
+                batch = []
+        if batch:
+            stored += self._store_document_chunks(file_url, metadata, batch)
+
+        logging.info(f" 문서 청크 {stored}개 저장: {file_url}")
+        return stored
+
+    def _store_document_chunks(self, file_url: str, metadata: Dict, chunks: List[Dict]) -> int:
+        embeddings = self.create_embeddings([chunk['text'] for chunk in chunks])
+
+        vectors = []
+        for chunk, embedding in zip(chunks, embeddings):
+            if not embedding:
+                logging.error(f" 임베딩 생성 실패! 해당 청크 스킵: {file_url} #{chunk['chunk_index']}")
+                continue
+
+            chunk_metadata = {
+                **metadata,
+                'chunk_index': chunk['chunk_index'],
+                'chunk_text': chunk['text']
+            }
+            if chunk.get('page_start') is not None:
+                chunk_metadata['page_start'] = chunk['page_start']
+                chunk_metadata['page_end'] = chunk['page_end']
+
+            vectors.append({
+                'id': f"{self.create_safe_id(file_url, 'document')}_{chunk['chunk_index']}",
+                'values': embedding,
+                'metadata': chunk_metadata
+            })
+
+        self.write_vectors(vectors)
+        return len(vectors)
\ No newline at end of file
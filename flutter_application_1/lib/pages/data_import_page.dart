@@ -34,6 +34,8 @@ class _DataImportPageState extends State<DataImportPage>
   late Animation<double> _fadeAnimation;
 
   static const String apiUrl = 'http://172.30.48.214:8000';
+  static const Duration jobPollInterval = Duration(seconds: 2);
+  static const Duration jobPollTimeout = Duration(minutes: 30);
 
   @override
   void initState() {
@@ -216,9 +218,14 @@ class _DataImportPageState extends State<DataImportPage>
       print('응답 상태 코드: ${response.statusCode}');
       print('응답 데이터: ${response.body}');
 
-      final result = jsonDecode(response.body);
+      final result = jsonDecode(utf8.decode(response.bodyBytes));
+
+      if (response.statusCode == 200 || response.statusCode == 202) {
+        // 202는 작업이 대기열에 등록된 것이므로 완료될 때까지 기다림
+        if (response.statusCode == 202) {
+          await _waitForJob(result);
+        }
 
-      if (response.statusCode == 200) {
         final userId = _firestoreService.currentUserId;
         if (userId != null) {
           await _firestoreService.saveFileUrlToFirestore(
@@ -251,7 +258,7 @@ class _DataImportPageState extends State<DataImportPage>
         }
       } else {
         throw Exception(
-            '서버 응답 오류: ${result['message'] ?? '처리 실패'} (상태 코드: ${response.statusCode})');
+            '서버 응답 오류: ${result['message'] ?? result['detail'] ?? '처리 실패'} (상태 코드: ${response.statusCode})');
       }
     } catch (e) {
       print('URL 처리 실패 상세 정보:');
@@ -277,6 +284,31 @@ class _DataImportPageState extends State<DataImportPage>
     }
   }
 
+  // /process/media가 202로 돌려준 작업을 /jobs/{job_id}로 조회해 완료/실패까지 대기
+  Future<Map<String, dynamic>> _waitForJob(Map<String, dynamic> accepted) async {
+    final jobId = accepted['data']?['job_id'];
+    if (jobId == null) throw Exception('작업 ID가 없습니다');
+
+    final deadline = DateTime.now().add(jobPollTimeout);
+    while (DateTime.now().isBefore(deadline)) {
+      final response = await http
+          .get(Uri.parse('$apiUrl/jobs/$jobId'))
+          .timeout(const Duration(seconds: 10));
+      if (response.statusCode != 200) {
+        throw Exception('작업 상태 조회 실패 (상태 코드: ${response.statusCode})');
+      }
+
+      final job = jsonDecode(utf8.decode(response.bodyBytes))['data'];
+      print('작업 $jobId 상태: ${job['state']}');
+      if (job['state'] == 'completed') return job;
+      if (job['state'] == 'failed') {
+        throw Exception(job['error'] ?? '파일 처리 실패');
+      }
+      await Future.delayed(jobPollInterval);
+    }
+    throw TimeoutException('파일 처리 시간이 초과되었습니다');
+  }
+
   Future<void> _handleFileSelection() async {
     try {
       FilePickerResult? result = await FilePicker.platform.pickFiles(
@@ -369,6 +401,8 @@ class _DataImportPageState extends State<DataImportPage>
       int successCount = 0;
       List<String> failedFiles = [];
       List<Map<String, dynamic>> processedResults = [];
+      // 서버 대기열에 등록된 작업 (파일 이름 → 완료된 작업 또는 실패 오류)
+      Map<String, Future<Object>> queuedJobs = {};
 
       for (var fileData in _selectedFiles) {
         try {
@@ -423,14 +457,19 @@ class _DataImportPageState extends State<DataImportPage>
             final responseBody = utf8.decode(response.bodyBytes);
             final result = jsonDecode(responseBody);
 
-            if (response.statusCode == 200 && result['success']) {
+            if (response.statusCode == 202 && result['success'] == true) {
+              // 모든 파일을 등록한 뒤 함께 완료를 기다림 (실패도 값으로 받아 처리되지 않은 오류가 남지 않게 함)
+              queuedJobs[fileData['name']] = _waitForJob(result)
+                  .then<Object>((job) => job, onError: (Object e) => e);
+            } else if (response.statusCode == 200 && result['success'] == true) {
               successCount++;
               processedResults.add({
                 'name': fileData['name'],
                 'result': result,
               });
             } else {
-              throw Exception(result['message'] ?? '파일 처리 실패');
+              throw Exception(
+                  result['message'] ?? result['detail'] ?? '파일 처리 실패');
             }
           }
         } catch (e) {
@@ -439,6 +478,20 @@ class _DataImportPageState extends State<DataImportPage>
         }
       }
 
+      for (var entry in queuedJobs.entries) {
+        final outcome = await entry.value;
+        if (outcome is Map<String, dynamic>) {
+          successCount++;
+          processedResults.add({
+            'name': entry.key,
+            'result': outcome,
+          });
+        } else {
+          failedFiles.add(entry.key);
+          print('파일 처리 실패: ${entry.key} - $outcome');
+        }
+      }
+
       if (mounted) {
         // 모든 파일 처리가 완료된 후 결과 다이얼로그 표시
         showDialog(
@@ -0,0 +1,179 @@
+import uuid
+import logging
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from media.utils.constants import (
+    JOB_QUEUE_MAX_DEPTH,
+    JOB_CONCURRENCY,
+    JOB_HISTORY_LIMIT
+)
+
+# 요청 file_type → 작업 풀 구분
+JOB_MEDIA_GROUPS = {
+    'image': 'image',
+    'video': 'video',
+    'audio': 'audio',
+    'document': 'document',
+    'pdf': 'document',
+    'word': 'document',
+    'pptx': 'document',
+    'xlsx': 'document',
+    'hwp': 'document',
+    'url': 'url'
+}
+
+
+class JobQueueFullError(Exception):
+    """작업 대기열이 가득 찬 경우"""
+    pass
+
+
+class Job:
+    """백그라운드 수집 작업 상태"""
+
+    def __init__(self, file_url: str, file_type: str, file_name: str, save_frames: bool = False):
+        self.id = uuid.uuid4().hex
+        self.file_url = file_url
+        self.file_type = file_type
+        self.file_name = file_name
+        self.save_frames = save_frames
+        self.state = 'queued'
+        self.stages = OrderedDict()
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return self.state in ('completed', 'failed')
+
+    def mark_running(self):
+        with self._lock:
+            self.state = 'running'
+            self.started_at = datetime.now().isoformat()
+
+    def mark_completed(self, result):
+        with self._lock:
+            self.result = result
+            self.state = 'completed'
+            self.finished_at = datetime.now().isoformat()
+
+    def mark_failed(self, error: str):
+        with self._lock:
+            self.error = error
+            self.state = 'failed'
+            self.finished_at = datetime.now().isoformat()
+
+    def update_stage(self, stage: str, progress: float):
+        """단계별 진행률 갱신 (0.0 ~ 1.0)"""
+        with self._lock:
+            self.stages[stage] = round(min(max(progress, 0.0), 1.0), 3)
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        with self._lock:
+            data = {
+                'job_id': self.id,
+                'state': self.state,
+                'file_url': self.file_url,
+                'file_type': self.file_type,
+                'file_name': self.file_name,
+                'stages': dict(self.stages),
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+            if include_result:
+                data['result'] = self.result
+            return data
+
+
+class JobManager:
+    """
+    미디어 수집 작업 대기열
+
+    미디어 종류별로 분리된 워커 풀에서 작업을 실행하고, 대기/실행 중인 작업 수가
+    max_queue_depth를 넘으면 새 작업을 거부한다. 같은 URL/타입의 작업이 이미
+    진행 중이면 새 작업을 만들지 않고 기존 작업을 돌려준다 (클라이언트 재시도 중복 방지).
+    """
+
+    def __init__(self, runner: Callable[[Job], Dict],
+                 max_queue_depth: int = JOB_QUEUE_MAX_DEPTH,
+                 concurrency: Dict[str, int] = JOB_CONCURRENCY,
+                 history_limit: int = JOB_HISTORY_LIMIT):
+        self.runner = runner
+        self.max_queue_depth = max_queue_depth
+        self.history_limit = history_limit
+        self._executors = {
+            group: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"job-{group}")
+            for group, workers in concurrency.items()
+        }
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def submit(self, file_url: str, file_type: str, file_name: str, save_frames: bool = False):
+        """작업 등록 후 (작업, 새로 생성 여부) 반환"""
+        group = JOB_MEDIA_GROUPS.get(file_type)
+        if group not in self._executors:
+            raise ValueError(f"지원하지 않는 파일 형식: {file_type}")
+
+        key = (file_url, file_type)
+        with self._lock:
+            active_id = self._active.get(key)
+            if active_id is not None:
+                return self._jobs[active_id], False
+
+            if len(self._active) >= self.max_queue_depth:
+                raise JobQueueFullError(f"작업 대기열이 가득 찼습니다 (최대 {self.max_queue_depth}개)")
+
+            job = Job(file_url, file_type, file_name, save_frames)
+            self._jobs[job.id] = job
+            self._active[key] = job.id
+            self._trim_history()
+
+        self._executors[group].submit(self._run, job, key)
+        logging.info(f"작업 등록: {job.id} ({file_type}, {file_name})")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, state: str = None) -> List[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if state:
+            jobs = [job for job in jobs if job.state == state]
+        return jobs
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+    def _run(self, job: Job, key):
+        # 상태 변경은 to_dict()와 같은 Job 잠금 안에서 (조회 중 반쯤 바뀐 상태가 보이지 않도록)
+        job.mark_running()
+        try:
+            job.mark_completed(self.runner(job))
+            logging.info(f"작업 완료: {job.id}")
+        except Exception as e:
+            job.mark_failed(str(e))
+            logging.error(f"작업 실패: {job.id} - {str(e)}")
+        finally:
+            with self._lock:
+                self._active.pop(key, None)
+
+    def _trim_history(self):
+        """완료된 작업 기록이 한도를 넘으면 오래된 것부터 삭제 (lock 보유 상태에서 호출)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self._jobs) - self.history_limit)]:
+            del self._jobs[job_id]
@@ -1,16 +1,23 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from typing import List, Optional
 from pydantic import BaseModel, validator
 import logging
 from datetime import datetime
 import os
-import aiohttp
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 # 필요한 모듈들 임포트
 from base_manager import BaseManager
 from media.media_coordinator import MediaCoordinator
 from search import MediaSearcher
+from job_manager import Job, JobManager, JobQueueFullError
+from media.utils.search_cache import SearchResultCache
+from media.utils.workspace import cleanup_stale_workspaces
+from media.utils.tag_lexicon import check_tag_lexicon
 from media.utils.constants import *
 from config import *
 
@@ -88,17 +95,42 @@ class SearchRequest(BaseModel):
 base_manager = None
 media_coordinator = None
 media_searcher = None
+job_manager = None
+file_watcher = None
+
+# 검색 결과 캐시 (정확 일치 + 의미 유사)
+search_cache = SearchResultCache()
+
+# 블로킹 작업용 스레드 풀 (검색과 수집을 분리해 수집 부하가 검색 지연에 영향을 주지 않도록 함)
+search_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="search")
+ingest_executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix="ingest")
+
+
+async def run_blocking(executor, func, *args, **kwargs):
+    """동기 함수를 지정한 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
 
 
 @app.on_event("startup")
 async def startup_event():
     """서버 시작시 필요한 초기화"""
-    global base_manager, media_coordinator, media_searcher
+    global base_manager, media_coordinator, media_searcher, job_manager, file_watcher
 
     try:
-        base_manager = BaseManager(OPENAI_API_KEY)
-        media_coordinator = MediaCoordinator(base_manager)
-        media_searcher = MediaSearcher(base_manager)
+        cleanup_stale_workspaces()    # 이전 실행에서 남은 작업별 임시 디렉토리 정리
+        check_tag_lexicon()           # 태그 사전이 없으면 경고 (TAG_LEXICON_REQUIRED=1이면 시작 실패)
+        base_manager = await run_blocking(search_executor, BaseManager, OPENAI_API_KEY)
+        media_coordinator = await run_blocking(ingest_executor, MediaCoordinator, base_manager)
+        media_searcher = await run_blocking(search_executor, MediaSearcher, base_manager)
+        # 어휘 색인에 없는 기존 벡터 색인 (시작을 막지 않도록 백그라운드에서 실행, 진행 상태는 /ready에 보고)
+        if LEXICAL_BACKFILL_ON_STARTUP:
+            ingest_executor.submit(base_manager.backfill_lexical_index, PINECONE_NAMESPACE)
+        job_manager = JobManager(run_media_job)
+
+        # 감시 경로가 설정되면 파일 변경을 계속 수집
+        if WATCH_ROOTS:
+            file_watcher = await run_blocking(ingest_executor, media_coordinator.watch, WATCH_ROOTS)
 
         logging.info("서버 초기화 완료")
 
@@ -107,12 +139,47 @@ async def startup_event():
         raise e
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료시 스레드 풀 정리"""
+    if file_watcher:
+        file_watcher.stop()
+    if job_manager:
+        job_manager.shutdown()
+    if media_coordinator:
+        media_coordinator.close()
+    ingest_executor.shutdown(wait=True)
+    search_executor.shutdown(wait=True)
+
+
 @app.get("/")
 async def root():
     """서버 상태 확인"""
     return {"status": "running", "timestamp": datetime.now().isoformat()}
 
 
+@app.get("/ready")
+async def ready():
+    """
+    준비 상태 확인
+
+    검색에 필요한 구성 요소(임베딩/벡터 저장소)가 준비되면 200을 반환하고,
+    수집용 모델들의 로드 상태(unloaded/loading/ready/failed)는 components에, 기존 벡터의
+    어휘 색인 백필 상태(idle/running/done/failed)는 lexical_backfill에 함께 보고한다.
+    """
+    search_ready = media_searcher is not None and base_manager.vector_store is not None
+    components = media_coordinator.readiness() if media_coordinator else {}
+    content = {
+        "ready": search_ready,
+        "search_ready": search_ready,
+        "ingest_ready": bool(components) and all(c["state"] == "ready" for c in components.values()),
+        "components": components,
+        "lexical_backfill": dict(base_manager.lexical_backfill) if base_manager else None,
+        "timestamp": datetime.now().isoformat()
+    }
+    return JSONResponse(status_code=200 if search_ready else 503, content=content)
+
+
 @app.post("/process/media")
 async def process_media(request: FileRequest):
     try:
@@ -121,39 +188,33 @@ async def process_media(request: FileRequest):
         logging.info(f" 파일 이름: {request.file_name}")
         logging.info(f" URL: {request.file_url}")
 
-        if request.file_type != "url":
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.head(request.file_url) as response:
-                        if response.status != 200:
-                            raise ValueError(f"파일 URL에 접근할 수 없습니다. 상태 코드: {response.status}")
-                        logging.info(" URL 접근 확인 완료")
-            except Exception as e:
-                logging.error(f" URL 접근 확인 실패: {str(e)}")
-                raise ValueError("파일 URL에 접근할 수 없습니다")
-
-        logging.info("🚀 MediaCoordinator 처리 시작")
-
-        result = media_coordinator.process_media_url(
+        # URL 접근 확인은 별도 HEAD 요청 없이 작업의 다운로드 단계에서 한 번에 처리
+        # 처리는 백그라운드 작업으로 넘기고 작업 ID를 바로 반환
+        job, created = job_manager.submit(
             file_url=request.file_url,
             file_type=request.file_type,
             file_name=request.file_name,
             save_frames=request.save_frames
         )
-
-        if not result:
-            raise HTTPException(status_code=500, detail="미디어 처리 실패")
-
-        return {
-            "success": True,
-            "data": {
-                "type": "url",
-                "file_url": request.file_url,
-                "metadata": result,
-                "vector_status": "completed"
+        logging.info(f"🚀 작업 {'등록' if created else '진행 중 (중복 요청)'}: {job.id}")
+
+        return JSONResponse(
+            status_code=202,
+            content={
+                "success": True,
+                "data": {
+                    "job_id": job.id,
+                    "state": job.state,
+                    "status_url": f"/jobs/{job.id}",
+                    "file_url": request.file_url,
+                    "vector_status": "processing"
+                }
             }
-        }
+        )
 
+    except JobQueueFullError as e:
+        logging.error(f" 작업 대기열 초과: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         logging.error(f" 입력 데이터 오류: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
@@ -163,6 +224,142 @@ async def process_media(request: FileRequest):
         logging.error(f" 파일 처리 중 예상치 못한 오류: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"내부 서버 오류: {str(e)}")
 
+
+def run_media_job(job: Job) -> dict:
+    """백그라운드 작업에서 미디어 처리 실행"""
+    logging.info("🚀 MediaCoordinator 처리 시작")
+
+    result = media_coordinator.process_media_url(
+        file_url=job.file_url,
+        file_type=job.file_type,
+        file_name=job.file_name,
+        save_frames=job.save_frames,
+        progress_callback=job.update_stage
+    )
+
+    if not result:
+        raise Exception("미디어 처리 실패")
+
+    # 음성 인식에 실패한 구간이 있으면 일부만 저장된 결과로 표시
+    transcript_gaps = result.get("transcript_gaps") if isinstance(result, dict) else None
+    return {
+        "type": "url",
+        "file_url": job.file_url,
+        "metadata": result,
+        "vector_status": "partial" if transcript_gaps else "completed",
+        "transcript_gaps": transcript_gaps or []
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태 조회 (진행 단계 및 결과 포함)"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return {"success": True, "data": job.to_dict()}
+
+
+@app.get("/jobs")
+async def list_jobs(state: Optional[str] = None):
+    """작업 목록 조회 (state로 필터링 가능: queued, running, completed, failed)"""
+    jobs = job_manager.list(state)
+    return {"success": True, "data": [job.to_dict(include_result=False) for job in jobs]}
+
+
+def run_search(request: SearchRequest) -> dict:
+    """검색 실행 (캐시 조회 → 임베딩 생성 → 벡터 검색, 검색 전용 풀에서 실행)"""
+    # 캐시 조회는 검색 전 쓰기 세대 기준 (검색 중 업서트가 있으면 다음 요청에서 무효화)
+    generation = base_manager.get_generation(PINECONE_NAMESPACE)
+    params = search_cache.make_params(request.top_k, request.threshold, None, PINECONE_NAMESPACE)
+    cache_key = search_cache.make_key(request.query, params)
+
+    filtered_results = search_cache.get(cache_key, generation)
+    if filtered_results is not None:
+        print("검색 결과 캐시 히트 (정확 일치)")
+    else:
+        # 쿼리 임베딩 생성
+        query_embedding = base_manager.create_embedding(request.query)
+        if not query_embedding:
+            raise HTTPException(status_code=500, detail="임베딩 생성 실패")
+
+        # 의미 유사 캐시는 다른 검색어의 결과이므로, 이 검색어의 어휘 일치가 있으면 쓰지 않음
+        filtered_results = None
+        if not base_manager.has_lexical_match(request.query, PINECONE_NAMESPACE):
+            similar_results = search_cache.get_similar(query_embedding, params, generation)
+            if similar_results is not None:
+                print("검색 결과 캐시 히트 (의미 유사)")
+                filtered_results = reuse_similar_results(similar_results, request.threshold)
+        if filtered_results is None:
+            filtered_results = query_vector_store(request, query_embedding)
+
+        search_cache.put(cache_key, params, query_embedding, filtered_results, generation)
+
+    # 응답 생성
+    response_data = {
+        "query": request.query,
+        "results": filtered_results,
+        "timestamp": datetime.now().isoformat()
+    }
+    
+    print(f"\n=== 최종 응답 ===")
+    print(f"필터링된 결과 수: {len(filtered_results)}")
+    
+    return response_data
+
+
+def reuse_similar_results(results: List[dict], threshold: float) -> List[dict]:
+    """
+    의미 유사 캐시에서 가져온 다른 검색어의 결과 중 벡터 유사도가 threshold 이상인 결과만 재사용
+
+    BM25 점수는 그 검색어 기준이므로 어휘 검색에서만 찾은 결과(score 0.0)는 빼고 lexical_score도 지운다.
+    """
+    return [
+        {**result, "lexical_score": None} for result in results
+        if result["score"] > 0.0 and result["score"] >= threshold
+    ]
+
+
+def query_vector_store(request: SearchRequest, query_embedding: List[float]) -> List[dict]:
+    """하이브리드(벡터 + 어휘) 검색 후 threshold 이상인 결과만 반환"""
+    matches = base_manager.search_vectors(
+        request.query,
+        query_embedding,
+        top_k=request.top_k,
+        namespace=PINECONE_NAMESPACE
+    )
+    
+    print(f"\n=== 검색 결과 ===")
+    print(f"결과 수: {len(matches)}")
+    
+    # 결과 필터링 및 변환 (벡터 유사도가 threshold 미만이면 BM25 점수가 LEXICAL_MIN_SCORE 이상인 어휘 일치만 유지)
+    filtered_results = []
+    for match in matches:
+        score = match.score
+        if score < request.threshold and (match.lexical_score or 0.0) < LEXICAL_MIN_SCORE:
+            continue
+            
+        print(f"\n매치 정보:")
+        print(f"ID: {match.id}")
+        print(f"Score: {score}")
+        print(f"Metadata: {match.metadata}")
+        
+        result = {
+            "id": match.id,
+            "score": score,
+            "lexical_score": match.lexical_score,
+            "metadata": match.metadata
+        }
+        filtered_results.append(result)
+
+    # 'query' 번역 모드면 표시할 결과의 영어 캡션/태그만 번역
+    localized = base_manager.localize_metadata([result["metadata"] or {} for result in filtered_results])
+    for result, metadata in zip(filtered_results, localized):
+        result["metadata"] = metadata
+
+    return filtered_results
+
+
 @app.post("/search")
 async def search(request: SearchRequest):
     try:
@@ -171,52 +368,9 @@ async def search(request: SearchRequest):
         print(f"Top K: {request.top_k}")
         print(f"Threshold: {request.threshold}")
         print(f"Namespace: {PINECONE_NAMESPACE}")
-        
-        # 쿼리 임베딩 생성
-        query_embedding = base_manager.create_embedding(request.query)
-        if not query_embedding:
-            raise HTTPException(status_code=500, detail="임베딩 생성 실패")
 
-        # Pinecone 검색
-        search_results = base_manager.index.query(
-            vector=query_embedding,
-            top_k=request.top_k,
-            namespace=PINECONE_NAMESPACE,
-            include_metadata=True
-        )
-        
-        print(f"\n=== 검색 결과 ===")
-        print(f"결과 수: {len(search_results.matches)}")
-        
-        # 결과 필터링 및 변환
-        filtered_results = []
-        for match in search_results.matches:
-            score = match.score
-            if score < request.threshold:
-                continue
-                
-            print(f"\n매치 정보:")
-            print(f"ID: {match.id}")
-            print(f"Score: {score}")
-            print(f"Metadata: {match.metadata}")
-            
-            result = {
-                "id": match.id,
-                "score": score,
-                "metadata": match.metadata
-            }
-            filtered_results.append(result)
+        response_data = await run_blocking(search_executor, run_search, request)
 
-        # 응답 생성
-        response_data = {
-            "query": request.query,
-            "results": filtered_results,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        print(f"\n=== 최종 응답 ===")
-        print(f"필터링된 결과 수: {len(filtered_results)}")
-        
         return {
             "success": True,
             "data": response_data
@@ -235,7 +389,7 @@ async def search(request: SearchRequest):
 async def reset_database():
     """데이터베이스 초기화"""
     try:
-        success = base_manager.delete_all_vectors()
+        success = await run_blocking(ingest_executor, base_manager.delete_all_vectors)
         if success:
             return {"status": "success", "message": "데이터베이스 초기화 완료"}
         raise HTTPException(status_code=500, detail="데이터베이스 초기화 실패")
@@ -1,19 +1,30 @@
-# 프로세서 클래스들 import
-from .processors.image_processor import ImageProcessor
-from .processors.video_processor import VideoProcessor
-from .processors.audio_processor import AudioProcessor
-from .processors.document_processor import DocumentProcessor
-
-# 미디어 코디네이터 import
-from .media_coordinator import MediaCoordinator
-
-# 유틸리티 함수들 import
-from .utils.text_utils import create_text_chunks
-from .utils.translation_utils import translate_text
+import importlib
 
 # 상수들 import
 from .utils.constants import *
 
+# 프로세서/코디네이터/유틸리티는 처음 접근할 때 import
+# (문서 추출 워커처럼 media.utils의 가벼운 모듈만 쓰는 프로세스가 모델 라이브러리를 불러오지 않도록)
+_EXPORTS = {
+    'ImageProcessor': '.processors.image_processor',
+    'VideoProcessor': '.processors.video_processor',
+    'AudioProcessor': '.processors.audio_processor',
+    'DocumentProcessor': '.processors.document_processor',
+    'MediaCoordinator': '.media_coordinator',
+    'create_text_chunks': '.utils.text_utils',
+    'translate_text': '.utils.translation_utils'
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     'ImageProcessor',
     'VideoProcessor',
@@ -0,0 +1,498 @@
+import sys
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from multiprocessing.managers import BaseManager as _ManagerBase
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+from PIL import Image
+from torchvision import transforms
+
+from .utils.lazy_resource import resolve
+from .utils.constants import (
+    INFERENCE_MAX_BATCH,
+    INFERENCE_MAX_WAIT_MS,
+    INFERENCE_SERVER_HOST,
+    INFERENCE_SERVER_PORT,
+    INFERENCE_SERVER_AUTHKEY,
+    INFERENCE_TIMEOUT,
+    INFERENCE_MEMORY_PER_IMAGE_MB,
+    INFERENCE_CLIENT_HEARTBEAT_SEC,
+    INFERENCE_CLIENT_TTL_SEC
+)
+
+BLIP_MODEL_NAME = "Salesforce/blip2-opt-2.7b"
+
+
+def build_ram_transform():
+    """RAM++ 입력 전처리"""
+    return transforms.Compose([
+        transforms.Resize((384, 384)),
+        transforms.ToTensor(),
+        transforms.Normalize(
+            mean=[0.485, 0.456, 0.406],
+            std=[0.229, 0.224, 0.225]
+        )
+    ])
+
+
+def load_ram_model(device):
+    from ram import models  # RAM 모델만 임포트
+    from config import RAM_MODEL_PATH
+
+    ram_model = models.ram_plus(
+        pretrained=RAM_MODEL_PATH,
+        image_size=384,
+        vit='swin_l'
+    )
+    ram_model = ram_model.to(device)
+    ram_model.eval()
+    return ram_model
+
+
+def load_blip_processor():
+    from transformers import Blip2Processor
+    return Blip2Processor.from_pretrained(BLIP_MODEL_NAME)
+
+
+def load_blip_model(device):
+    from transformers import Blip2ForConditionalGeneration
+    return Blip2ForConditionalGeneration.from_pretrained(
+        BLIP_MODEL_NAME,
+        torch_dtype=torch.float16
+    ).to(device)
+
+
+def split_tags(tag_text) -> List[str]:
+    """RAM 태그 문자열('a | b | c')을 목록으로 분리"""
+    if isinstance(tag_text, (list, tuple)):
+        return [str(tag).strip() for tag in tag_text]
+    return [tag.strip() for tag in str(tag_text).split(' | ') if tag.strip()]
+
+
+def is_out_of_memory(error: Exception) -> bool:
+    oom_type = getattr(torch.cuda, 'OutOfMemoryError', ())
+    return isinstance(error, oom_type) or 'out of memory' in str(error).lower()
+
+
+def effective_batch_size(max_batch: int) -> int:
+    """GPU 여유 메모리 기준으로 배치 크기 제한 (CPU면 max_batch 그대로)"""
+    if not torch.cuda.is_available():
+        return max_batch
+    try:
+        free_bytes, _ = torch.cuda.mem_get_info()
+    except Exception:
+        return max_batch
+    return max(1, min(max_batch, int(free_bytes // (INFERENCE_MEMORY_PER_IMAGE_MB * 1024 * 1024))))
+
+
+def _gather(futures: List[Future], return_exceptions: bool, timeout: Optional[float] = None) -> List:
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=timeout))
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+
+class InferenceModels:
+    """
+    캡션/태그 추론에 필요한 모델 묶음
+
+    모델 인자는 로드된 객체 또는 LazyResource 모두 가능하며, 추론할 때 로드된다.
+    """
+
+    def __init__(self, ram_model, transform, blip_model, blip_processor, device=None):
+        self.ram_model = ram_model
+        self.transform = transform
+        self.blip_model = blip_model
+        self.blip_processor = blip_processor
+        self.device = device or torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+    @classmethod
+    def load(cls, device=None):
+        """모델 서버 프로세스용: 모든 모델을 바로 로드"""
+        device = device or torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        return cls(
+            ram_model=load_ram_model(device),
+            transform=build_ram_transform(),
+            blip_model=load_blip_model(device),
+            blip_processor=load_blip_processor(),
+            device=device
+        )
+
+    def infer_batch(self, images: List[Image.Image]) -> List[Dict]:
+        """이미지 여러 장의 영문 캡션과 태그를 한 번의 BLIP/RAM 호출로 생성"""
+        blip_processor = resolve(self.blip_processor)
+        blip_model = resolve(self.blip_model)
+        ram_model = resolve(self.ram_model)
+
+        with torch.no_grad():
+            inputs = blip_processor(images=images, return_tensors="pt").to(self.device, torch.float16)
+            outputs = blip_model.generate(**inputs, max_new_tokens=100)
+            captions = [caption.strip() for caption in blip_processor.batch_decode(outputs, skip_special_tokens=True)]
+
+            ram_inputs = torch.stack([self.transform(image) for image in images]).to(self.device)
+            result = ram_model.generate_tag(ram_inputs)
+            tag_texts = result[0] if isinstance(result, tuple) else result
+            if isinstance(tag_texts, str):
+                tag_texts = [tag_texts]
+
+        return [
+            {'caption': caption, 'tags': split_tags(tag_text)}
+            for caption, tag_text in zip(captions, tag_texts)
+        ]
+
+    def infer_each(self, images: List[Image.Image]) -> List:
+        """
+        배치 추론 (실패한 이미지는 예외 객체로 반환)
+
+        모델 로드에 실패하면 한 번만 시도하고 모든 이미지에 같은 오류를 돌려준다.
+        """
+        try:
+            for model in (self.blip_processor, self.blip_model, self.ram_model):
+                resolve(model)
+        except Exception as e:
+            logging.error(f"추론 모델 로드 실패 ({len(images)}장): {str(e)}")
+            return [e] * len(images)
+        return self._infer_loaded(images)
+
+    def _infer_loaded(self, images: List[Image.Image]) -> List:
+        """
+        모델이 로드된 상태의 배치 추론
+
+        메모리 부족이면 배치를 절반으로 나눠 다시 시도한다. 그 밖의 오류면 이미지별 전처리로
+        입력 오류인 이미지만 골라내고 나머지를 한 번 더 배치 추론하며, 입력 오류가 없으면
+        (모델/런타임 오류) 같은 오류를 모든 이미지에 돌려준다.
+        """
+        try:
+            return self.infer_batch(images)
+        except Exception as e:
+            if len(images) == 1:
+                return [e]
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            if is_out_of_memory(e):
+                logging.warning(f"메모리 부족으로 배치를 나눠 재시도 ({len(images)}장)")
+                middle = len(images) // 2
+                return self._infer_loaded(images[:middle]) + self._infer_loaded(images[middle:])
+            batch_error = e
+
+        input_errors = [self.check_input(image) for image in images]
+        valid = [image for image, error in zip(images, input_errors) if error is None]
+        if len(valid) == len(images):
+            logging.error(f"배치 추론 실패 ({len(images)}장): {str(batch_error)}")
+            return [batch_error] * len(images)
+
+        logging.error(f"배치 추론 실패 ({len(images)}장), 입력 오류 {len(images) - len(valid)}장 제외 후 재시도: {str(batch_error)}")
+        results = iter(self._infer_loaded(valid) if valid else [])
+        return [error if error is not None else next(results) for error in input_errors]
+
+    def check_input(self, image: Image.Image) -> Optional[Exception]:
+        """이미지 한 장의 BLIP/RAM 전처리 (실패하면 예외 객체, 성공하면 None)"""
+        try:
+            resolve(self.blip_processor)(images=[image], return_tensors="pt")
+            self.transform(image)
+            return None
+        except Exception as e:
+            return e
+
+
+def collect_batch(source, max_batch: int, max_wait: float) -> List:
+    """첫 요청이 올 때까지 기다린 뒤 max_batch개 또는 max_wait초까지 요청 수집"""
+    batch = [source.get()]
+    deadline = time.monotonic() + max_wait
+    while len(batch) < max_batch:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(source.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+class LocalInferenceBackend:
+    """
+    프로세스 내 추론 백엔드 (동적 배칭)
+
+    여러 스레드에서 들어온 이미지를 최대 max_batch장 또는 max_wait_ms까지 모아
+    한 번에 추론한다. InferenceClient와 같은 infer() 인터페이스를 제공한다.
+    """
+
+    def __init__(self, models: InferenceModels, max_batch: int = INFERENCE_MAX_BATCH,
+                 max_wait_ms: int = INFERENCE_MAX_WAIT_MS):
+        self.models = models
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def infer(self, images: List[Image.Image], return_exceptions: bool = False) -> List[Dict]:
+        """이미지별 {'caption', 'tags'} 목록 반환 (return_exceptions면 실패한 항목은 예외 객체)"""
+        self._ensure_started()
+        futures = []
+        for image in images:
+            future = Future()
+            self._queue.put((image, future))
+            futures.append(future)
+        return _gather(futures, return_exceptions)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = collect_batch(self._queue, effective_batch_size(self.max_batch), self.max_wait)
+            results = self.models.infer_each([image for image, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+class _QueueManager(_ManagerBase):
+    """모델 서버와 API 워커 사이의 요청/응답 큐 공유"""
+    pass
+
+
+class InferenceClient:
+    """
+    모델 서버 클라이언트
+
+    이미지는 공유 메모리에 RGB 배열로 기록하고 큐에는 공유 메모리 이름만 보낸다.
+    응답은 클라이언트별 응답 큐에서 전용 스레드가 받아 요청별 Future로 전달한다.
+    """
+
+    def __init__(self, host: str = INFERENCE_SERVER_HOST, port: int = INFERENCE_SERVER_PORT,
+                 authkey: str = INFERENCE_SERVER_AUTHKEY, timeout: float = INFERENCE_TIMEOUT):
+        _QueueManager.register('request_queue')
+        _QueueManager.register('response_queue')
+        _QueueManager.register('release_response_queue')
+        _QueueManager.register('heartbeat')
+        self._manager = _QueueManager(address=(host, port), authkey=authkey.encode())
+        self._manager.connect()
+
+        self.client_id = uuid.uuid4().hex
+        self.timeout = timeout
+        self._requests = self._manager.request_queue()
+        self._responses = self._manager.response_queue(self.client_id)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._dispatch, name="inference-client", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def infer(self, images: List[Image.Image], return_exceptions: bool = False) -> List[Dict]:
+        """이미지별 {'caption', 'tags'} 목록 반환 (return_exceptions면 실패한 항목은 예외 객체)"""
+        request_ids = [self._submit(image) for image in images]
+        try:
+            futures = [self._pending[request_id][0] for request_id in request_ids]
+            results = _gather(futures, return_exceptions, timeout=self.timeout)
+        finally:
+            for request_id in request_ids:
+                self._release(request_id)
+        return results
+
+    def _submit(self, image: Image.Image) -> str:
+        array = np.asarray(image.convert('RGB'), dtype=np.uint8)
+        shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+        np.ndarray(array.shape, dtype=np.uint8, buffer=shm.buf)[:] = array
+
+        request_id = uuid.uuid4().hex
+        with self._lock:
+            self._pending[request_id] = (Future(), shm)
+        self._requests.put((self.client_id, request_id, shm.name, array.shape))
+        return request_id
+
+    def _release(self, request_id: str):
+        with self._lock:
+            entry = self._pending.pop(request_id, None)
+        if entry is None:
+            return
+        shm = entry[1]
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _heartbeat(self):
+        """모델 서버에 살아 있음을 알림 (오래 소식이 없어 응답 큐가 삭제됐으면 다시 등록)"""
+        try:
+            if not self._manager.heartbeat(self.client_id)._getvalue():
+                logging.warning("모델 서버에서 응답 큐가 삭제되어 다시 등록")
+                self._responses = self._manager.response_queue(self.client_id)
+        except Exception as e:
+            logging.error(f"모델 서버 heartbeat 실패: {str(e)}")
+
+    def _dispatch(self):
+        next_heartbeat = time.monotonic() + INFERENCE_CLIENT_HEARTBEAT_SEC
+        while not self._closed:
+            if time.monotonic() >= next_heartbeat:
+                self._heartbeat()
+                next_heartbeat = time.monotonic() + INFERENCE_CLIENT_HEARTBEAT_SEC
+            try:
+                request_id, result, error = self._responses.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except Exception as e:
+                logging.error(f"모델 서버 응답 수신 실패: {str(e)}")
+                self._fail_pending(e)
+                return
+
+            with self._lock:
+                entry = self._pending.get(request_id)
+            if entry is None:
+                continue
+            future = entry[0]
+            if error:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(result)
+
+    def _fail_pending(self, error: Exception):
+        with self._lock:
+            futures = [future for future, _ in self._pending.values()]
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._manager.release_response_queue(self.client_id)
+        except Exception:
+            pass
+
+
+def serve(host: str = INFERENCE_SERVER_HOST, port: int = INFERENCE_SERVER_PORT,
+          authkey: str = INFERENCE_SERVER_AUTHKEY, max_batch: int = INFERENCE_MAX_BATCH,
+          max_wait_ms: int = INFERENCE_MAX_WAIT_MS):
+    """
+    모델 서버 실행 (BLIP-2/RAM++ 가중치를 한 프로세스에만 올리고 요청을 동적 배칭)
+
+    실행: python -m media.inference_server
+    """
+    request_queue = queue.Queue()
+    response_queues = {}
+    last_seen = {}
+    queues_lock = threading.Lock()
+
+    def get_response_queue(client_id):
+        with queues_lock:
+            last_seen[client_id] = time.monotonic()
+            return response_queues.setdefault(client_id, queue.Queue())
+
+    def heartbeat(client_id):
+        """클라이언트 생존 기록 (응답 큐가 이미 삭제됐으면 False)"""
+        with queues_lock:
+            if client_id not in response_queues:
+                return False
+            last_seen[client_id] = time.monotonic()
+            return True
+
+    def release_response_queue(client_id):
+        with queues_lock:
+            response_queues.pop(client_id, None)
+            last_seen.pop(client_id, None)
+
+    def respond(client_id, message):
+        """응답 전달 (close() 없이 끊겨 정리된 클라이언트의 응답은 버림)"""
+        with queues_lock:
+            response_queue = response_queues.get(client_id)
+        if response_queue is not None:
+            response_queue.put(message)
+
+    def reap_clients():
+        """INFERENCE_CLIENT_TTL_SEC 동안 heartbeat가 없는 클라이언트의 응답 큐 삭제"""
+        while True:
+            time.sleep(INFERENCE_CLIENT_HEARTBEAT_SEC)
+            cutoff = time.monotonic() - INFERENCE_CLIENT_TTL_SEC
+            with queues_lock:
+                expired = [client_id for client_id, seen in last_seen.items() if seen < cutoff]
+                for client_id in expired:
+                    response_queues.pop(client_id, None)
+                    last_seen.pop(client_id, None)
+            if expired:
+                logging.warning(f"응답 없는 클라이언트 {len(expired)}개의 응답 큐 삭제")
+
+    _QueueManager.register('request_queue', callable=lambda: request_queue)
+    _QueueManager.register('response_queue', callable=get_response_queue)
+    _QueueManager.register('release_response_queue', callable=release_response_queue)
+    _QueueManager.register('heartbeat', callable=heartbeat)
+
+    logging.info("모델 로드 중...")
+    models = InferenceModels.load()
+
+    manager = _QueueManager(address=(host, port), authkey=authkey.encode())
+    server = manager.get_server()
+    threading.Thread(target=server.serve_forever, name="inference-ipc", daemon=True).start()
+    threading.Thread(target=reap_clients, name="inference-reaper", daemon=True).start()
+    logging.info(f"모델 서버 시작: {host}:{port} (max_batch={max_batch}, max_wait={max_wait_ms}ms)")
+
+    while True:
+        batch = collect_batch(request_queue, effective_batch_size(max_batch), max_wait_ms / 1000.0)
+
+        images, requests = [], []
+        for client_id, request_id, shm_name, shape in batch:
+            try:
+                shm = shared_memory.SharedMemory(name=shm_name)
+                try:
+                    array = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf).copy()
+                finally:
+                    shm.close()
+                images.append(Image.fromarray(array))
+                requests.append((client_id, request_id))
+            except Exception as e:
+                respond(client_id, (request_id, None, f"이미지 읽기 실패: {str(e)}"))
+
+        if not images:
+            continue
+
+        start = time.perf_counter()
+        results = models.infer_each(images)
+        logging.info(f"배치 추론 완료: {len(images)}장 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+        for (client_id, request_id), result in zip(requests, results):
+            if isinstance(result, Exception):
+                respond(client_id, (request_id, None, str(result)))
+            else:
+                respond(client_id, (request_id, result, None))
+
+
+def create_inference_backend(mode: str, models: Optional[InferenceModels] = None):
+    """INFERENCE_MODE에 따라 프로세스 내 백엔드 또는 모델 서버 클라이언트 생성"""
+    if mode == 'server':
+        return InferenceClient()
+    if mode == 'local':
+        return LocalInferenceBackend(models)
+    raise ValueError(f"지원하지 않는 추론 모드: {mode}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    sys.exit(serve())
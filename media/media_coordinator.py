@@ -3,86 +3,117 @@ from .processors import (
     DocumentProcessor
 )
 from .processors.crawling_processor import CrawlingProcessor  # 별도로 import
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
 import logging
 import torch
 import os
-from torchvision import transforms
 from google.cloud import vision
-from transformers import Blip2Processor, Blip2ForConditionalGeneration
-from ram import models  # RAM 모델만 임포트
 from config import *    # 설정값들 임포트
+from .inference_server import (
+    InferenceModels, build_ram_transform, create_inference_backend,
+    load_ram_model, load_blip_processor, load_blip_model
+)
+from .utils.lazy_resource import LazyResource, start_warm_up
+from .utils.ingest_ledger import IngestLedger, file_content_hash
+from .utils.file_watcher import FileWatcher
+from .utils.progress import progress_reporter
 from .utils.constants import (
     IMAGE_EXTENSIONS,
     VIDEO_EXTENSIONS,
     AUDIO_EXTENSIONS,
-    DOCUMENT_EXTENSIONS
+    DOCUMENT_EXTENSIONS,
+    MODEL_WARMUP,
+    INFERENCE_MODE
 )
 
 class MediaCoordinator:
-    def __init__(self, base_manager):
+    def __init__(self, base_manager, warm_up: bool = MODEL_WARMUP):
         self.base_manager = base_manager
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         
         # processed_files 속성 추가
         self.processed_files = []
         
-        # RAM 모델 초기화
-        try:
-            ram_model = models.ram_plus(
-                pretrained=RAM_MODEL_PATH,
-                image_size=384,
-                vit='swin_l'
-            )
-            ram_model = ram_model.to(self.device)
-            ram_model.eval()
-            
-            # Transform 초기화
-            transform = transforms.Compose([
-                transforms.Resize((384, 384)),
-                transforms.ToTensor(),
-                transforms.Normalize(
-                    mean=[0.485, 0.456, 0.406],
-                    std=[0.229, 0.224, 0.225]
-                )
-            ])
-            
-            # BLIP 초기화
-            blip_processor = Blip2Processor.from_pretrained("Salesforce/blip2-opt-2.7b")
-            blip_model = Blip2ForConditionalGeneration.from_pretrained(
-                "Salesforce/blip2-opt-2.7b",
-                torch_dtype=torch.float16
-            ).to(self.device)
-            
-            # Vision 클라이언트 초기화
-            vision_client = vision.ImageAnnotatorClient()
-            
-        except Exception as e:
-            logging.error(f"모델 초기화 실패: {str(e)}")
-            raise e
+        # Transform 초기화
+        transform = build_ram_transform()
+
+        # 무거운 모델/클라이언트는 처음 사용할 때 로드 (서버 시작 시 검색을 바로 제공하기 위함)
+        self.resources = OrderedDict(
+            (resource.name, resource) for resource in [
+                LazyResource('ram_model', lambda: load_ram_model(self.device)),
+                LazyResource('blip_processor', load_blip_processor),
+                LazyResource('blip_model', lambda: load_blip_model(self.device)),
+                LazyResource('vision_client', vision.ImageAnnotatorClient),
+                LazyResource('crawling_processor', lambda: CrawlingProcessor(base_manager))
+            ]
+        )
+
+        # 캡션/태그 추론 백엔드 ('server' 모드면 모델 서버에 연결하고 이 프로세스에서는 모델을 올리지 않음)
+        inference_models = InferenceModels(
+            ram_model=self.resources['ram_model'],
+            transform=transform,
+            blip_model=self.resources['blip_model'],
+            blip_processor=self.resources['blip_processor'],
+            device=self.device
+        )
+        self.resources['inference'] = LazyResource(
+            'inference', lambda: create_inference_backend(INFERENCE_MODE, inference_models)
+        )
             
-        # 초기화된 모델들을 각 프로세서에 전달
+        # 모델 핸들을 각 프로세서에 전달
         self.image_processor = ImageProcessor(
             base_manager,
-            ram_model=ram_model,
+            ram_model=self.resources['ram_model'],
             transform=transform,
-            blip_model=blip_model,
-            blip_processor=blip_processor,
-            vision_client=vision_client
+            blip_model=self.resources['blip_model'],
+            blip_processor=self.resources['blip_processor'],
+            vision_client=self.resources['vision_client'],
+            inference=self.resources['inference']
         )
         
         self.video_processor = VideoProcessor(
             base_manager,
-            ram_model=ram_model,
+            ram_model=self.resources['ram_model'],
             transform=transform,
-            blip_model=blip_model,
-            blip_processor=blip_processor,
-            vision_client=vision_client
+            blip_model=self.resources['blip_model'],
+            blip_processor=self.resources['blip_processor'],
+            vision_client=self.resources['vision_client'],
+            inference=self.resources['inference']
         )
         
         self.audio_processor = AudioProcessor(base_manager)
         self.document_processor = DocumentProcessor(base_manager)
-        self.crawling_processor = CrawlingProcessor(base_manager)
+
+        # 로컬 파일 수집 기록 (바뀌지 않은 파일은 다시 처리하지 않음)
+        try:
+            self.ingest_ledger = IngestLedger()
+        except Exception as e:
+            logging.error(f"수집 기록 초기화 실패 (모든 파일 처리): {str(e)}")
+            self.ingest_ledger = None
+
+        if warm_up:
+            self.start_warm_up()
+
+    @property
+    def crawling_processor(self):
+        return self.resources['crawling_processor'].get()
+
+    def start_warm_up(self, names=None):
+        """백그라운드 스레드에서 모델/클라이언트 미리 로드 (names가 없으면 전체)"""
+        if names is None:
+            names = list(self.resources.keys())
+            if INFERENCE_MODE == 'server':
+                # 모델 서버가 가중치를 갖고 있으므로 이 프로세스에서는 로드하지 않음
+                names = [name for name in names if name not in ('ram_model', 'blip_processor', 'blip_model')]
+        return start_warm_up(self.resources[name] for name in names if name in self.resources)
+
+    def readiness(self) -> dict:
+        """구성 요소별 로드 상태"""
+        return {name: resource.status() for name, resource in self.resources.items()}
+
+    def close(self):
+        """문서 추출 프로세스 풀 등 백그라운드 자원 정리"""
+        self.document_processor.close()
 
     def process_file(self, file_path: str):
         """
@@ -110,20 +141,26 @@ class MediaCoordinator:
             
             if ext in IMAGE_EXTENSIONS:
                 logging.info("이미지 파일 처리 중...")
-                return self.image_processor.process_image(file_path)
+                result = self.image_processor.process_image(file_path)
             elif ext in VIDEO_EXTENSIONS:
                 logging.info("비디오 파일 처리 중...")
-                return self.video_processor.process_video(file_path)
+                result = self.video_processor.process_video(file_path)
             elif ext in AUDIO_EXTENSIONS:
                 logging.info("오디오 파일 처리 중...")
-                return self.audio_processor.process_audio(file_path)
+                result = self.audio_processor.process_audio(file_path)
             elif ext in DOCUMENT_EXTENSIONS:
                 logging.info("문서 파일 처리 중...")
-                return self.document_processor.process_file(file_path)
+                result = self.document_processor.process_file(file_path)
             else:
                 logging.warning(f"지원하지 않는 파일 형식입니다: {ext}")
                 return None
 
+            # 버퍼에 남은 벡터 기록
+            if not self.base_manager.flush_vectors():
+                logging.error(f"벡터 저장 실패: {file_path}")
+                return None
+            return result
+
         except Exception as e:
             logging.error(f"파일 처리 중 오류 발생: {str(e)}", exc_info=True)
             return None
@@ -149,12 +186,6 @@ class MediaCoordinator:
                 logging.error("경로가 비어있습니다.")
                 return []
             
-            # 파일 리스트 초기화
-            image_files = []
-            video_files = []
-            audio_files = []
-            document_files = []
-            
             # 경로 전처리 - 따옴표 제거 및 정규화
             paths = []
             for p in path.split(','):
@@ -173,46 +204,77 @@ class MediaCoordinator:
                 print("처리할 수 있는 경로가 없습니다.")
                 return []
             
-            # 각 경로 처리
+            # 각 경로의 파일 수집
+            file_paths = []
             for single_path in paths:
                 if os.path.isfile(single_path):  # 단일 파일
-                    ext = os.path.splitext(single_path)[1].lower()
-                    if ext in IMAGE_EXTENSIONS:
-                        image_files.append(single_path)
-                    elif ext in VIDEO_EXTENSIONS:
-                        video_files.append(single_path)
-                    elif ext in AUDIO_EXTENSIONS:
-                        audio_files.append(single_path)
-                    elif ext in DOCUMENT_EXTENSIONS:
-                        document_files.append(single_path)
-                    else:
-                        print(f"지원하지 않는 파일 형식: {single_path}")
-                
+                    file_paths.append(single_path)
                 elif os.path.isdir(single_path):  # 디렉토리
                     for root, _, files in os.walk(single_path):
                         for file in files:
-                            file_path = os.path.join(root, file)
-                            ext = os.path.splitext(file)[1].lower()
-                            if ext in IMAGE_EXTENSIONS:
-                                image_files.append(file_path)
-                            elif ext in VIDEO_EXTENSIONS:
-                                video_files.append(file_path)
-                            elif ext in AUDIO_EXTENSIONS:
-                                audio_files.append(file_path)
-                            elif ext in DOCUMENT_EXTENSIONS:
-                                document_files.append(file_path)
-
-            # 중복 제거
-            image_files = list(dict.fromkeys(image_files))
-            video_files = list(dict.fromkeys(video_files))
-            audio_files = list(dict.fromkeys(audio_files))
-            document_files = list(dict.fromkeys(document_files))
+                            file_paths.append(os.path.join(root, file))
+
+            return self.process_paths(file_paths)
+
+        except Exception as e:
+            logging.error(f"디렉토리 처리 중 오류: {str(e)}")
+            return []
+
+    def watch(self, roots, initial_scan: bool = True) -> FileWatcher:
+        """
+        감시 경로의 생성/수정/이동/삭제를 계속 반영하는 파일 감시 시작
+
+        변경된 파일은 process_paths와 같이 처리하고, 삭제된 경로는 remove_paths로 넘긴다.
+        처리나 업서트에 실패해 기록되지 않은 파일은 감시기가 잠시 뒤 다시 넘긴다.
+        """
+        watcher = FileWatcher(roots, on_changed=lambda paths: self._ingest_paths(paths)[1],
+                              on_deleted=self.remove_paths)
+        watcher.start(initial_scan=initial_scan)
+        return watcher
+
+    def process_paths(self, file_paths):
+        """
+        파일 경로 목록을 종류별로 나눠 처리 (디렉토리 수집/파일 감시 공용)
+
+        수집 기록과 비교해 바뀐 파일만 처리하고, 처리 결과 벡터 ID를 기록한다.
+
+        Returns:
+            list: 처리된 결과 목록
+        """
+        return self._ingest_paths(file_paths)[0]
+
+    def _ingest_paths(self, file_paths):
+        """
+        process_paths 본체
+
+        Returns:
+            tuple: (처리된 결과 목록, 처리 대상이었지만 업서트까지 끝나지 않은 파일 경로 목록)
+        """
+        try:
+            image_files, video_files, audio_files, document_files = [], [], [], []
+            for file_path in dict.fromkeys(file_paths):
+                ext = os.path.splitext(file_path)[1].lower()
+                if ext in IMAGE_EXTENSIONS:
+                    image_files.append(file_path)
+                elif ext in VIDEO_EXTENSIONS:
+                    video_files.append(file_path)
+                elif ext in AUDIO_EXTENSIONS:
+                    audio_files.append(file_path)
+                elif ext in DOCUMENT_EXTENSIONS:
+                    document_files.append(file_path)
+
+            # 수집 기록과 비교해 바뀐 파일만 남김 (이동한 파일은 메타데이터만 갱신)
+            pending = self._filter_ingested(image_files + video_files + audio_files + document_files)
+            image_files = [f for f in image_files if f in pending]
+            video_files = [f for f in video_files if f in pending]
+            audio_files = [f for f in audio_files if f in pending]
+            document_files = [f for f in document_files if f in pending]
 
             # 처리할 파일 개수 출력
             total_files = len(image_files) + len(video_files) + len(audio_files) + len(document_files)
             if total_files == 0:
                 print("\n처리할 파일이 없습니다.")
-                return []
+                return [], []
             
             print(f"\n총 처리할 파일: {total_files}개")
             print(f"- 이미지: {len(image_files)}개")
@@ -221,70 +283,178 @@ class MediaCoordinator:
             print(f"- 문서: {len(document_files)}개\n")
 
             processed_results = []
-            
-            # 이미지 배치 처리
-            if image_files:
-                print("\n=== 이미지 처리 시작 ===")
-                batch_size = 4
-                for i in range(0, len(image_files), batch_size):
-                    batch = image_files[i:i + batch_size]
-                    with ThreadPoolExecutor(max_workers=batch_size) as executor:
-                        futures = [executor.submit(self.image_processor.process_image, f) for f in batch]
-                        for future in as_completed(futures):
-                            result = future.result()
-                            if result:
-                                processed_results.append(result)
-                    
-                    progress = min((i + batch_size) / len(image_files) * 100, 100)
-                    print(f"이미지 처리 진행률: {progress:.1f}%")
-                    
-                    if torch.cuda.is_available():
-                        torch.cuda.empty_cache()
-
-            # 비디오 처리
-            if video_files:
-                print("\n=== 비디오 처리 시작 ===")
-                for i, video_file in enumerate(video_files, 1):
-                    result = self.video_processor.process_video(video_file)
-                    if result:
-                        processed_results.append(result)
-                    print(f"비디오 처리 진행률: {(i/len(video_files))*100:.1f}%")
-
-            # 오디오 처리
-            if audio_files:
-                print("\n=== 오디오 처리 시작 ===")
-                for i, audio_file in enumerate(audio_files, 1):
-                    result = self.audio_processor.process_audio(audio_file)
-                    if result:
-                        processed_results.append(result)
-                    print(f"오디오 처리 진행률: {(i/len(audio_files))*100:.1f}%")
-
-            # 문서 처리 추가
-            if document_files:
-                print("\n=== 문서 처리 시작 ===")
-                for i, doc_file in enumerate(document_files, 1):
-                    result = self.document_processor.process_file(doc_file)
-                    if result:
-                        processed_results.append(result)
-                    print(f"문서 처리 진행률: {(i/len(document_files))*100:.1f}%")
+            with self.base_manager.track_vectors() as written:
+                self._process_files(image_files, video_files, audio_files, document_files, processed_results)
+
+                # 버퍼에 남은 벡터 기록 (업서트에 실패한 파일은 written에서 빠져 다음에 다시 처리)
+                if not self.base_manager.flush_vectors():
+                    logging.error("일부 벡터 저장 실패")
+
+            # 음성 인식에 실패한 구간이 있는 파일은 수집 완료로 기록하지 않음 (다음 수집/감시 재시도에서 다시 처리)
+            for result in processed_results:
+                if isinstance(result, dict) and result.get('transcript_gaps'):
+                    written.pop(result.get('file_path'), None)
+            self._record_ingested(pending, written)
+            failed = [file_path for file_path in pending if not written.get(file_path)]
 
             print("\n=== 처리 완료 ===")
             print(f"성공적으로 처리된 파일: {len(processed_results)}개")
             
-            return processed_results
+            return processed_results, failed
 
         except Exception as e:
-            logging.error(f"디렉토리 처리 중 오류: {str(e)}")
-            return []
+            logging.error(f"파일 처리 중 오류: {str(e)}")
+            return [], list(dict.fromkeys(file_paths))
+
+    def remove_paths(self, paths):
+        """
+        삭제된 파일(또는 디렉토리 아래 파일)의 벡터와 수집 기록 삭제
+
+        Returns:
+            int: 삭제한 벡터 수
+        """
+        if self.ingest_ledger is None:
+            return 0
+        removed = 0
+        for path in dict.fromkeys(paths):
+            for file_path in [path] + self.ingest_ledger.paths_under(path):
+                if os.path.exists(file_path):
+                    continue
+                entry = self.ingest_ledger.get(file_path)
+                if entry and self.base_manager.delete_vectors(entry['vector_ids']):
+                    self.ingest_ledger.remove(file_path)
+                    removed += len(entry['vector_ids'])
+                    logging.info(f"삭제된 파일 반영: {file_path} (벡터 {len(entry['vector_ids'])}개)")
+        return removed
+
+    def _process_files(self, image_files, video_files, audio_files, document_files, processed_results):
+        """종류별 파일 처리 (결과는 processed_results에 추가)"""
+        # 이미지 배치 처리 (병렬 디코딩 → 배치 추론 → 배치 임베딩)
+        if image_files:
+            print("\n=== 이미지 처리 시작 ===")
+            processed_results.extend(self.image_processor.process_images(image_files))
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+        # 비디오 처리
+        if video_files:
+            print("\n=== 비디오 처리 시작 ===")
+            for i, video_file in enumerate(video_files, 1):
+                result = self.video_processor.process_video(video_file)
+                if result:
+                    processed_results.append(result)
+                print(f"비디오 처리 진행률: {(i/len(video_files))*100:.1f}%")
+
+        # 오디오 처리
+        if audio_files:
+            print("\n=== 오디오 처리 시작 ===")
+            for i, audio_file in enumerate(audio_files, 1):
+                result = self.audio_processor.process_audio(audio_file)
+                if result:
+                    processed_results.append(result)
+                print(f"오디오 처리 진행률: {(i/len(audio_files))*100:.1f}%")
 
-    def process_url(self, url: str):
-        """웹 페이지 처리"""
+        # 문서 처리 (프로세스 풀에서 병렬 추출, 끝나는 순서대로 임베딩)
+        if document_files:
+            print("\n=== 문서 처리 시작 ===")
+            for i, result in enumerate(self.document_processor.process_files(document_files), 1):
+                processed_results.append(result)
+                print(f"문서 처리 진행률: {i}/{len(document_files)}개 완료")
+
+    @staticmethod
+    def _media_type(file_path: str) -> str:
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in IMAGE_EXTENSIONS:
+            return 'image'
+        if ext in VIDEO_EXTENSIONS:
+            return 'video'
+        if ext in AUDIO_EXTENSIONS:
+            return 'audio'
+        return 'document'
+
+    def _filter_ingested(self, files):
+        """
+        수집 기록과 비교해 처리할 파일만 반환 ({경로: (stat, 내용 해시, 이전 기록)})
+
+        크기/수정 시각이 기록과 같으면 해시 없이 건너뛰고, 내용이 같으면 stat만 갱신한다.
+        같은 내용의 기록이 사라진 경로에 있으면 이동으로 보고 벡터 메타데이터의 file_path만 바꾼다.
+        """
+        if self.ingest_ledger is None:
+            return {file_path: (None, None, None) for file_path in files}
+
+        pending = {}
+        unchanged = moved = 0
+        for file_path in files:
+            try:
+                stat = os.stat(file_path)
+                if self.ingest_ledger.is_unchanged(file_path, stat):
+                    unchanged += 1
+                    continue
+
+                content_hash = file_content_hash(file_path)
+                previous = self.ingest_ledger.get(file_path)
+                if previous and previous['content_hash'] == content_hash \
+                        and previous['version'] == self.ingest_ledger.version:
+                    self.ingest_ledger.touch(file_path, stat)
+                    unchanged += 1
+                    continue
+
+                source = next((
+                    entry for entry in self.ingest_ledger.find_by_hash(content_hash)
+                    if entry['path'] != file_path and not os.path.exists(entry['path'])
+                ), None)
+                if source and self._move_ingested(source, file_path, stat, previous):
+                    moved += 1
+                    continue
+
+                pending[file_path] = (stat, content_hash, previous)
+            except OSError as e:
+                logging.error(f"파일 확인 실패 ({file_path}): {str(e)}")
+
+        print(f"수집 기록 비교: 변경 없음 {unchanged}개, 이동 {moved}개, 처리 대상 {len(pending)}개")
+        return pending
+
+    def _move_ingested(self, source, file_path, stat, previous) -> bool:
+        """이동/이름이 바뀐 파일의 벡터를 새 경로 기준 ID로 옮기고 기록도 옮김 (다시 추론하지 않음)"""
+        vector_ids = self.base_manager.move_vectors(source['vector_ids'], source['path'], file_path)
+        if vector_ids is None:
+            return False
+        if previous:
+            # 새 경로에 있던 예전 파일의 벡터는 더 이상 쓰이지 않음
+            stale = set(previous['vector_ids']) - set(vector_ids)
+            self.base_manager.delete_vectors(list(stale))
+        self.ingest_ledger.move(source['path'], file_path, stat, vector_ids)
+        logging.info(f"이동한 파일 반영: {source['path']} → {file_path}")
+        return True
+
+    def _record_ingested(self, pending, written):
+        """처리에 성공해 벡터가 생긴 파일을 수집 기록에 저장 (실패한 파일은 다음에 다시 처리)"""
+        if self.ingest_ledger is None:
+            return
+        for file_path, (stat, content_hash, previous) in pending.items():
+            vector_ids = written.get(file_path)
+            if not vector_ids:
+                continue
+            if previous:
+                # 내용이 바뀌어 더 이상 만들어지지 않는 예전 벡터 삭제
+                stale = set(previous['vector_ids']) - set(vector_ids)
+                self.base_manager.delete_vectors(list(stale))
+            self.ingest_ledger.record(file_path, stat, content_hash, self._media_type(file_path), vector_ids)
+
+    def process_url(self, url: str, progress_callback=None):
+        """웹 페이지 처리 (progress_callback으로 수집/임베딩 진행률 보고)"""
+        report = progress_reporter(progress_callback)
         try:
             print("\n=== 웹 페이지 처리 시작 ===")
+            report('download', 0.0)
             web_data = self.crawling_processor.extract_content(url)
             if web_data:
+                report('download', 1.0)
+                report('embedding', 0.0)
                 result = self.crawling_processor.save_to_pinecone(url, web_data)
                 if result:
+                    report('embedding', 1.0)
                     print("웹 페이지 처리 완료")
                     return {'url': url, 'metadata': web_data}
             return None
@@ -292,7 +462,18 @@ class MediaCoordinator:
             logging.error(f"웹 페이지 처리 중 오류: {str(e)}")
             return None
         
-    def process_media_url(self, file_url: str, file_type: str, file_name: str, save_frames: bool = False):
+    def process_media_url(self, file_url: str, file_type: str, file_name: str, save_frames: bool = False,
+                          progress_callback=None):
+        """
+        URL 미디어를 처리합니다.
+
+        Args:
+            progress_callback (callable): 단계별 진행률 콜백 (stage, progress) - 백그라운드 작업 상태 갱신용.
+                프로세서가 download/inference/translation/transcription/extraction/embedding 단계를,
+                여기서 마지막 storing(버퍼 기록) 단계를 보고한다.
+        """
+        report = progress_reporter(progress_callback)
+
         try:
             logging.info("\n=== URL 미디어 처리 시작 ===")
             logging.info(f" 파일명: {file_name}")
@@ -302,27 +483,21 @@ class MediaCoordinator:
             result = None
 
             if file_type == 'image':
-                result = self.image_processor.process_image_url(file_url, file_name)
+                result = self.image_processor.process_image_url(file_url, file_name, progress_callback=progress_callback)
 
             elif file_type == 'video':
-                result = self.video_processor.process_video_url(file_url, file_name)
+                result = self.video_processor.process_video_url(file_url, file_name, progress_callback=progress_callback)
 
             elif file_type == 'audio':
-                result = self.audio_processor.process_audio_url(file_url, file_name)
+                result = self.audio_processor.process_audio_url(file_url, file_name, progress_callback=progress_callback)
 
             elif file_type in ['document', 'pdf', 'word', 'pptx', 'xlsx', 'hwp']:  
                 logging.info(f" 문서 처리 시작: {file_name}")
-                result = self.document_processor.process_document_url(file_url)
-
-                if result and "content" in result:
-                    extracted_text = result["content"]
-                    logging.info(f" 문서 추출 텍스트 (일부): {extracted_text[:100]}...")  
-
-                self.base_manager.create_document_embedding(file_url, result)
+                result = self.document_processor.process_document_url(file_url, progress_callback=progress_callback)
 
             elif file_type == 'url':
                 logging.info(f" 웹 페이지 처리 시작: {file_name}")
-                result = self.process_url(file_url)  
+                result = self.process_url(file_url, progress_callback=progress_callback)
 
             else:
                 logging.error(f" 지원하지 않는 파일 형식입니다: {file_type}")
@@ -332,6 +507,12 @@ class MediaCoordinator:
                 logging.error(f" {file_type} 처리 결과가 없습니다.")
                 raise Exception(f"{file_type} 처리 실패")
 
+            # 작업 완료 시 버퍼에 남은 벡터 기록
+            report('storing', 0.0)
+            if not self.base_manager.flush_vectors():
+                raise Exception(f"{file_type} 벡터 저장 실패")
+            report('storing', 1.0)
+
             logging.info(f"미디어 처리 완료: {file_name}")
             return result
 
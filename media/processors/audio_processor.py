@@ -1,48 +1,42 @@
-from pydub import AudioSegment
 import logging
-import requests
-import os
 from .base_processor import BaseProcessor
+from ..utils.download_utils import download_to_file
+from ..utils.constants import DOWNLOAD_MAX_BYTES
+from ..utils.workspace import JobWorkspace
+from ..utils.transcription import TranscriptionEngine
+from ..utils.progress import progress_reporter
 from datetime import datetime
 
 class AudioProcessor(BaseProcessor):
     def __init__(self, base_manager):
         super().__init__(base_manager)
         
-    def process_audio_url(self, file_url: str, file_name: str = None) -> dict:
-        """URL로부터 오디오를 처리"""
+    def process_audio_url(self, file_url: str, file_name: str = None, progress_callback=None) -> dict:
+        """URL로부터 오디오를 처리 (progress_callback으로 다운로드/변환/임베딩 진행률 보고)"""
+        report = progress_reporter(progress_callback)
         try:
             print("\n=== 오디오 URL 처리 시작 ===")
             print(f"URL: {file_url}")
             print(f"파일명: {file_name}")
             
-            # 오디오 다운로드
-            response = requests.get(file_url, stream=True)
-            if response.status_code != 200:
-                raise Exception("오디오 다운로드 실패")
-            
-            # 임시 파일로 저장
-            temp_path = "temp_audio.mp3"
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-    
-            try:
+            # 작업별 임시 작업 공간에 다운로드 (다른 작업과 파일 이름이 겹치지 않고, 끝나면 삭제)
+            with JobWorkspace("audio") as workspace:
+                temp_path = workspace.file(file_name or "audio.mp3")
+                report('download', 0.0)
+                download_to_file(file_url, temp_path, max_bytes=min(DOWNLOAD_MAX_BYTES, workspace.remaining_bytes()))
+                report('download', 1.0)
+
                 # 공통 처리 로직 호출
-                result = self._process_audio_file(temp_path, file_url=file_url, file_name=file_name)
+                result = self._process_audio_file(temp_path, file_url=file_url, file_name=file_name,
+                                                  progress_callback=progress_callback)
                 return result
-                
-            finally:
-                # 임시 파일 삭제
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
                     
         except Exception as e:
             logging.error(f"오디오 URL 처리 중 오류: {str(e)}")
             return None
 
-    def process_audio(self, file_path: str, file_url: str = None, source_type: str = 'audio') -> dict:
+    def process_audio(self, file_path: str, file_url: str = None, source_type: str = 'audio',
+                      progress_callback=None) -> dict:
         """로컬 오디오 파일 처리"""
         try:
             print("\n" + "="*50)
@@ -51,81 +45,56 @@ class AudioProcessor(BaseProcessor):
                 print(f"원본 URL: {file_url}")
             print("="*50)
             
-            return self._process_audio_file(file_path, file_url=file_url, source_type=source_type)
+            return self._process_audio_file(file_path, file_url=file_url, source_type=source_type,
+                                            progress_callback=progress_callback)
             
         except Exception as e:
             logging.error(f"오디오 처리 중 오류: {str(e)}")
             return None
 
-    def _process_audio_file(self, file_path: str, file_url: str = None, file_name: str = None, source_type: str = 'audio') -> dict:
+    def _process_audio_file(self, file_path: str, file_url: str = None, file_name: str = None, source_type: str = 'audio',
+                            progress_callback=None) -> dict:
         """오디오 파일 처리 공통 로직"""
+        report = progress_reporter(progress_callback)
         try:
-            # 전체 오디오를 한 번에 Whisper로 변환
-            print("\n[전체 오디오 텍스트 변환 중...]")
-            full_text = self.transcribe_audio(file_path)
-            print(f"\n전체 텍스트 추출 완료: {len(full_text)}자")
-            
-            # 전체 텍스트를 문장 단위로 분할
-            sentences = full_text.split('. ')
-            segments = []
-            current_chunk = []
-            current_length = 0
-            chunk_index = 0
-            chunk_size = 300
-            overlap_size = 75
+            # 무음 기준으로 나눈 구간을 병렬로 Whisper 변환 (구간별 실제 시작/끝 시각 포함)
+            print("\n[오디오 텍스트 변환 중...]")
+            report('transcription', 0.0)
+            transcript = self.transcribe_segments(file_path)
+            if transcript is None:
+                return None
+            segments, gaps = transcript
+            if gaps and not segments:
+                logging.error(f"모든 음성 구간 변환 실패: {file_url or file_path}")
+                return None
+            report('transcription', 1.0)
+            full_text = ' '.join(segment.text for segment in segments)
+            print(f"\n전체 텍스트 추출 완료: {len(full_text)}자 ({len(segments)}개 구간)")
             
             # 저장할 경로 결정
             target_path = file_url if file_url else file_path
             
-            for sentence in sentences:
-                sentence = sentence.strip() + '. '
-                sentence_length = len(sentence)
-                
-                if current_length + sentence_length > chunk_size:
-                    chunk_text = ''.join(current_chunk)
-                    
-                    chunk_data = {
-                        'type': source_type,
-                        'caption': chunk_text,
-                        'frame': chunk_index,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    
-                    success = self.base_manager.create_url_embedding(
-                        target_path,
-                        chunk_data,
-                        source_type
-                    )
-                    
-                    if success:
-                        segments.append(chunk_data)
-                    
-                    overlap_text = chunk_text[-overlap_size:] if overlap_size > 0 else ""
-                    current_chunk = [overlap_text, sentence] if overlap_text else [sentence]
-                    current_length = len(overlap_text) + sentence_length
-                    chunk_index += 1
-                else:
-                    current_chunk.append(sentence)
-                    current_length += sentence_length
-            
-            # 마지막 청크 처리
-            if current_chunk:
-                chunk_text = ''.join(current_chunk)
-                chunk_data = {
+            chunks = [
+                {
                     'type': source_type,
                     'caption': chunk_text,
                     'frame': chunk_index,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': datetime.now().isoformat(),
+                    'start_time': start_time,
+                    'end_time': end_time,
+                    'video_timestamp': start_time
                 }
-                
-                success = self.base_manager.create_url_embedding(
-                    target_path,
-                    chunk_data,
-                    source_type
-                )
-                
-                if success:
-                    segments.append(chunk_data)
+                for chunk_index, (chunk_text, start_time, end_time) in enumerate(self.create_timed_chunks(segments))
+            ]
+
+            # 모든 청크를 한 번에 배치 임베딩 후 저장
+            report('embedding', 0.0)
+            segments = self.base_manager.create_url_embeddings(
+                target_path,
+                chunks,
+                source_type
+            )
+            report('embedding', 1.0)
             
             result = {
                 'file_path': target_path,
@@ -133,7 +102,9 @@ class AudioProcessor(BaseProcessor):
                 'segments': segments,
                 'type': source_type,
                 'total_text_length': len(full_text),
-                'total_chunks': len(segments)
+                'total_chunks': len(segments),
+                # 변환하지 못한 구간 (비어 있지 않으면 일부만 수집된 결과)
+                'transcript_gaps': [{'start': start, 'end': end} for start, end in gaps]
             }
             
             return result
@@ -142,16 +113,52 @@ class AudioProcessor(BaseProcessor):
             logging.error(f"오디오 파일 처리 중 오류: {str(e)}")
             return None
 
-    def transcribe_audio(self, audio_path: str) -> str:
-        """OpenAI Whisper API를 사용하여 오디오를 텍스트로 변환"""
+    def create_timed_chunks(self, segments, chunk_size: int = 300, overlap_size: int = 75):
+        """
+        전사 구간을 약 300자 청크로 묶어 (텍스트, 시작 초, 끝 초) 목록 생성
+
+        앞 청크 끝의 구간들(합계 75자 이내)을 다음 청크 앞에 겹쳐 넣는다.
+        """
+        chunks = []
+        current = []
+        current_length = 0
+        for segment in segments:
+            if current and current_length + len(segment.text) > chunk_size:
+                chunks.append((' '.join(s.text for s in current), current[0].start, current[-1].end))
+
+                overlap = []
+                overlap_length = 0
+                for previous in reversed(current):
+                    if overlap_length + len(previous.text) > overlap_size:
+                        break
+                    overlap.insert(0, previous)
+                    overlap_length += len(previous.text) + 1
+                current = overlap
+                current_length = overlap_length
+
+            current.append(segment)
+            current_length += len(segment.text) + 1
+
+        if current:
+            chunks.append((' '.join(s.text for s in current), current[0].start, current[-1].end))
+        return chunks
+
+    def transcribe_segments(self, audio_path: str):
+        """
+        무음 분할 + 병렬 Whisper 변환
+
+        Returns:
+            tuple: (TranscriptSegment 목록, 변환하지 못한 (시작 초, 끝 초) 구간 목록), 실패 시 None
+        """
         try:
-            with open(audio_path, "rb") as audio_file:
-                transcript = self.base_manager.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-                return transcript
+            engine = TranscriptionEngine(self.base_manager.client)
+            segments = engine.transcribe(audio_path)
+            return segments, engine.gaps
         except Exception as e:
             logging.error(f"OpenAI Whisper API 오류: {str(e)}")
-            return ""
\ No newline at end of file
+            return None
+
+    def transcribe_audio(self, audio_path: str) -> str:
+        """OpenAI Whisper API를 사용하여 오디오를 텍스트로 변환"""
+        transcript = self.transcribe_segments(audio_path)
+        return ' '.join(segment.text for segment in transcript[0]) if transcript else ''
\ No newline at end of file
@@ -1,4 +1,7 @@
-from ..utils.translation_utils import translate_text
+from ..utils.tag_lexicon import get_tag_lexicon
+from ..utils.lazy_resource import resolve
+from ..utils.constants import TRANSLATION_MODE
+import torch
 import logging
 from config import PINECONE_NAMESPACE  # 설정에서 namespace 임포트
 
@@ -7,12 +10,29 @@ class BaseProcessor:
         self.base_manager = base_manager
 
     def translate_caption(self, caption):
-        return translate_text(self.base_manager.client, caption, is_caption=True)
+        return self.translate_captions([caption])[0]
+
+    def translate_captions(self, captions):
+        """
+        여러 캡션 일괄 번역 (번역 메모리에 없는 캡션만 요청)
+
+        TRANSLATION_MODE가 'query'면 수집 시 번역하지 않고 영어 캡션을 그대로 반환한다.
+        """
+        if TRANSLATION_MODE == 'query':
+            return list(captions)
+        return self.base_manager.translator.translate_many(captions, is_caption=True)
 
     def translate_tags(self, tags):
-        tags_text = ', '.join(tags)
-        translated = translate_text(self.base_manager.client, tags_text, is_caption=False)
-        return [tag.strip() for tag in translated.split(',')]
+        return self.translate_tag_lists([tags])[0]
+
+    def translate_tag_lists(self, tag_lists):
+        """태그 사전으로 번역 (사전에 없는 태그만 번역 API로 한 번에 번역, 'query' 모드면 영어 그대로)"""
+        if TRANSLATION_MODE == 'query':
+            return [list(tags) for tags in tag_lists]
+        return get_tag_lexicon().translate_many(
+            tag_lists,
+            lambda tags: self.base_manager.translator.translate_many(tags, is_caption=False)
+        )
 
     def process_media(self, file_path: str):
         """미디어 파일 처리"""
@@ -31,4 +51,44 @@ class BaseProcessor:
             
         except Exception as e:
             print(f"미디어 처리 중 오류 발생: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
+
+
+class ModelProcessor(BaseProcessor):
+    """
+    RAM/BLIP/Vision 모델을 사용하는 프로세서 공통 기반
+
+    모델은 LazyResource로 전달받을 수 있으며, 속성에 처음 접근할 때 로드된다.
+    캡션/태그 생성은 inference 백엔드(프로세스 내 동적 배칭 또는 모델 서버)를 통해 실행한다.
+    """
+
+    def __init__(self, base_manager, ram_model, transform, blip_model, blip_processor, vision_client=None,
+                 inference=None):
+        super().__init__(base_manager)
+        self._inference = inference
+        self._ram_model = ram_model
+        self.transform = transform
+        self._blip_model = blip_model
+        self._blip_processor = blip_processor
+        self._vision_client = vision_client
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+    @property
+    def ram_model(self):
+        return resolve(self._ram_model)
+
+    @property
+    def blip_model(self):
+        return resolve(self._blip_model)
+
+    @property
+    def blip_processor(self):
+        return resolve(self._blip_processor)
+
+    @property
+    def vision_client(self):
+        return resolve(self._vision_client)
+
+    @property
+    def inference(self):
+        return resolve(self._inference)
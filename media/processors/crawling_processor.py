@@ -28,8 +28,8 @@ logging.basicConfig(
 class CrawlingProcessor:
     def __init__(self, base_manager, github_token: str = None):
         # base_manager에서 필요한 클라이언트들 가져오기
+        self.base_manager = base_manager
         self.client = base_manager.client
-        self.index = base_manager.index
         self.github_token = github_token
         
         # Selenium 설정
@@ -323,27 +323,23 @@ class CrawlingProcessor:
                 print(f"\n페이지 요약본:\n{summary}")
                 
                 # 요약본 임베딩 생성
-                summary_embedding = self.client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=summary
-                ).data[0].embedding
+                summary_embedding = self.base_manager.create_embedding(summary)
+                if not summary_embedding:
+                    raise Exception("요약본 임베딩 생성 실패")
 
-                # 요약본만 Pinecone에 저장
-                self.index.upsert(
-                    vectors=[{
-                        'id': f"{url}_summary",
-                        'values': summary_embedding,
-                        'metadata': {
-                            'url': url,
-                            'title': web_data['title'],
-                            'domain': web_data['domain'],
-                            'summary': summary,
-                            'type': 'url',  
-                            'timestamp': datetime.now().isoformat()
-                        }
-                    }],
-                    namespace=PINECONE_NAMESPACE
-                )
+                # 요약본만 벡터 저장소에 저장
+                self.base_manager.write_vectors([{
+                    'id': f"{url}_summary",
+                    'values': summary_embedding,
+                    'metadata': {
+                        'url': url,
+                        'title': web_data['title'],
+                        'domain': web_data['domain'],
+                        'summary': summary,
+                        'type': 'url',  
+                        'timestamp': datetime.now().isoformat()
+                    }
+                }])
                 print(f"페이지 요약본 임베딩 저장 완료: {url}")
                 return True
                 
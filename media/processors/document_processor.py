@@ -1,17 +1,26 @@
-import os
-import io
-import json
 import logging
-import requests
-from typing import Dict, List
-from urllib.parse import urlparse
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from PyPDF2 import PdfReader
-import docx
-from pptx import Presentation
-from openpyxl import load_workbook
 import openai
 from config import OPENAI_API_KEY
-import chardet
+from ..utils import document_extract
+from ..utils.document_extract import extract_document_file, extract_pdf_pages
+from ..utils.download_utils import download
+from ..utils.text_utils import iter_text_chunks
+from ..utils.progress import progress_reporter
+from ..utils.constants import (
+    DOCUMENT_EXTRACT_WORKERS,
+    DOCUMENT_EXTRACT_TIMEOUT_SEC,
+    DOCUMENT_CHUNK_SIZE,
+    DOCUMENT_CHUNK_OVERLAP,
+    PDF_PARALLEL_PAGE_THRESHOLD,
+    PDF_PAGE_RANGE_SIZE
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,51 +31,226 @@ logging.basicConfig(
 openai.api_key = OPENAI_API_KEY
 
 
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    추출용 프로세스 풀 (spawn)
+
+    API 서버는 스레드가 여럿 도는 프로세스라 fork하면 다른 스레드가 잡고 있던 잠금까지 복사되어
+    워커가 멈출 수 있으므로 새 인터프리터로 워커를 띄운다. 워커 작업은 파서만 불러오는
+    document_extract 모듈에 있어 워커를 띄울 때 모델/API 클라이언트를 로드하지 않는다.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
 class DocumentProcessor:
-    def __init__(self, base_manager):
+    def __init__(self, base_manager, workers: int = DOCUMENT_EXTRACT_WORKERS):
         self.base_manager = base_manager
+        self.workers = workers
+
+        # 추출 프로세스 풀 (처음 쓸 때 만들어 close까지 계속 사용)
+        self._pool = None
+        self._pool_lock = threading.Lock()
 
-    def extract_pdf_content(self, file_obj) -> Dict[str, str]:
+    def _extract_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = _process_pool(self.workers)
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """워커가 비정상 종료되어 깨진 풀을 버림 (다음 추출 때 새로 만듦)"""
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn, *args):
+        """추출 프로세스 풀에 작업 제출 (이미 깨진 풀이면 새 풀에 다시 제출) → (Future, 풀)"""
+        pool = self._extract_pool()
         try:
-            logging.info(" PDF 파일 처리 시작")
+            return pool.submit(fn, *args), pool
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            pool = self._extract_pool()
+            return pool.submit(fn, *args), pool
+
+    def close(self):
+        """추출 프로세스 풀 종료"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    def iter_pdf_pages(self, reader: PdfReader, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        return document_extract.iter_pdf_pages(reader, start, end)
+
+    def extract_pdf_content(self, file_obj) -> Optional[Dict[str, str]]:
+        return document_extract.extract_pdf_content(file_obj)
+
+    def iter_pdf_file_pages(self, file_path: str, workers: Optional[int] = None,
+                            timeout: float = DOCUMENT_EXTRACT_TIMEOUT_SEC,
+                            pool=None) -> Iterator[Tuple[int, str]]:
+        """
+        로컬 PDF 페이지를 순서대로 생성
+
+        PDF_PARALLEL_PAGE_THRESHOLD 페이지를 넘는 파일은 PDF_PAGE_RANGE_SIZE 페이지씩 추출 프로세스 풀
+        (pool을 주지 않으면 공용 풀)에 맡기고 앞 구간부터 내보낸다. 미리 맡기는 구간은 워커 수의 2배로
+        제한해 추출 결과가 쌓이지 않게 한다.
+        """
+        workers = self.workers if workers is None else workers
+        with open(file_path, 'rb') as file_obj:
             reader = PdfReader(file_obj)
-            title = reader.metadata.title if reader.metadata and reader.metadata.title else "PDF Document"
-            content = "\n".join([page.extract_text() or "" for page in reader.pages]).strip()
-            return {"title": title, "content": content} if content else None
-        except Exception as e:
-            logging.error(f" PDF 처리 실패: {str(e)}")
-            return None
+            page_count = len(reader.pages)
+            if page_count <= PDF_PARALLEL_PAGE_THRESHOLD or workers <= 1:
+                yield from document_extract.iter_pdf_pages(reader)
+                return
+
+        logging.info(f" PDF {page_count}페이지를 {PDF_PAGE_RANGE_SIZE}페이지씩 병렬 추출: {file_path}")
+        starts = iter(range(0, page_count, PDF_PAGE_RANGE_SIZE))
+        pending = deque()
+
+        def submit_next():
+            start = next(starts, None)
+            if start is not None:
+                args = (file_path, start, start + PDF_PAGE_RANGE_SIZE, timeout)
+                if pool is None:
+                    pending.append((start, *self._submit(extract_pdf_pages, *args)))
+                else:
+                    pending.append((start, pool.submit(extract_pdf_pages, *args), pool))
 
-    def extract_docx_content(self, file_obj) -> Dict[str, str]:
         try:
-            doc = docx.Document(file_obj)
-            content = "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
-            return {"title": "Word Document", "content": content}
-        except Exception as e:
-            logging.error(f" DOCX 처리 실패: {str(e)}")
-            return None
+            for _ in range(workers * 2):
+                submit_next()
+
+            while pending:
+                start, future, used_pool = pending.popleft()
+                submit_next()
+                try:
+                    pages = future.result()
+                except BrokenProcessPool as e:
+                    logging.error(f" PDF 추출 워커 비정상 종료 ({file_path}): {str(e)}")
+                    self._discard_pool(used_pool)
+                    return
+                except Exception as e:
+                    logging.error(f" PDF {start + 1}페이지부터 구간 추출 실패 ({file_path}): {str(e)}")
+                    continue
+                yield from pages
+        finally:
+            for _, future, _ in pending:
+                future.cancel()
+
+    def extract_content(self, file_obj, file_ext: str, title: str = None) -> Optional[Dict[str, str]]:
+        """확장자별 추출기 호출 (지원하지 않는 형식이면 None)"""
+        return document_extract.extract_content(file_obj, file_ext, title=title)
 
-    def extract_pptx_content(self, file_obj) -> Dict[str, str]:
+    def extract_file(self, file_path: str) -> Optional[Dict[str, str]]:
+        """로컬 문서 텍스트 추출 (PDF는 페이지별 텍스트, document_extract.extract_pdf_file 참고)"""
+        return document_extract.extract_file(file_path, max_pages=PDF_PARALLEL_PAGE_THRESHOLD)
+
+    def process_file(self, file_path: str) -> Optional[Dict]:
+        """로컬 문서 하나를 추출 후 임베딩 저장"""
         try:
-            prs = Presentation(file_obj)
-            content = "\n".join([shape.text for slide in prs.slides for shape in slide.shapes if hasattr(shape, "text")])
-            return {"title": "PowerPoint Document", "content": content}
+            return self._store_extracted(file_path, self.extract_file(file_path))
         except Exception as e:
-            logging.error(f" PPTX 처리 실패: {str(e)}")
+            logging.error(f" 문서 처리 중 오류 발생 ({file_path}): {str(e)}")
             return None
 
-    def extract_xlsx_content(self, file_obj) -> Dict[str, str]:
+    def process_files(self, file_paths: List[str],
+                      timeout: float = DOCUMENT_EXTRACT_TIMEOUT_SEC) -> Iterator[Dict]:
+        """
+        로컬 문서 여러 개를 추출 프로세스 풀에서 병렬 추출하고, 끝나는 순서대로 임베딩 저장 후 결과 생성
+
+        추출 결과가 쌓이지 않도록 동시에 맡기는 파일은 워커 수의 2배로 제한한다.
+        """
+        remaining = iter(file_paths)
+        futures = {}
+
+        def submit_next():
+            file_path = next(remaining, None)
+            if file_path is not None:
+                future, pool = self._submit(extract_document_file, file_path, timeout)
+                futures[future] = (file_path, pool)
+
         try:
-            wb = load_workbook(file_obj)
-            content = "\n".join(
-                f"[{sheet}]\n" + "\n".join(
-                    " | ".join(str(cell) for cell in row if cell) for row in wb[sheet].iter_rows(values_only=True)
-                ) for sheet in wb.sheetnames
-            ).strip()
-            return {"title": "Excel Document", "content": content}
-        except Exception as e:
-            logging.error(f" Excel 처리 실패: {str(e)}")
+            for _ in range(self.workers * 2):
+                submit_next()
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, pool = futures.pop(future)
+                    try:
+                        extracted = future.result()
+                    except BrokenProcessPool as e:
+                        logging.error(f" 문서 추출 워커 비정상 종료 ({file_path}): {str(e)}")
+                        self._discard_pool(pool)
+                        continue
+                    except Exception as e:
+                        logging.error(f" 문서 추출 실패 ({file_path}): {str(e)}")
+                        continue
+                    finally:
+                        submit_next()
+                    result = self._store_extracted(file_path, extracted)
+                    if result:
+                        yield result
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _store_extracted(self, file_path: str, extracted: Optional[Dict]) -> Optional[Dict]:
+        if extracted and 'pages' in extracted:
+            pages = extracted['pages']
+            if pages is None:    # 페이지가 많은 PDF는 구간별로 추출하며 바로 저장
+                pages = self.iter_pdf_file_pages(file_path)
+            return self._store_pages(file_path, extracted['title'], pages)
+
+        if not extracted or not extracted.get('content', '').strip():
+            logging.error(f" 문서에서 텍스트를 추출할 수 없음: {file_path}")
             return None
+        if not self.base_manager.create_document_embedding(file_path, extracted):
+            return None
+        return {
+            'file_path': file_path,
+            'type': 'document',
+            'title': extracted.get('title', ''),
+            'content_length': len(extracted['content'])
+        }
+
+    def _store_pages(self, source: str, title: str, pages: Iterable[Tuple[int, str]],
+                     progress_callback=None, total_pages: Optional[int] = None) -> Optional[Dict]:
+        """
+        페이지를 받는 대로 청크로 나눠 임베딩 저장 (문서 전체 텍스트를 모으지 않음)
+
+        추출과 임베딩이 페이지 단위로 맞물려 진행되므로 total_pages를 알면 두 단계 진행률을 읽은 페이지 비율로 보고한다.
+        """
+        report = progress_reporter(progress_callback)
+        stats = {'pages': 0, 'content_length': 0}
+
+        def counted_pages():
+            for page_number, text in pages:
+                stats['pages'] += 1
+                stats['content_length'] += len(text)
+                if total_pages:
+                    report('extraction', stats['pages'] / total_pages)
+                yield page_number, text
+            report('extraction', 1.0)
+
+        report('extraction', 0.0)
+        report('embedding', 0.0)
+        chunks = iter_text_chunks(counted_pages(), DOCUMENT_CHUNK_SIZE, DOCUMENT_CHUNK_OVERLAP)
+        stored = self.base_manager.create_document_chunk_embeddings(source, title, chunks)
+        if not stored:
+            logging.error(f" 문서에서 텍스트를 추출할 수 없음: {source}")
+            return None
+        report('embedding', 1.0)
+        return {
+            'file_path': source,
+            'type': 'document',
+            'title': title,
+            'content_length': stats['content_length'],
+            'page_count': stats['pages'],
+            'chunk_count': stored
+        }
 
     def create_chunks(self, text: str, chunk_size: int = 300, overlap_size: int = 75) -> List[str]:
         """텍스트를 300자 청크 + 75자 오버랩 방식으로 분할"""
@@ -85,47 +269,41 @@ class DocumentProcessor:
         logging.info(f" 생성된 청크 수: {len(chunks)}")
         return chunks
 
-    def process_document_url(self, file_url: str):
-        """문서 URL을 처리하여 300자 청크 + 75자 오버랩 방식으로 변환"""
+    def process_document_url(self, file_url: str, progress_callback=None) -> Optional[Dict]:
+        """
+        문서 URL을 다운로드해 추출 후 임베딩 저장 (PDF는 페이지를 파싱하는 대로 청크 저장)
+
+        progress_callback으로 다운로드/추출/임베딩 진행률을 보고한다.
+        """
+        report = progress_reporter(progress_callback)
         try:
             logging.info(f"문서 다운로드 및 처리 시작: {file_url}")
-            parsed_url = urlparse(file_url)
-            file_ext = os.path.splitext(parsed_url.path)[1].lower().replace(".", "")
-
-            response = requests.get(file_url)
-            if response.status_code != 200:
-                raise Exception(f" 문서 다운로드 실패: {response.status_code}")
-
-            file_content = io.BytesIO(response.content)
-            extracted_data = None
-
-            if file_ext == "pdf":
-                extracted_data = self.extract_pdf_content(file_content)
-            elif file_ext == "docx":
-                extracted_data = self.extract_docx_content(file_content)
-            elif file_ext == "pptx":
-                extracted_data = self.extract_pptx_content(file_content)
-            elif file_ext == "xlsx":
-                extracted_data = self.extract_xlsx_content(file_content)
-            elif file_ext == "txt":
-                raw_data = response.content
-                detected_encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
-                content_text = raw_data.decode(detected_encoding, errors='ignore').strip()
-                extracted_data = {"title": "Text File", "content": content_text}
-            else:
-                raise Exception(f" 지원하지 않는 문서 형식: {file_ext}")
-
-            if not extracted_data or not extracted_data.get('content', '').strip():
-                raise Exception(" 문서에서 텍스트를 추출할 수 없음!")
-
-            # 300자 청크 + 75자 오버랩 적용
-            content = extracted_data['content']
-            extracted_data['chunks'] = self.create_chunks(content, chunk_size=300, overlap_size=75)
-
-            logging.info(f" 문서 제목: {extracted_data['title']}")
-            logging.info(f" 첫 번째 청크 (300자 기준): {extracted_data['chunks'][0][:300]}...")
-            return extracted_data
+
+            # 스트리밍 다운로드 버퍼(큰 파일은 임시 파일)를 파서가 바로 읽음
+            report('download', 0.0)
+            with download(file_url) as downloaded:
+                report('download', 1.0)
+                file_ext = downloaded.extension
+                if downloaded.sniffed_type == "application/pdf":
+                    file_ext = "pdf"    # 확장자 없는 URL도 실제 형식으로 처리
+
+                if file_ext == "pdf":
+                    reader = PdfReader(downloaded.open())
+                    result = self._store_pages(file_url, document_extract.pdf_title(reader), self.iter_pdf_pages(reader),
+                                               progress_callback=progress_callback, total_pages=len(reader.pages))
+                else:
+                    report('extraction', 0.0)
+                    extracted = self.extract_content(downloaded.open(), file_ext)
+                    report('extraction', 1.0)
+                    report('embedding', 0.0)
+                    result = self._store_extracted(file_url, extracted)
+                    if result:
+                        report('embedding', 1.0)
+
+            if result:
+                logging.info(f" 문서 제목: {result['title']}")
+            return result
 
         except Exception as e:
             logging.error(f" 문서 처리 중 오류 발생: {str(e)}")
-            return {"success": False, "message": str(e)}
+            return None
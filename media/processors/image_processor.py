@@ -2,27 +2,27 @@ import torch
 import logging
 from PIL import Image
 from google.cloud import vision
-from .base_processor import BaseProcessor
-from ..utils.translation_utils import translate_text
-import requests
-from io import BytesIO
-import tempfile
-import os
-
-class ImageProcessor(BaseProcessor):
-    def __init__(self, base_manager, ram_model, transform, blip_model, blip_processor, vision_client=None):
-        super().__init__(base_manager)
-        self.ram_model = ram_model
-        self.transform = transform
-        self.blip_model = blip_model
-        self.blip_processor = blip_processor
-        self.vision_client = vision_client
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-
-    def process_image(self, file_path: str, file_url: str = None):
+from .base_processor import ModelProcessor
+from concurrent.futures import ThreadPoolExecutor
+from ..utils.constants import IMAGE_BATCH_SIZE, IMAGE_DECODE_WORKERS
+from ..utils.download_utils import download
+from ..utils.progress import progress_reporter
+
+class ImageProcessor(ModelProcessor):
+    """이미지 처리: OCR, BLIP 캡션, RAM 태그"""
+
+    def process_image(self, file_path, file_url: str = None, progress_callback=None):
+        """
+        이미지 한 장 처리
+
+        Args:
+            file_path: 이미지 파일 경로 또는 읽을 수 있는 파일 객체 (다운로드 버퍼)
+            progress_callback (callable): 단계별 진행률 콜백 (stage, progress)
+        """
+        report = progress_reporter(progress_callback)
         try:
             print("\n" + "="*50)
-            print(f"이미지 처리 시작: {file_path}")
+            print(f"이미지 처리 시작: {file_url or file_path}")
             print("="*50)
             
             original_file_url = file_url if file_url else file_path
@@ -39,42 +39,36 @@ class ImageProcessor(BaseProcessor):
                 print("텍스트가 감지되지 않았습니다.")
                 ocr_text = ''
 
-            # BLIP과 RAM 동시 처리
-            print("\n[BLIP 캡션 생성 중...]")
+            # BLIP 캡션과 RAM 태그 생성 (추론 백엔드에서 다른 요청과 함께 배치 처리)
+            print("\n[BLIP 캡션 / RAM 태그 생성 중...]")
+            report('inference', 0.0)
             try:
-                inputs = self.blip_processor(image, return_tensors="pt").to(self.device, torch.float16)
-                with torch.no_grad():
-                    outputs = self.blip_model.generate(**inputs, max_new_tokens=100)
-                    caption = self.blip_processor.decode(outputs[0], skip_special_tokens=True)
+                inference_result = self.inference.infer([image])[0]
+                caption = inference_result['caption']
+                tags = inference_result['tags']
             except Exception as e:
-                print(f"캡션 생성 중 오류: {str(e)}")
+                print(f"캡션/태그 생성 중 오류: {str(e)}")
                 return None
+            report('inference', 1.0)
 
-            print("\n[RAM 태그 생성 중...]")
-            try:
-                ram_input = self.transform(image).unsqueeze(0).to(self.device)
-                with torch.no_grad():
-                    result = self.ram_model.generate_tag(ram_input)
-                    if isinstance(result, tuple):
-                        tags = result[0][0].split(' | ')
-                    else:
-                        tags = result[0].split(' | ')
-
-                    print(f"[디버그] 분리된 태그들: {tags}")
+            print(f"[디버그] 분리된 태그들: {tags}")
 
-                    # 캡션과 태그 따로 번역
-                    translated_caption = self.translate_caption(caption)
-                    translated_tags = self.translate_tags(tags)
+            report('translation', 0.0)
+            try:
+                # 캡션과 태그 따로 번역
+                translated_caption = self.translate_caption(caption)
+                translated_tags = self.translate_tags(tags)
 
-                    print(f"\n생성된 캡션: {translated_caption}")
-                    print(f"생성된 태그: {' | '.join(translated_tags)}")
+                print(f"\n생성된 캡션: {translated_caption}")
+                print(f"생성된 태그: {' | '.join(translated_tags)}")
 
-                    caption = translated_caption
-                    tags = translated_tags
+                caption = translated_caption
+                tags = translated_tags
 
             except Exception as e:
-                print(f"RAM 태그 생성 중 오류: {str(e)}")
+                print(f"번역 중 오류: {str(e)}")
                 return None
+            report('translation', 1.0)
 
             embedding_data = {
                 'type': 'image',
@@ -84,21 +78,93 @@ class ImageProcessor(BaseProcessor):
                 'ocr_text': ocr_text
             }
 
+            report('embedding', 0.0)
             success = self.base_manager.create_image_embedding(original_file_url, embedding_data)
             if not success:
                 print("임베딩 저장 실패")
                 return None
+            report('embedding', 1.0)
 
             print("\n=== 이미지 처리 완료 ===")
             return {'file_url': original_file_url, 'metadata': embedding_data}  
 
         except Exception as e:
-            logging.error(f"이미지 처리 중 오류 ({file_path}): {str(e)}")
+            logging.error(f"이미지 처리 중 오류 ({file_url or file_path}): {str(e)}")
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
             return None
 
 
+    def process_images(self, file_paths, batch_size: int = IMAGE_BATCH_SIZE):
+        """
+        여러 이미지를 배치로 처리 (디렉토리 수집용)
+
+        디코딩과 OCR은 스레드 풀에서 병렬로 수행하고, BLIP 캡션/RAM 태그는 추론 백엔드에
+        한꺼번에 넘겨 배치로 생성한 뒤 번역과 임베딩도 배치 단위로 처리한다.
+        GPU 메모리에 맞춘 실제 추론 배치 크기는 추론 백엔드가 조정한다.
+
+        Returns:
+            list: 처리에 성공한 이미지 결과 목록
+        """
+        processed_results = []
+        with ThreadPoolExecutor(max_workers=IMAGE_DECODE_WORKERS, thread_name_prefix="image-decode") as executor:
+            for start in range(0, len(file_paths), batch_size):
+                batch_paths = file_paths[start:start + batch_size]
+
+                # 1. 디코딩 + OCR (병렬)
+                loaded = [item for item in executor.map(self._load_image, batch_paths) if item]
+                if not loaded:
+                    continue
+
+                # 2. BLIP 캡션 + RAM 태그 (배치 추론)
+                inference_results = self.inference.infer([image for _, image, _ in loaded], return_exceptions=True)
+
+                # 3. 번역 (캡션 일괄 번역 + 태그 사전)
+                candidates = []
+                for (file_path, _, ocr_text), result in zip(loaded, inference_results):
+                    if isinstance(result, Exception):
+                        logging.error(f"캡션/태그 생성 실패 ({file_path}): {str(result)}")
+                        continue
+                    candidates.append((file_path, ocr_text, result))
+
+                translated = zip(
+                    self.translate_captions([result['caption'] for _, _, result in candidates]),
+                    self.translate_tag_lists([result['tags'] for _, _, result in candidates])
+                )
+
+                # 4. 임베딩 + 저장 (배치)
+                items = [
+                    (file_path, {
+                        'type': 'image',
+                        'file_url': file_path,
+                        'caption': caption,
+                        'tags': tags,
+                        'ocr_text': ocr_text
+                    })
+                    for (file_path, ocr_text, _), (caption, tags) in zip(candidates, translated)
+                ]
+                stored = self.base_manager.create_image_embeddings(items)
+                for (file_path, embedding_data), success in zip(items, stored):
+                    if success:
+                        processed_results.append({'file_url': file_path, 'metadata': embedding_data})
+                    else:
+                        logging.error(f"임베딩 저장 실패: {file_path}")
+
+                progress = min((start + batch_size) / len(file_paths) * 100, 100)
+                print(f"이미지 처리 진행률: {progress:.1f}% (성공 {len(processed_results)}개)")
+
+        return processed_results
+
+    def _load_image(self, file_path: str):
+        """이미지 디코딩 + OCR (실패 시 None)"""
+        try:
+            image = Image.open(file_path).convert('RGB')
+            ocr_text = self.detect_text(file_path) or ''
+            return file_path, image, ocr_text
+        except Exception as e:
+            logging.error(f"이미지 로드 실패 ({file_path}): {str(e)}")
+            return None
+
     def generate_caption(self, file_url: str):
         """BLIP-2 캡셔닝"""
         if not self.blip_processor:
@@ -127,13 +193,17 @@ class ImageProcessor(BaseProcessor):
             logging.error(f"태그 생성 오류: {str(e)}")
             return None
 
-    def detect_text(self, file_url: str):
-        """OCR 처리"""
+    def detect_text(self, file_url):
+        """OCR 처리 (파일 경로 또는 파일 객체)"""
         if not self.vision_client:
             return None
         try:
-            with open(file_url, 'rb') as image_file:
-                content = image_file.read()
+            if hasattr(file_url, 'read'):
+                file_url.seek(0)
+                content = file_url.read()
+            else:
+                with open(file_url, 'rb') as image_file:
+                    content = image_file.read()
             image = vision.Image(content=content)
             response = self.vision_client.text_detection(image=image)
             texts = response.text_annotations
@@ -142,45 +212,29 @@ class ImageProcessor(BaseProcessor):
             logging.error(f"OCR 처리 오류: {str(e)}")
             return None
 
-    def translate_caption(self, caption):
-        return translate_text(self.base_manager.client, caption, is_caption=True)
-
-    def translate_tags(self, tags):
-        tags_text = ', '.join(tags)
-        translated = translate_text(self.base_manager.client, tags_text, is_caption=False)
-        return [tag.strip() for tag in translated.split(',')]
-    
-    def process_image_url(self, file_url: str, file_name: str):
-        """URL 이미지 처리 메서드"""
+    def process_image_url(self, file_url: str, file_name: str, progress_callback=None):
+        """URL 이미지 처리 메서드 (progress_callback으로 다운로드/추론/번역/임베딩 진행률 보고)"""
+        report = progress_reporter(progress_callback)
         try:
             print(f"\n=== URL 이미지 처리 시작 ===")
             print(f"URL: {file_url}")
             print(f"파일명: {file_name}")
 
-            # URL에서 이미지 다운로드
-            response = requests.get(file_url)
-            if response.status_code != 200:
-                raise ValueError(f"이미지 다운로드 실패: {response.status_code}")
+            # 한 번의 스트리밍 다운로드 버퍼를 디코딩과 OCR이 함께 읽음 (임시 파일 재저장 없음)
+            report('download', 0.0)
+            with download(file_url) as downloaded:
+                if downloaded.sniffed_type and not downloaded.is_image():
+                    raise ValueError(f"이미지 파일이 아닙니다: {downloaded.sniffed_type}")
+                report('download', 1.0)
 
-            # 임시 파일로 저장
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file_name)[1]) as temp_file:
-                temp_file.write(response.content)
-                temp_path = temp_file.name
+                result = self.process_image(downloaded.open(), file_url=file_url, progress_callback=progress_callback)
 
-            try:
-                result = self.process_image(temp_path, file_url=file_url)
-
-                if result:
-                    print(f"\n=== URL 이미지 처리 완료 ===")
-                    return result
-                else:
-                    print(f"\n=== URL 이미지 처리 실패 ===")
-                    return None
-
-            finally:
-                # 임시 파일 삭제
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            if result:
+                print(f"\n=== URL 이미지 처리 완료 ===")
+                return result
+            else:
+                print(f"\n=== URL 이미지 처리 실패 ===")
+                return None
 
         except Exception as e:
             logging.error(f"URL 이미지 처리 중 오류 발생: {str(e)}")
@@ -1,119 +1,79 @@
 import cv2
 import torch
-import requests
 from PIL import Image
 import logging
-from .base_processor import BaseProcessor
+from .base_processor import ModelProcessor
 import os
-from ..utils.translation_utils import translate_text
-import numpy as np
-from transformers import Blip2Processor, Blip2ForConditionalGeneration
-from ram import models
-from torchvision import transforms
-from google.cloud import vision
+from ..utils.frame_sampler import FrameSampler
+from ..utils.scene_selector import SceneSelector
+from ..utils.constants import (
+    VIDEO_FRAME_BATCH_SIZE,
+    VIDEO_SCENE_PROBE_INTERVAL_SEC,
+    VIDEO_AUDIO_RMS_THRESHOLD,
+    VIDEO_AUDIO_ANALYSIS_SECONDS,
+    DOWNLOAD_MAX_BYTES
+)
+from ..utils.audio_analysis import analyze_audio
+from ..utils.download_utils import download_to_file
+from ..utils.workspace import JobWorkspace
+from ..utils.progress import progress_reporter
 from .audio_processor import AudioProcessor  # AudioProcessor 임포트 추가
-from pydub import AudioSegment
-import subprocess
 from datetime import datetime  # datetime 모듈 추가
-class VideoProcessor(BaseProcessor):
-    def __init__(self, base_manager, ram_model, transform, blip_model, blip_processor, vision_client=None):
-        super().__init__(base_manager)
-        self.ram_model = ram_model
-        self.transform = transform
-        self.blip_model = blip_model
-        self.blip_processor = blip_processor
-        self.vision_client = vision_client
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+class VideoProcessor(ModelProcessor):
+    """비디오 처리: 프레임 추출, BLIP 캡션, RAM 태그"""
+
+    def process_video(self, video_path: str, file_url: str = None, progress_callback=None):
+        """
+        비디오 처리: 프레임 추출, 캡셔닝, 메타데이터용 태깅
+
+        배치마다 추론 → 번역 → 임베딩을 끝내므로 세 단계 진행률은 처리한 영상 위치(초) 기준으로 함께 보고한다.
+        """
+        report = progress_reporter(progress_callback)
+
+        def report_batch(timestamp):
+            progress = timestamp / sampler.duration if sampler.duration > 0 else 0.0
+            for stage in ('inference', 'translation', 'embedding'):
+                report(stage, progress)
 
-    def process_video(self, video_path: str, file_url: str = None):
-        """비디오 처리: 프레임 추출, 캡셔닝, 메타데이터용 태깅"""
         try:
             print("\n" + "="*50)
             print(f"비디오 처리 시작: {video_path}")
             print("="*50)
             
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                raise Exception("비디오 파일을 열 수 없습니다.")
-
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            duration = total_frames / fps
-            
-            if duration < 60:  # 1분 미만
-                interval = 15  # 15초마다
-            elif duration < 300:  # 5분 미만
-                interval = 30
-            else:  # 5분 이상
-                interval = 45
+            # 후보 프레임만 꺼내고 (간격이 촘촘하면 grab()으로 순차, 멀면 seek), 장면 전환/중복 여부로 추론할 프레임 선택
+            sampler = FrameSampler(video_path)
+            selector = SceneSelector()
             
-            frame_interval = int(fps * interval)
+            target_path = file_url or video_path  # file_url이 있으면 사용, 없으면 video_path
+            batch_frames = []
+            batch_infos = []
             frames_data = []
-            frame_count = 0
             
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                    
-                if frame_count % frame_interval == 0:
-                    print(f"\n[프레임 {frame_count} 처리 중...]")
+            with sampler:
+                probes = sampler.frames_every(VIDEO_SCENE_PROBE_INTERVAL_SEC)
+                for frame_index, timestamp, frame in selector.select(probes):
+                    print(f"\n[프레임 {frame_index} 수집]")
                     frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    frame_pil = Image.fromarray(frame_rgb)
-                    
-                    try:
-                        # BLIP 캡셔닝 & 번역
-                        print("\n[BLIP 캡션 생성 중...]")
-                        inputs = self.blip_processor(frame_pil, return_tensors="pt").to(self.device, torch.float16)
-                        with torch.no_grad():
-                            outputs = self.blip_model.generate(**inputs, max_new_tokens=100)
-                            caption = self.blip_processor.decode(outputs[0], skip_special_tokens=True)
-                            translated_caption = translate_text(self.base_manager.client, caption, is_caption=True)
-                        
-                        # RAM 태깅 & 번역
-                        print("\n[RAM 태그 생성 중...]")
-                        ram_input = self.transform(frame_pil).unsqueeze(0).to(self.device)
-                        with torch.no_grad():
-                            tags = self.ram_model.generate_tag(ram_input)
-                            if isinstance(tags, tuple):
-                                tags = tags[0]
-                            if isinstance(tags, str):
-                                tags = tags.split(' | ')
-                            # 태그 번역 추가
-                            translated_tags = translate_text(self.base_manager.client, ' | '.join(tags), is_caption=False)
-                            translated_tags = [tag.strip() for tag in translated_tags.split('|')]
-                        
-                        # 임베딩 데이터 저장
-                        embedding_data = {
-                            'caption': translated_caption,
-                            'frame': frame_count,
-                            'timestamp': frame_count / fps,
-                            'tags': translated_tags  # 번역된 태그
-                        }
-                        
-                        # file_url을 우선적으로 사용
-                        success = self.base_manager.create_video_embedding(
-                            file_url or video_path,  # file_url이 있으면 사용, 없으면 video_path
-                            embedding_data
-                        )
-                        
-                        if success:
-                            frames_data.append(embedding_data)
-                            
-                    except Exception as e:
-                        print(f"프레임 처리 중 오류: {str(e)}")
-                        frame_count += 1
-                        continue
-                    
-                    frame_count += 1
-                else:
-                    frame_count += 1
-            
-            cap.release()
+                    batch_frames.append(Image.fromarray(frame_rgb))
+                    batch_infos.append({'frame': frame_index, 'timestamp': timestamp})
+
+                    # 배치가 차면 추론 → 번역 → 임베딩 → 저장
+                    if len(batch_frames) >= VIDEO_FRAME_BATCH_SIZE:
+                        frames_data.extend(self._process_frame_batch(batch_frames, batch_infos, target_path))
+                        report_batch(batch_infos[-1]['timestamp'])
+                        batch_frames, batch_infos = [], []
+
+            print(f"디코딩한 프레임: {sampler.decoded_frames}개, seek {sampler.seeks}회 (방식: {sampler.mode})")
+            print(f"장면 선택 통계: {selector.stats()}")
+
+            if batch_frames:
+                frames_data.extend(self._process_frame_batch(batch_frames, batch_infos, target_path))
+            for stage in ('inference', 'translation', 'embedding'):
+                report(stage, 1.0)
             
             if frames_data:
                 return {
-                    'file_path': file_url or video_path,  # file_url 우선 사용
+                    'file_path': target_path,  # file_url 우선 사용
                     'frames': frames_data,
                     'type': 'video'
                 }
@@ -154,138 +114,98 @@ class VideoProcessor(BaseProcessor):
             return None
 
     def _process_frame_batch(self, frames, frame_infos, video_path):
+        """
+        프레임 배치 처리: 배치 추론(BLIP 캡션 + RAM 태그) → 일괄 번역 → 배치 임베딩 → 벌크 업서트
+
+        Returns:
+            list: 저장된 프레임 데이터 목록
+        """
         try:
-            # 1. 모든 프레임 한번에 입력 준비
-            blip_inputs = self.blip_processor(frames, return_tensors="pt").to(self.device, torch.float16)
-            ram_inputs = torch.stack([self.transform(frame) for frame in frames]).to(self.device)
-            
-            # 2. 모든 모델 추론 한번에 실행
-            with torch.no_grad():
-                # BLIP 캡션 생성
-                outputs = self.blip_processor.generate(**blip_inputs, max_new_tokens=100)
-                captions = [self.blip_processor.decode(output, skip_special_tokens=True) for output in outputs]
-                
-                # RAM 태그 생성 - 수정된 부분
-                batch_tags = self.ram_model.generate_tag(ram_inputs)
-                if isinstance(batch_tags, tuple):
-                    batch_tags = batch_tags[0]
-            
-            # 3. 모든 텍스트 한번에 번역
-            combined_texts = []
-            for caption, tags in zip(captions, batch_tags):
-                combined_texts.append(f"{caption} ||| {', '.join(tags)}")
-            
-            all_text = " <<< >>> ".join(combined_texts)
-            translated_text = translate_text(self.base_manager.client, all_text, is_caption=True)
-            
-            # 4. 번역된 텍스트 분리 및 결과 저장
-            batch_results = []
-            unique_frames = []
-            unique_frame_infos = []
-            prev_frame = None
+            print(f"\n[프레임 {len(frames)}개 배치 처리 중...]")
 
-            for frame_info, translated_pair in zip(frame_infos, translated_text.split(" <<< >>> ")):
-                caption, tags_text = translated_pair.split(" ||| ")
-                tags = [tag.strip() for tag in tags_text.split(',')]
-                
-                frame_array = np.array(frame_info['frame'])
-                if prev_frame is None:
-                    unique_frames.append(frame_info['frame'])
-                    unique_frame_infos.append(frame_info)
-                    prev_frame = frame_array
-                else:
-                    diff = np.mean((frame_array - prev_frame) ** 2)
-                    if diff > 3000:  # 더 큰 차이가 있을 때만 처리
-                        unique_frames.append(frame_info['frame'])
-                        unique_frame_infos.append(frame_info)
-                        prev_frame = frame_array
+            # 1. 캡션/태그 배치 추론 (실패한 프레임은 제외)
+            inference_results = self.inference.infer(frames, return_exceptions=True)
+            valid = []
+            for frame_info, result in zip(frame_infos, inference_results):
+                if isinstance(result, Exception):
+                    logging.error(f"프레임 {frame_info['frame']} 추론 실패: {str(result)}")
+                    continue
+                valid.append((frame_info, result))
+            if not valid:
+                return []
 
-                embedding_data = {
-                    'type': 'video',
+            # 2. 캡션은 한 번의 요청으로 일괄 번역, 태그는 태그 사전 조회 (사전에 없는 태그만 번역)
+            captions = self.translate_captions([result['caption'] for _, result in valid])
+            tag_lists = self.translate_tag_lists([result['tags'] for _, result in valid])
+
+            # 3. 배치 임베딩 후 쓰기 버퍼로 전달
+            pending_frames = [
+                {
                     'caption': caption,
-                    'tags': tags,
                     'frame': frame_info['frame'],
-                    'timestamp': frame_info['timestamp']
+                    'timestamp': frame_info['timestamp'],
+                    'tags': tags  # 번역된 태그
                 }
-                
-                success = self.base_manager.create_video_embedding(video_path, embedding_data)
-                if success:
-                    batch_results.append(embedding_data)
-            
-            return batch_results
+                for (frame_info, _), caption, tags in zip(valid, captions, tag_lists)
+            ]
+            return self.base_manager.create_video_embeddings(video_path, pending_frames)
 
         except Exception as e:
             logging.error(f"배치 처리 중 오류: {str(e)}")
-            return [] 
+            return []
 
     def check_audio_volume(self, video_path: str) -> float:
-        """비디오의 평균 오디오 볼륨 확인"""
+        """비디오의 평균 오디오 볼륨 확인 (PCM 스트림으로 계산, 임시 파일 없음)"""
         try:
-            # 비디오에서 오디오 추출 (AAC 포맷 사용)
-            audio_path = "temp_audio.m4a"  # .mp3 대신 .m4a 사용
-            command = f'ffmpeg -i "{video_path}" -vn -c:a aac "{audio_path}"'
-            subprocess.call(command, shell=True)
-            
-            # 오디오 로드 및 볼륨 체크
-            audio = AudioSegment.from_file(audio_path, format="m4a")  # format 지정
-            volume_rms = audio.rms
-            
-            # 임시 파일 삭제
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-                
-            return volume_rms
-            
+            return analyze_audio(video_path, max_seconds=VIDEO_AUDIO_ANALYSIS_SECONDS or None).rms
         except Exception as e:
             logging.error(f"오디오 볼륨 체크 중 오류: {str(e)}")
             return 0.0
 
 
-    def process_video_url(self, file_url: str, filename: str) -> dict:
+    def process_video_url(self, file_url: str, filename: str, progress_callback=None) -> dict:
+        """URL 비디오 처리 (progress_callback으로 다운로드 후 오디오 변환 또는 프레임 추론 단계 진행률 보고)"""
+        report = progress_reporter(progress_callback)
         try:
             logging.info("\n=== 비디오 URL 처리 시작 ===")
             logging.info(f"URL: {file_url}")
             logging.info(f"파일 이름: {filename}")
             
-            # 비디오 다운로드
-            response = requests.get(file_url, stream=True)
-            if response.status_code != 200:
-                raise Exception(f"비디오 다운로드 실패 (상태 코드: {response.status_code})")
-            
-            # 임시 파일로 저장
-            temp_path = f"temp_{filename}"
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            if not os.path.exists(temp_path):
-                raise Exception("임시 파일 생성 실패")
-                
+            # 작업별 임시 작업 공간에 다운로드 (동시에 실행되는 다른 작업과 파일이 겹치지 않음)
+            workspace = JobWorkspace("video")
             try:
-                # 오디오 볼륨 체크
-                volume = self.check_audio_volume(temp_path)
+                temp_path = workspace.file(filename or "video.mp4")
+                report('download', 0.0)
+                download_to_file(file_url, temp_path, max_bytes=min(DOWNLOAD_MAX_BYTES, workspace.remaining_bytes()))
+                report('download', 1.0)
+
+                # 오디오 볼륨 분석 (ffmpeg 한 번으로 PCM을 읽으며 RMS 계산, 같은 PCM을 WAV로 기록)
+                audio_path = workspace.file("audio.wav")
+                try:
+                    analysis = analyze_audio(
+                        temp_path,
+                        output_path=audio_path,
+                        max_seconds=VIDEO_AUDIO_ANALYSIS_SECONDS or None,
+                        max_output_bytes=workspace.remaining_bytes()
+                    )
+                    volume = analysis.rms
+                except Exception as e:
+                    logging.error(f"오디오 볼륨 체크 중 오류: {str(e)}")
+                    volume = 0.0
                 logging.info(f"오디오 볼륨 레벨: {volume}")
                 
                 result = None
                 
-                if volume > 30:  # 볼륨이 30 이상이면 오디오 처리
+                if volume > VIDEO_AUDIO_RMS_THRESHOLD:  # 볼륨이 기준 이상이면 오디오 처리
                     logging.info("유의미한 오디오 감지됨 - 오디오 처리 시작")
                     
-                    # ffmpeg로 오디오 추출
-                    audio_path = "temp_audio.m4a"
-                    command = f'ffmpeg -i "{temp_path}" -vn -c:a aac "{audio_path}"'
-                    subprocess.run(command, shell=True, check=True)
-                    
-                    if not os.path.exists(audio_path):
-                        raise Exception("오디오 추출 실패")
-                    
-                    # AudioProcessor로 오디오 처리
+                    # AudioProcessor로 오디오 처리 (분석할 때 기록한 WAV를 그대로 사용)
                     audio_processor = AudioProcessor(self.base_manager)
                     audio_result = audio_processor.process_audio(
                         audio_path,
                         file_url=file_url,
-                        source_type='video_with_audio'
+                        source_type='video_with_audio',
+                        progress_callback=progress_callback
                     )
                     
                     if audio_result:
@@ -293,12 +213,15 @@ class VideoProcessor(BaseProcessor):
                             'file_path': file_url,
                             'type': 'video_with_audio',
                             'audio_segments': audio_result.get('segments', []),
+                            'transcript_gaps': audio_result.get('transcript_gaps', []),
                             'timestamp': datetime.now().isoformat()
                         }
                     
-                else:  # 볼륨이 30 미만이면 시각적 처리
+                else:  # 볼륨이 기준 미만이면 시각적 처리
                     logging.info("무음 비디오 감지됨 - 시각적 처리 시작")
-                    result = self.process_video(temp_path, file_url=file_url)
+                    if os.path.exists(audio_path):
+                        os.remove(audio_path)    # 쓰지 않는 WAV는 바로 삭제
+                    result = self.process_video(temp_path, file_url=file_url, progress_callback=progress_callback)
                 
                 if result is None:
                     raise Exception("비디오 처리 결과가 없습니다")
@@ -306,19 +229,13 @@ class VideoProcessor(BaseProcessor):
                 return result
                 
             finally:
-                # 임시 파일들 정리
-                for temp_file in [temp_path, "temp_audio.m4a"]:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
-                        logging.info(f"임시 파일 삭제: {temp_file}")
+                # 작업 공간(다운로드/추출 파일) 전체 삭제
+                workspace.cleanup()
                 
                 if torch.cuda.is_available():
                     torch.cuda.empty_cache()
                     logging.info("CUDA 캐시 정리 완료")
                     
-        except subprocess.CalledProcessError as e:
-            logging.error(f"FFmpeg 처리 실패: {str(e)}")
-            raise Exception("오디오 추출 실패")
         except Exception as e:
             logging.error(f"비디오 URL 처리 중 오류: {str(e)}", exc_info=True)
             raise Exception(f"비디오 처리 실패: {str(e)}")
\ No newline at end of file
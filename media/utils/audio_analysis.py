@@ -0,0 +1,122 @@
+import math
+import wave
+import logging
+import subprocess
+from typing import Optional
+
+import numpy as np
+
+from .constants import AUDIO_ANALYSIS_SAMPLE_RATE
+
+_READ_BYTES = 64 * 1024    # ffmpeg PCM 파이프 읽기 단위 (16비트 모노 기준 약 2초)
+
+
+class AudioAnalysis:
+    """오디오 분석 결과 (RMS는 16비트 샘플 단위, pydub AudioSegment.rms와 같은 척도)"""
+
+    def __init__(self, rms: float, peak: int, analyzed_seconds: float, duration: float,
+                 output_path: Optional[str] = None):
+        self.rms = rms
+        self.peak = peak
+        self.analyzed_seconds = analyzed_seconds
+        self.duration = duration
+        self.output_path = output_path
+
+    @property
+    def has_audio(self) -> bool:
+        return self.duration > 0
+
+    @property
+    def dbfs(self) -> float:
+        return 20 * math.log10(self.rms / 32768) if self.rms > 0 else float('-inf')
+
+    def __repr__(self):
+        return (f"AudioAnalysis(rms={self.rms:.1f}, dbfs={self.dbfs:.1f}, peak={self.peak}, "
+                f"analyzed={self.analyzed_seconds:.1f}s, duration={self.duration:.1f}s)")
+
+
+def analyze_audio(media_path: str, output_path: Optional[str] = None, max_seconds: Optional[float] = None,
+                  max_output_bytes: Optional[int] = None,
+                  sample_rate: int = AUDIO_ANALYSIS_SAMPLE_RATE) -> AudioAnalysis:
+    """
+    ffmpeg 한 번으로 오디오 트랙을 16비트 모노 PCM으로 디코딩하며 RMS를 누적 계산
+
+    파일 전체를 메모리에 올리지 않고 파이프에서 조금씩 읽는다. output_path를 주면 같은 PCM을
+    WAV로 그대로 기록하므로(재인코딩 없음) 음성 인식에 바로 넘길 수 있다.
+
+    Args:
+        max_seconds: RMS를 계산할 앞부분 길이 (None이면 전체). output_path가 없으면 이 길이만 디코딩한다.
+        max_output_bytes: WAV 최대 크기 (넘으면 예외)
+
+    Raises:
+        Exception: ffmpeg 실행 실패 또는 WAV 크기 초과
+    """
+    command = ['ffmpeg', '-nostdin', '-v', 'error', '-i', media_path, '-map', '0:a:0?', '-vn']
+    if max_seconds and not output_path:
+        command += ['-t', str(max_seconds)]
+    command += ['-ac', '1', '-ar', str(sample_rate), '-f', 's16le', 'pipe:1']
+
+    window_samples = int(max_seconds * sample_rate) if max_seconds else None
+    sum_squares = 0.0
+    analyzed = 0
+    total = 0
+    peak = 0
+    leftover = b''
+
+    writer = None
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        if output_path:
+            writer = wave.open(output_path, 'wb')
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(sample_rate)
+
+        while True:
+            data = process.stdout.read(_READ_BYTES)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - len(data) % 2
+            data, leftover = data[:usable], data[usable:]
+            if not data:
+                continue
+
+            if writer:
+                if max_output_bytes is not None and (total + len(data) // 2) * 2 > max_output_bytes:
+                    raise Exception(f"추출한 오디오가 허용 크기를 넘었습니다: {max_output_bytes} bytes")
+                writer.writeframes(data)
+
+            samples = np.frombuffer(data, dtype='<i2')
+            total += len(samples)
+            if window_samples is not None:
+                samples = samples[:max(0, window_samples - analyzed)]
+            if len(samples):
+                values = samples.astype(np.float64)
+                sum_squares += float(np.dot(values, values))
+                peak = max(peak, int(np.abs(samples.astype(np.int32)).max()))
+                analyzed += len(samples)
+
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            message = stderr.decode('utf-8', errors='ignore').strip()
+            if total:
+                raise Exception(f"ffmpeg 오디오 디코딩 실패: {message}")
+            logging.info(f"오디오 트랙 없음 또는 디코딩 불가: {message}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        if writer:
+            writer.close()
+
+    rms = math.sqrt(sum_squares / analyzed) if analyzed else 0.0
+    analysis = AudioAnalysis(
+        rms=rms,
+        peak=peak,
+        analyzed_seconds=analyzed / sample_rate,
+        duration=total / sample_rate,
+        output_path=output_path if total else None
+    )
+    logging.info(f"오디오 분석: {analysis}")
+    return analysis
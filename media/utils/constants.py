@@ -1,3 +1,5 @@
+import os
+
 # 이미지 확장자
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
 
@@ -16,4 +18,153 @@ DOCUMENT_EXTENSIONS = {
     '.csv',                  # CSV
     '.md', '.markdown',      # Markdown
     '.html', '.htm'          # HTML
-}
\ No newline at end of file
+}
+
+# 임베딩 모델
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSION = 1536
+
+# 임베딩 캐시 설정
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join("cache", "embedding_cache.sqlite3"))
+EMBEDDING_CACHE_MEMORY_ITEMS = 20000                 # 메모리(LRU) 캐시 최대 항목 수
+EMBEDDING_CACHE_MAX_DISK_BYTES = 1024 * 1024 * 1024  # 디스크 캐시 최대 크기 (1GB)
+
+# 임베딩 마이크로 배치 설정
+EMBEDDING_BATCH_MAX_ITEMS = 256       # 한 번에 요청할 최대 텍스트 수
+EMBEDDING_BATCH_MAX_TOKENS = 100000   # 한 번에 요청할 최대 토큰 수 (추정치)
+EMBEDDING_BATCH_MAX_WAIT_MS = 10      # 배치를 모으는 최대 대기 시간 (ms)
+
+# 벡터 일괄 쓰기 설정
+VECTOR_WRITE_BATCH_SIZE = 100                 # 한 번에 업서트할 최대 벡터 수
+VECTOR_WRITE_MAX_BYTES = 2 * 1024 * 1024      # 한 번에 업서트할 최대 요청 크기 (2MB)
+VECTOR_WRITE_WORKERS = 4                      # 병렬 업서트 워커 수
+
+# API 서버 실행 풀 설정 (검색과 수집을 분리된 풀에서 실행)
+SEARCH_WORKERS = 8    # 검색 요청 처리 스레드 수
+INGEST_WORKERS = 2    # 미디어 수집(모델 추론 포함) 처리 스레드 수
+
+# 백그라운드 수집 작업 설정
+JOB_QUEUE_MAX_DEPTH = 100      # 대기 + 실행 중인 작업 최대 수
+JOB_HISTORY_LIMIT = 1000       # 보관할 작업 기록 수
+JOB_CONCURRENCY = {            # 미디어 종류별 동시 실행 작업 수
+    'image': 2,
+    'video': 2,                # 작업마다 별도 임시 작업 공간을 쓰므로 동시 실행 가능
+    'audio': 2,
+    'document': 2,
+    'url': 1
+}
+
+# 벡터 저장소 설정 ('pinecone' 또는 로컬 memmap 저장소 'local')
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "pinecone")
+LOCAL_VECTOR_STORE_PATH = os.getenv("LOCAL_VECTOR_STORE_PATH", "vector_store")
+
+# 검색 결과 캐시 설정
+SEARCH_CACHE_TTL = 300                  # 캐시 유지 시간 (초)
+SEARCH_CACHE_MAX_ITEMS = 1000           # 최대 캐시 항목 수
+SEARCH_CACHE_SEMANTIC_DISTANCE = 0.03   # 의미 유사 캐시 코사인 거리 한도 (None이면 사용 안 함)
+
+# 모델 로드 설정 (1이면 서버 시작 후 백그라운드에서 모델을 미리 로드, 0이면 처음 사용할 때 로드)
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") == "1"
+
+# 캡션/태그 추론 설정 ('local': 프로세스 내 추론, 'server': 별도 모델 서버 프로세스 사용)
+INFERENCE_MODE = os.getenv("INFERENCE_MODE", "local")
+INFERENCE_MAX_BATCH = 16         # 동적 배치 최대 이미지 수
+INFERENCE_MAX_WAIT_MS = 20       # 배치를 채우기 위해 기다리는 최대 시간 (ms)
+INFERENCE_SERVER_HOST = os.getenv("INFERENCE_SERVER_HOST", "127.0.0.1")
+INFERENCE_SERVER_PORT = int(os.getenv("INFERENCE_SERVER_PORT", "50055"))
+INFERENCE_SERVER_AUTHKEY = os.getenv("INFERENCE_SERVER_AUTHKEY", "media-inference")
+INFERENCE_TIMEOUT = 300          # 이미지 한 장 추론 결과 대기 시간 (초)
+INFERENCE_MEMORY_PER_IMAGE_MB = 512    # 배치 이미지 한 장당 필요한 GPU 메모리 추정치 (배치 크기 제한용)
+INFERENCE_CLIENT_HEARTBEAT_SEC = 10    # 모델 서버 클라이언트가 살아 있음을 알리는 간격 (초)
+INFERENCE_CLIENT_TTL_SEC = 60          # 이 시간 동안 소식이 없는 클라이언트의 응답 큐는 모델 서버에서 삭제
+
+# 비디오 프레임 배치 설정
+VIDEO_FRAME_BATCH_SIZE = 16      # 한 번에 추론/번역/임베딩하는 프레임 수
+VIDEO_SEEK_TOLERANCE_SEC = 1.0   # seek 후 위치 오차가 이보다 크면 순차 디코딩으로 전환
+VIDEO_SEEK_MIN_GAP_SEC = 5.0     # 다음 목표 프레임이 이보다 가까우면 seek 대신 grab()으로 건너뜀 (seek마다 키프레임부터 다시 디코딩하므로)
+
+# 비디오 장면 선택 설정 (추론 전 장면 전환 감지 + 중복 프레임 제거)
+VIDEO_SCENE_PROBE_INTERVAL_SEC = 2.0   # 장면 비교용 후보 프레임 간격 (초)
+VIDEO_MIN_FRAMES_PER_MINUTE = 1        # 정적인 장면에서도 분당 최소 선택 프레임 수
+VIDEO_MAX_FRAMES_PER_MINUTE = 6        # 분당 최대 선택 프레임 수
+VIDEO_SCENE_CUT_DISTANCE = 0.35        # 직전 후보와 히스토그램 거리가 이 이상이면 장면 전환
+VIDEO_DUPLICATE_HASH_DISTANCE = 10     # 마지막 선택 프레임과 dHash 해밍 거리가 이 이하이고
+VIDEO_DUPLICATE_HIST_DISTANCE = 0.15   # 히스토그램 거리도 이 이하면 중복 프레임으로 간주
+
+# 번역 방식
+# 'ingest': 수집 시 캡션/태그를 한국어로 번역해 저장
+# 'query': 영어 캡션/태그를 그대로 저장하고, 검색 시 검색어를 영어로 번역해 두 언어로 검색한 뒤 결과만 표시할 때 번역
+TRANSLATION_MODE = os.getenv("TRANSLATION_MODE", "ingest")
+
+# 번역 메모리 / 일괄 번역 설정
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", os.path.join("cache", "translation_memory.sqlite3"))
+TRANSLATION_CACHE_MEMORY_ITEMS = 50000   # 메모리 LRU 항목 수
+TRANSLATION_BATCH_SIZE = 50              # 번역 요청 한 번에 보내는 항목 수
+
+# RAM++ 태그 한국어 사전 (python -m media.utils.tag_lexicon build 로 생성)
+TAG_LEXICON_PATH = os.getenv("TAG_LEXICON_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ram_tag_ko.json"))
+TAG_LEXICON_REQUIRED = os.getenv("TAG_LEXICON_REQUIRED", "0") == "1"    # 사전이 없거나 태그가 빠져 있으면 서버 시작 실패
+
+# 이미지 일괄 처리 설정 (디렉토리 수집)
+IMAGE_BATCH_SIZE = 32            # 한 번에 디코딩/추론/임베딩하는 이미지 수
+IMAGE_DECODE_WORKERS = 8         # 이미지 디코딩/OCR 병렬 스레드 수
+
+# URL 다운로드 설정 (스트리밍 + 크기 제한)
+DOWNLOAD_MAX_BYTES = int(os.getenv("DOWNLOAD_MAX_BYTES", str(2 * 1024 ** 3)))   # 이보다 큰 파일은 거부
+DOWNLOAD_SPOOL_THRESHOLD = 16 * 1024 ** 2    # 이보다 크면 메모리 대신 임시 파일에 저장
+DOWNLOAD_CHUNK_SIZE = 1024 ** 2              # 스트리밍 읽기 단위
+DOWNLOAD_TIMEOUT = (10, 60)                  # (연결, 읽기) 타임아웃 (초)
+
+# 비디오 오디오 분석 설정 (ffmpeg PCM 스트림 한 번으로 볼륨 판단 + 음성 인식용 WAV 기록)
+AUDIO_ANALYSIS_SAMPLE_RATE = 16000     # 분석/음성 인식용 PCM 샘플링 레이트 (모노 16비트)
+VIDEO_AUDIO_RMS_THRESHOLD = 30         # RMS가 이보다 크면 음성 비디오로 보고 음성 인식 처리
+VIDEO_AUDIO_ANALYSIS_SECONDS = 0       # 볼륨을 판단할 앞부분 길이 (초, 0이면 전체)
+
+# 음성 인식 설정 (무음 기준 분할 + 구간 병렬 Whisper 요청)
+TRANSCRIPTION_WORKERS = 6                # 동시에 보내는 Whisper 요청 수
+TRANSCRIPTION_TARGET_SEGMENT_SEC = 120   # 이 길이를 넘으면 다음 무음에서 구간을 자름
+TRANSCRIPTION_MAX_SEGMENT_SEC = 600      # 구간 최대 길이 (16kHz 모노 WAV 약 19MB, API 25MB 제한 이하)
+TRANSCRIPTION_MIN_SILENCE_SEC = 0.5      # 자를 수 있는 최소 무음 길이
+TRANSCRIPTION_SILENCE_RMS = 100          # 창 RMS가 이보다 작으면 무음 (16비트 기준 약 -50dBFS)
+TRANSCRIPTION_RETRIES = 1                # 구간 변환 실패 시 재시도 횟수
+
+# 로컬 파일 수집 기록 (크기/수정 시각이 같거나 내용이 같은 파일은 다시 처리하지 않음)
+INGEST_LEDGER_PATH = os.getenv("INGEST_LEDGER_PATH", os.path.join("cache", "ingest_ledger.sqlite3"))
+INGEST_PROCESSOR_VERSION = "1"    # 캡션/태그/임베딩 처리 방식이 바뀌면 올려서 전체 재처리
+
+# 로컬 문서 추출 설정 (CPU 작업이므로 프로세스 풀에서 병렬 추출)
+DOCUMENT_EXTRACT_WORKERS = min(4, os.cpu_count() or 1)   # 추출 프로세스 수 (계속 띄워 두는 공용 풀이므로 상한)
+DOCUMENT_EXTRACT_TIMEOUT_SEC = 120                        # 파일 하나 추출 제한 시간 (초)
+
+# 문서 청크/임베딩 설정 (청크를 만드는 대로 배치 단위로 임베딩 후 저장)
+DOCUMENT_CHUNK_SIZE = 1000          # 청크 길이 (문자)
+DOCUMENT_CHUNK_OVERLAP = 200        # 다음 청크로 이어지는 길이 (문자)
+DOCUMENT_EMBED_BATCH_SIZE = 32      # 한 번에 임베딩/저장하는 청크 수
+
+# PDF 페이지 단위 추출 설정 (페이지가 많은 PDF는 페이지 구간별로 나눠 병렬 추출)
+PDF_PARALLEL_PAGE_THRESHOLD = 40    # 이 페이지 수를 넘으면 구간 병렬 추출
+PDF_PAGE_RANGE_SIZE = 16            # 프로세스 하나가 맡는 페이지 수
+
+# 파일 감시 수집 설정 (WATCH_ROOTS를 지정하면 서버 시작 시 감시)
+WATCH_ROOTS = [root.strip() for root in os.getenv("WATCH_ROOTS", "").split(",") if root.strip()]
+WATCH_DEBOUNCE_SEC = 2.0           # 마지막 이벤트 후 이 시간 동안 조용하면 처리 후보
+WATCH_STABLE_SEC = 3.0             # 파일 크기/수정 시각이 이 시간 동안 그대로면 처리 (복사 중인 파일 제외)
+WATCH_POLL_INTERVAL_SEC = 30.0     # watchdog이 없거나 폴링 모드일 때 스캔 간격
+WATCH_USE_POLLING = os.getenv("WATCH_USE_POLLING", "0") == "1"    # 네트워크 드라이브 등 inotify가 안 되는 경로용
+WATCH_RETRY_SEC = 30.0             # 처리(업서트)에 실패한 파일을 다시 시도하기까지 대기 시간
+WATCH_MAX_RETRIES = 3              # 실패한 파일 재시도 횟수 (넘으면 다음 변경 또는 재시작 때 처리)
+
+# 작업별 임시 작업 공간 설정 (오디오/비디오 다운로드, ffmpeg 추출 파일)
+WORKSPACE_ROOT = os.getenv("WORKSPACE_ROOT")               # 지정하지 않으면 /dev/shm(tmpfs) 또는 시스템 임시 디렉토리
+WORKSPACE_QUOTA_BYTES = int(os.getenv("WORKSPACE_QUOTA_BYTES", str(4 * 1024 ** 3)))   # 작업 하나가 쓸 수 있는 최대 용량
+WORKSPACE_TMPFS_RESERVE = 2    # tmpfs 여유 공간이 할당량의 이 배수 이상일 때만 tmpfs 사용
+
+# 하이브리드 검색 (BM25 어휘 색인 + 벡터) 설정
+LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", os.path.join("cache", "lexical_index.sqlite3"))
+LEXICAL_BM25_K1 = 1.2
+LEXICAL_BM25_B = 0.75
+RRF_K = 60    # Reciprocal Rank Fusion 상수
+# 벡터 유사도가 threshold 미만인 항목은 BM25 점수가 이 값 이상일 때만 어휘 일치로 남김
+LEXICAL_MIN_SCORE = float(os.getenv("LEXICAL_MIN_SCORE", "3.0"))
+# 서버 시작 시 벡터 저장소에는 있지만 어휘 색인에 없는 벡터를 색인 (색인 도입 전 데이터 포함)
+LEXICAL_BACKFILL_ON_STARTUP = os.getenv("LEXICAL_BACKFILL_ON_STARTUP", "1") == "1"
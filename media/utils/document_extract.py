@@ -0,0 +1,192 @@
+"""
+문서 텍스트 추출 (파서만 사용하는 가벼운 모듈)
+
+추출 프로세스 풀(spawn) 워커는 이 모듈만 불러오므로 모델/API 클라이언트를 다시 로드하지 않는다.
+"""
+import io
+import os
+import re
+import signal
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from PyPDF2 import PdfReader
+import docx
+from pptx import Presentation
+from openpyxl import load_workbook
+import chardet
+from .constants import PDF_PARALLEL_PAGE_THRESHOLD
+
+_TEXT_EXTENSIONS = {"txt", "md", "markdown", "csv"}
+_HTML_EXTENSIONS = {"html", "htm"}
+
+
+class ExtractTimeout(BaseException):
+    """추출 제한 시간 초과 (추출 함수의 except Exception에 잡히지 않도록 BaseException)"""
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractTimeout()
+
+
+@contextmanager
+def time_limit(timeout: float):
+    """SIGALRM을 쓸 수 있는 환경(리눅스/맥)에서는 제한 시간을 넘긴 파서를 중단 (ExtractTimeout)"""
+    use_alarm = bool(timeout) and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(max(1, int(timeout)))
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+
+def pdf_title(reader: PdfReader) -> str:
+    return reader.metadata.title if reader.metadata and reader.metadata.title else "PDF Document"
+
+
+def iter_pdf_pages(reader: PdfReader, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """PDF 페이지를 하나씩 파싱해 (페이지 번호(1부터), 텍스트) 생성 (실패한 페이지는 빈 텍스트)"""
+    page_count = len(reader.pages)
+    for index in range(start, page_count if end is None else min(end, page_count)):
+        try:
+            text = reader.pages[index].extract_text() or ""
+        except Exception as e:
+            logging.error(f" PDF {index + 1}페이지 추출 실패: {str(e)}")
+            text = ""
+        yield index + 1, text
+
+
+def extract_pdf_content(file_obj) -> Optional[Dict[str, str]]:
+    try:
+        logging.info(" PDF 파일 처리 시작")
+        reader = PdfReader(file_obj)
+        content = "\n".join(text for _, text in iter_pdf_pages(reader)).strip()
+        return {"title": pdf_title(reader), "content": content} if content else None
+    except Exception as e:
+        logging.error(f" PDF 처리 실패: {str(e)}")
+        return None
+
+
+def extract_pdf_file(file_path: str, max_pages: Optional[int] = None) -> Optional[Dict]:
+    """
+    로컬 PDF 제목과 페이지별 텍스트
+
+    페이지 수가 max_pages를 넘으면 pages를 None으로 돌려주고, 페이지는 구간별로 나눠 추출한다
+    (DocumentProcessor.iter_pdf_file_pages 참고).
+    """
+    try:
+        with open(file_path, 'rb') as file_obj:
+            reader = PdfReader(file_obj)
+            page_count = len(reader.pages)
+            pages = None
+            if max_pages is None or page_count <= max_pages:
+                pages = list(iter_pdf_pages(reader))
+            return {"title": pdf_title(reader), "page_count": page_count, "pages": pages}
+    except Exception as e:
+        logging.error(f" PDF 처리 실패: {str(e)}")
+        return None
+
+
+def extract_docx_content(file_obj) -> Optional[Dict[str, str]]:
+    try:
+        doc = docx.Document(file_obj)
+        content = "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
+        return {"title": "Word Document", "content": content}
+    except Exception as e:
+        logging.error(f" DOCX 처리 실패: {str(e)}")
+        return None
+
+
+def extract_pptx_content(file_obj) -> Optional[Dict[str, str]]:
+    try:
+        prs = Presentation(file_obj)
+        content = "\n".join([shape.text for slide in prs.slides for shape in slide.shapes if hasattr(shape, "text")])
+        return {"title": "PowerPoint Document", "content": content}
+    except Exception as e:
+        logging.error(f" PPTX 처리 실패: {str(e)}")
+        return None
+
+
+def extract_xlsx_content(file_obj) -> Optional[Dict[str, str]]:
+    try:
+        wb = load_workbook(file_obj)
+        content = "\n".join(
+            f"[{sheet}]\n" + "\n".join(
+                " | ".join(str(cell) for cell in row if cell) for row in wb[sheet].iter_rows(values_only=True)
+            ) for sheet in wb.sheetnames
+        ).strip()
+        return {"title": "Excel Document", "content": content}
+    except Exception as e:
+        logging.error(f" Excel 처리 실패: {str(e)}")
+        return None
+
+
+def extract_text_content(file_obj, sample_size: int = 64 * 1024) -> str:
+    """앞부분 샘플로 인코딩을 감지한 뒤 파일 객체를 그대로 디코딩"""
+    detected_encoding = chardet.detect(file_obj.read(sample_size))['encoding'] or 'utf-8'
+    file_obj.seek(0)
+    return io.TextIOWrapper(file_obj, encoding=detected_encoding, errors='ignore').read().strip()
+
+
+def extract_html_content(file_obj) -> str:
+    """HTML 본문 텍스트 (trafilatura, 실패 시 태그 제거)"""
+    html = extract_text_content(file_obj)
+    try:
+        import trafilatura
+        text = trafilatura.extract(html)
+        if text:
+            return text.strip()
+    except Exception as e:
+        logging.error(f" HTML 본문 추출 실패, 태그만 제거: {str(e)}")
+    text = re.sub(r'(?is)<(script|style)[^>]*>.*?</\1>', ' ', html)
+    return re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', ' ', text)).strip()
+
+
+def extract_content(file_obj, file_ext: str, title: str = None) -> Optional[Dict[str, str]]:
+    """확장자별 추출기 호출 (지원하지 않는 형식이면 None)"""
+    if file_ext == "pdf":
+        return extract_pdf_content(file_obj)
+    if file_ext == "docx":
+        return extract_docx_content(file_obj)
+    if file_ext == "pptx":
+        return extract_pptx_content(file_obj)
+    if file_ext == "xlsx":
+        return extract_xlsx_content(file_obj)
+    if file_ext in _TEXT_EXTENSIONS:
+        return {"title": title or "Text File", "content": extract_text_content(file_obj)}
+    if file_ext in _HTML_EXTENSIONS:
+        return {"title": title or "HTML Document", "content": extract_html_content(file_obj)}
+    logging.warning(f" 지원하지 않는 문서 형식: {file_ext}")
+    return None
+
+
+def extract_file(file_path: str, max_pages: Optional[int] = PDF_PARALLEL_PAGE_THRESHOLD) -> Optional[Dict[str, str]]:
+    """로컬 문서 텍스트 추출 (PDF는 페이지별 텍스트, extract_pdf_file 참고)"""
+    file_ext = os.path.splitext(file_path)[1].lower().replace(".", "")
+    if file_ext == "pdf":
+        return extract_pdf_file(file_path, max_pages=max_pages)
+    with open(file_path, 'rb') as file_obj:
+        return extract_content(file_obj, file_ext, title=os.path.basename(file_path))
+
+
+def extract_document_file(file_path: str, timeout: float) -> Optional[Dict]:
+    """프로세스 풀 작업: 로컬 문서 하나 추출"""
+    try:
+        with time_limit(timeout):
+            return extract_file(file_path)
+    except ExtractTimeout:
+        logging.error(f" 문서 추출 시간 초과 ({timeout}초): {file_path}")
+        return None
+
+
+def extract_pdf_pages(file_path: str, start: int, end: int, timeout: float) -> List[Tuple[int, str]]:
+    """프로세스 풀 작업: PDF 페이지 구간 [start, end) 추출 → (페이지 번호, 텍스트) 목록"""
+    try:
+        with time_limit(timeout), open(file_path, 'rb') as file_obj:
+            return list(iter_pdf_pages(PdfReader(file_obj), start, end))
+    except ExtractTimeout:
+        logging.error(f" PDF {start + 1}-{end}페이지 추출 시간 초과 ({timeout}초): {file_path}")
+        return []
@@ -0,0 +1,177 @@
+import os
+import logging
+import tempfile
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .constants import (
+    DOWNLOAD_MAX_BYTES,
+    DOWNLOAD_SPOOL_THRESHOLD,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_TIMEOUT
+)
+
+# 파일 앞부분 시그니처 → MIME 타입
+_SIGNATURES = [
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'BM', 'image/bmp'),
+    (b'II*\x00', 'image/tiff'),
+    (b'MM\x00*', 'image/tiff'),
+    (b'%PDF', 'application/pdf'),
+    (b'PK\x03\x04', 'application/zip'),    # docx / pptx / xlsx
+    (b'\x1aE\xdf\xa3', 'video/webm'),
+    (b'ID3', 'audio/mpeg'),
+    (b'OggS', 'audio/ogg'),
+    (b'fLaC', 'audio/flac'),
+]
+
+_OFFICE_TYPES = {
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class DownloadError(Exception):
+    """다운로드 실패 (상태 코드 오류, 크기 초과 등)"""
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """파일 앞부분 바이트로 실제 형식 추정 (알 수 없으면 None)"""
+    if len(head) >= 12 and head[:4] == b'RIFF':
+        return {b'WEBP': 'image/webp', b'WAVE': 'audio/wav', b'AVI ': 'video/x-msvideo'}.get(head[8:12])
+    if len(head) >= 12 and head[4:8] == b'ftyp':
+        brand = head[8:12]
+        if brand in (b'heic', b'heix', b'mif1'):
+            return 'image/heic'
+        return 'audio/mp4' if brand == b'M4A ' else 'video/mp4'
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+class DownloadedFile:
+    """
+    다운로드한 파일 본문
+
+    작은 파일은 메모리, 큰 파일은 임시 파일에 저장되는 SpooledTemporaryFile 하나를
+    이미지 디코딩/OCR/문서 파서가 함께 읽는다. open()은 매번 처음으로 되감은 같은 핸들을 돌려준다.
+    """
+
+    def __init__(self, url: str, file, size: int, header_type: Optional[str], sniffed_type: Optional[str]):
+        self.url = url
+        self.file = file
+        self.size = size
+        self.header_type = header_type
+        self.sniffed_type = sniffed_type
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(urlparse(self.url).path)[1].lower().replace(".", "")
+
+    @property
+    def content_type(self) -> Optional[str]:
+        """시그니처로 추정한 형식 우선, 없으면 응답 헤더 형식"""
+        return self.sniffed_type or self.header_type
+
+    @property
+    def in_memory(self) -> bool:
+        return not getattr(self.file, '_rolled', True)
+
+    def is_image(self) -> bool:
+        return bool(self.content_type and self.content_type.startswith('image/'))
+
+    def open(self):
+        self.file.seek(0)
+        return self.file
+
+    def close(self):
+        self.file.close()
+
+
+def _stream_to(url: str, sink, max_bytes: int, timeout):
+    """
+    스트리밍 GET 본문을 sink에 기록하고 (크기, 헤더 형식, 앞부분 바이트) 반환
+
+    Content-Length가 max_bytes를 넘으면 본문을 받기 전에, 헤더가 없으면 받는 도중 크기를 세어 거부한다.
+    """
+    with requests.get(url, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            raise DownloadError(f"다운로드 실패: {response.status_code}")
+
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise DownloadError(f"파일 크기 제한 초과: {int(content_length)} > {max_bytes} bytes")
+
+        header_type = (response.headers.get('Content-Type') or '').split(';')[0].strip() or None
+        size = 0
+        head = b''
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_bytes:
+                raise DownloadError(f"파일 크기 제한 초과: {max_bytes} bytes")
+            if len(head) < 64:
+                head += chunk[:64 - len(head)]
+            sink.write(chunk)
+    return size, header_type, head
+
+
+def download(url: str, max_bytes: int = DOWNLOAD_MAX_BYTES,
+             spool_threshold: int = DOWNLOAD_SPOOL_THRESHOLD,
+             timeout=DOWNLOAD_TIMEOUT) -> DownloadedFile:
+    """
+    URL을 한 번의 스트리밍 GET으로 다운로드
+
+    spool_threshold보다 큰 본문은 디스크 임시 파일로 넘어가므로 메모리 사용량이 파일 크기와 무관하다.
+
+    Raises:
+        DownloadError: 상태 코드 오류 또는 크기 초과
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=spool_threshold)
+    try:
+        size, header_type, head = _stream_to(url, spooled, max_bytes, timeout)
+    except Exception:
+        spooled.close()
+        raise
+
+    downloaded = DownloadedFile(url, spooled, size, header_type, sniff_content_type(head))
+    if downloaded.sniffed_type == 'application/zip' and downloaded.extension in _OFFICE_TYPES:
+        downloaded.sniffed_type = _OFFICE_TYPES[downloaded.extension]
+    if downloaded.sniffed_type and header_type and downloaded.sniffed_type != header_type:
+        logging.info(f"응답 헤더 형식({header_type})과 실제 형식({downloaded.sniffed_type})이 다름: {url}")
+
+    logging.info(f"다운로드 완료: {size} bytes ({'메모리' if downloaded.in_memory else '임시 파일'})")
+    return downloaded
+
+
+def download_to_file(url: str, path: str, max_bytes: int = DOWNLOAD_MAX_BYTES,
+                     timeout=DOWNLOAD_TIMEOUT) -> int:
+    """
+    ffmpeg처럼 파일 경로가 필요한 처리용으로 URL을 path에 스트리밍 저장하고 크기 반환
+
+    Raises:
+        DownloadError: 상태 코드 오류 또는 크기 초과 (기록하던 파일은 삭제)
+    """
+    try:
+        with open(path, 'wb') as f:
+            size, _, _ = _stream_to(url, f, max_bytes, timeout)
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    logging.info(f"다운로드 완료: {size} bytes → {path}")
+    return size
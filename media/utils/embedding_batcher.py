@@ -0,0 +1,160 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+from .constants import (
+    EMBEDDING_BATCH_MAX_ITEMS,
+    EMBEDDING_BATCH_MAX_TOKENS,
+    EMBEDDING_BATCH_MAX_WAIT_MS
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 대략 추정 (UTF-8 바이트 3개당 1토큰, 한글 기준 보수적으로 계산)"""
+    return max(1, len(text.encode('utf-8')) // 3)
+
+
+def is_input_error(error: Exception) -> bool:
+    """입력 자체의 문제(너무 긴 텍스트, 잘못된 입력 등)로 거부됐는지 (요청 한도/연결/서버 오류는 False)"""
+    return getattr(error, 'status_code', None) in (400, 413, 422)
+
+
+class EmbeddingBatcher:
+    """
+    여러 스레드에서 들어오는 임베딩 요청을 모아 한 번의 API 호출로 처리하는 마이크로 배처
+
+    요청 개수(max_items), 토큰 예산(max_tokens), 최대 대기 시간(max_wait_ms) 중
+    하나라도 도달하면 모인 요청을 한 번에 보내고, 각 요청에는 개별 Future로 결과를 돌려준다.
+    검색어처럼 응답을 기다리는 요청(priority)은 별도 큐와 스레드에서 보내 수집 배치 뒤에 줄 서지 않는다.
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], List[Optional[List[float]]]],
+                 max_items: int = EMBEDDING_BATCH_MAX_ITEMS,
+                 max_tokens: int = EMBEDDING_BATCH_MAX_TOKENS,
+                 max_wait_ms: int = EMBEDDING_BATCH_MAX_WAIT_MS):
+        self._embed_fn = embed_fn
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queues = {False: queue.Queue(), True: queue.Queue()}    # priority → 요청 큐
+        self._lock = threading.Lock()
+        self._threads = {}
+
+        # 통계
+        self.requests = 0
+        self.batches = 0
+
+    def submit(self, text: str, priority: bool = False) -> Future:
+        """
+        임베딩 요청 등록 후 Future 반환 (실패 시 결과는 None)
+
+        Args:
+            priority: 검색어 등 바로 기다리는 요청이면 True (수집용 대량 요청과 따로 전송)
+        """
+        future = Future()
+        if not text or not text.strip():
+            # 빈 텍스트는 API가 거부하므로 바로 실패 처리
+            future.set_result(None)
+            return future
+
+        self._ensure_started(priority)
+        self._queues[priority].put((text, future))
+        return future
+
+    def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """여러 텍스트를 한꺼번에 등록하고 결과를 순서대로 반환"""
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def _ensure_started(self, priority: bool):
+        with self._lock:
+            thread = self._threads.get(priority)
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(
+                    target=self._run, args=(self._queues[priority],),
+                    name="embedding-batcher-query" if priority else "embedding-batcher", daemon=True
+                )
+                self._threads[priority] = thread
+                thread.start()
+
+    def _run(self, source: queue.Queue):
+        pending = None
+        while True:
+            # 첫 요청이 들어올 때까지 대기
+            first = pending or source.get()
+            pending = None
+            batch = [first]
+            tokens = estimate_tokens(first[0])
+            deadline = time.monotonic() + self.max_wait
+
+            # 개수/토큰 예산/대기 시간 한도까지 요청 수집
+            while len(batch) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = source.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                item_tokens = estimate_tokens(item[0])
+                if tokens + item_tokens > self.max_tokens:
+                    pending = item  # 다음 배치의 첫 요청으로 넘김
+                    break
+                batch.append(item)
+                tokens += item_tokens
+
+            self._flush(batch)
+
+    def _flush(self, batch):
+        # 같은 텍스트는 한 번만 요청
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = self._embed_fn(unique_texts)
+        except Exception as e:
+            if is_input_error(e):
+                logging.error(f"배치 임베딩 요청 거부 ({len(unique_texts)}건), 입력별로 재시도: {str(e)}")
+                embeddings = self._embed_individually(unique_texts)
+            else:
+                # 요청 한도/연결/서버 오류는 하나씩 다시 보내도 실패하므로 배치 전체를 실패 처리
+                logging.error(f"배치 임베딩 요청 실패 ({len(unique_texts)}건): {str(e)}")
+                embeddings = [None] * len(unique_texts)
+
+        results = dict(zip(unique_texts, embeddings))
+        for text, future in batch:
+            future.set_result(results.get(text))
+
+        with self._lock:
+            self.requests += len(batch)
+            self.batches += 1
+
+    def _embed_individually(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        입력 오류로 배치가 거부되면 하나씩 다시 요청 (문제 있는 텍스트만 실패 처리)
+
+        도중에 입력 오류가 아닌 오류가 나면 남은 텍스트는 요청하지 않고 실패 처리한다.
+        """
+        if len(texts) == 1:
+            return [None]
+        embeddings = []
+        for index, text in enumerate(texts):
+            try:
+                embeddings.append(self._embed_fn([text])[0])
+            except Exception as e:
+                logging.error(f"임베딩 생성 실패: {str(e)}")
+                embeddings.append(None)
+                if not is_input_error(e):
+                    return embeddings + [None] * (len(texts) - index - 1)
+        return embeddings
+
+    def stats(self) -> Dict:
+        """배치 통계"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'avg_batch_size': self.requests / self.batches if self.batches else 0.0
+            }
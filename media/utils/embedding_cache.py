@@ -0,0 +1,193 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .constants import (
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MEMORY_ITEMS,
+    EMBEDDING_CACHE_MAX_DISK_BYTES
+)
+
+_TOUCH_BATCH = 256    # 디스크 히트의 마지막 사용 시각을 모아서 기록하는 단위
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키 생성을 위한 텍스트 정규화 (유니코드 NFC + 공백 정리)"""
+    text = unicodedata.normalize('NFC', text or '')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """모델명 + 정규화된 텍스트의 해시로 캐시 키 생성"""
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    임베딩 캐시 (메모리 LRU + SQLite 디스크 2단계)
+
+    - 메모리: 최근 사용 항목을 float32 배열로 보관 (항목 수 기준 LRU)
+    - 디스크: SQLite에 float32 바이트로 보관 (전체 크기 기준, 오래 안 쓴 항목부터 삭제)
+    """
+
+    def __init__(self, db_path: Optional[str] = EMBEDDING_CACHE_PATH,
+                 max_memory_items: int = EMBEDDING_CACHE_MEMORY_ITEMS,
+                 max_disk_bytes: int = EMBEDDING_CACHE_MAX_DISK_BYTES):
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._touched = {}    # 디스크 히트 키 → 사용 시각 (다음 쓰기 때 함께 기록)
+
+        # 히트/미스 카운터
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        self._disk_bytes = 0
+        if db_path:
+            try:
+                db_dir = os.path.dirname(db_path)
+                if db_dir:
+                    os.makedirs(db_dir, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    """CREATE TABLE IF NOT EXISTS embeddings (
+                        key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        last_access REAL NOT NULL
+                    )"""
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)"
+                )
+                self._conn.commit()
+                row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()
+                self._disk_bytes = row[0]
+            except Exception as e:
+                logging.error(f"임베딩 디스크 캐시 초기화 실패 (메모리 캐시만 사용): {str(e)}")
+                self._conn = None
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """캐시된 임베딩 조회 (없으면 None)"""
+        key = make_cache_key(model, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector.tolist()
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        # 조회마다 커밋하지 않도록 사용 시각은 모아 두었다가 한 번에 기록
+                        self._touched[key] = time.time()
+                        if len(self._touched) >= _TOUCH_BATCH:
+                            self._flush_touched()
+                            self._conn.commit()
+                        vector = np.frombuffer(row[0], dtype=np.float32)
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+                        return vector.tolist()
+                except Exception as e:
+                    logging.error(f"임베딩 디스크 캐시 조회 실패: {str(e)}")
+
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str, embedding: List[float]):
+        """임베딩을 메모리/디스크 캐시에 저장"""
+        if not embedding:
+            return
+        key = make_cache_key(model, text)
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+
+            if self._conn is not None:
+                try:
+                    blob = vector.tobytes()
+                    old = self._conn.execute(
+                        "SELECT size FROM embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                    self._touched.pop(key, None)
+                    self._flush_touched()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, model, vector, size, last_access) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, model, blob, len(blob), time.time())
+                    )
+                    self._conn.commit()
+                    self._disk_bytes += len(blob) - (old[0] if old else 0)
+                    if self._disk_bytes > self.max_disk_bytes:
+                        self._evict_disk()
+                except Exception as e:
+                    logging.error(f"임베딩 디스크 캐시 저장 실패: {str(e)}")
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """메모리 LRU에 추가하고 한도를 넘으면 가장 오래된 항목 제거"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self):
+        """모아 둔 디스크 히트 사용 시각 기록 (lock 보유 상태에서 호출, 커밋은 호출한 쪽에서)"""
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_access = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _evict_disk(self):
+        """디스크 캐시가 한도를 넘으면 최근에 사용하지 않은 항목부터 삭제 (한도의 90%까지)"""
+        target = int(self.max_disk_bytes * 0.9)
+        while self._disk_bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM embeddings ORDER BY last_access ASC LIMIT 500"
+            ).fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                break
+            removed = []
+            for key, size in rows:
+                removed.append((key,))
+                self._disk_bytes -= size
+                if self._disk_bytes <= target:
+                    break
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", removed)
+            self._conn.commit()
+        logging.info(f"임베딩 디스크 캐시 정리 완료: {self._disk_bytes} bytes")
+
+    def stats(self) -> Dict:
+        """캐시 히트/미스 통계"""
+        with self._lock:
+            total = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / total if total else 0.0,
+                'memory_items': len(self._memory),
+                'disk_bytes': self._disk_bytes
+            }
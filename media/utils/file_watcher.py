@@ -0,0 +1,253 @@
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .constants import (
+    WATCH_DEBOUNCE_SEC,
+    WATCH_STABLE_SEC,
+    WATCH_POLL_INTERVAL_SEC,
+    WATCH_USE_POLLING,
+    WATCH_RETRY_SEC,
+    WATCH_MAX_RETRIES
+)
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:    # watchdog이 없으면 주기적 스캔으로 감시
+    Observer = None
+    FileSystemEventHandler = object
+
+
+class _PendingFile:
+    __slots__ = ('first_event', 'last_event', 'last_stat', 'stable_since')
+
+    def __init__(self, now: float):
+        self.first_event = now
+        self.last_event = now
+        self.last_stat = None
+        self.stable_since = now
+
+
+class _EventHandler(FileSystemEventHandler):
+    """watchdog(inotify) 이벤트 → FileWatcher 변경/삭제 알림"""
+
+    def __init__(self, watcher: 'FileWatcher'):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        self.watcher.notify_changed(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.notify_changed(event.src_path)
+
+    def on_closed(self, event):
+        self.watcher.notify_changed(event.src_path)
+
+    def on_deleted(self, event):
+        self.watcher.notify_deleted(event.src_path)
+
+    def on_moved(self, event):
+        # 새 경로를 먼저 등록해야 삭제가 이동 처리 뒤로 미뤄짐
+        self.watcher.notify_changed(event.dest_path)
+        self.watcher.notify_deleted(event.src_path)
+
+
+def _snapshot(roots: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    """감시 경로 아래 모든 파일의 (크기, 수정 시각)"""
+    files = {}
+    for root in roots:
+        for directory, _, names in os.walk(root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files[path] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+class FileWatcher:
+    """
+    감시 경로의 파일 변경을 모아 처리 함수에 넘기는 감시기
+
+    watchdog(리눅스는 inotify)이 있으면 이벤트로, 없으면 주기적 스캔 비교로 변경을 감지한다.
+    이벤트가 debounce_sec 동안 멈추고 파일 크기/수정 시각이 stable_sec 동안 그대로인 파일만
+    on_changed로 넘기므로 복사 중인 파일은 처리하지 않는다. 삭제는 이동(삭제 + 생성)이 먼저
+    반영되도록 조금 더 기다렸다가 on_deleted로 넘긴다.
+
+    on_changed가 경로 목록을 돌려주면 처리에 실패한 파일로 보고 retry_sec 뒤에 다시 넘긴다
+    (파일마다 max_retries번까지).
+    """
+
+    def __init__(self, roots: List[str], on_changed: Callable[[List[str]], Optional[Iterable[str]]],
+                 on_deleted: Callable[[List[str]], object],
+                 debounce_sec: float = WATCH_DEBOUNCE_SEC, stable_sec: float = WATCH_STABLE_SEC,
+                 poll_interval: float = WATCH_POLL_INTERVAL_SEC, use_polling: Optional[bool] = None,
+                 retry_sec: float = WATCH_RETRY_SEC, max_retries: int = WATCH_MAX_RETRIES):
+        self.roots = [os.path.normpath(root) for root in roots]
+        self.on_changed = on_changed
+        self.on_deleted = on_deleted
+        self.debounce_sec = debounce_sec
+        self.stable_sec = stable_sec
+        self.poll_interval = poll_interval
+        self.retry_sec = retry_sec
+        self.max_retries = max_retries
+        self.use_polling = (WATCH_USE_POLLING or Observer is None) if use_polling is None else use_polling
+
+        self._changed: Dict[str, _PendingFile] = {}
+        self._deleted: Dict[str, float] = {}
+        self._retries: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self._observer = None
+
+    @property
+    def mode(self) -> str:
+        return 'polling' if self.use_polling else 'events'
+
+    def start(self, initial_scan: bool = True):
+        """
+        감시 시작
+
+        Args:
+            initial_scan: 감시 경로 전체를 한 번 넘겨 꺼져 있던 동안의 변경을 반영 (바뀌지 않은 파일은 수집 기록이 걸러냄)
+        """
+        if initial_scan:
+            for path in _snapshot(self.roots):
+                self.notify_changed(path)
+            for root in self.roots:
+                self.notify_deleted(root)
+
+        if self.use_polling:
+            # 기준 스냅샷은 start()가 끝나기 전에 떠야 직후에 생긴 파일을 놓치지 않음
+            baseline = _snapshot(self.roots)
+            self._threads.append(threading.Thread(target=self._poll_loop, args=(baseline,),
+                                                  name="file-watch-poll", daemon=True))
+        else:
+            self._observer = Observer()
+            handler = _EventHandler(self)
+            for root in self.roots:
+                self._observer.schedule(handler, root, recursive=True)
+            self._observer.start()
+        self._threads.append(threading.Thread(target=self._dispatch_loop, name="file-watch-dispatch", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        logging.info(f"파일 감시 시작 ({self.mode}): {', '.join(self.roots)}")
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        logging.info("파일 감시 종료")
+
+    def notify_changed(self, path: str):
+        now = time.monotonic()
+        with self._lock:
+            pending = self._changed.get(path)
+            if pending is None:
+                self._changed[path] = _PendingFile(now)
+            else:
+                pending.last_event = now
+
+    def notify_deleted(self, path: str):
+        with self._lock:
+            self._deleted[path] = time.monotonic()
+
+    def _retry_later(self, paths: Iterable[str]):
+        """처리에 실패한 파일을 retry_sec 뒤에 다시 넘기도록 대기열에 추가"""
+        now = time.monotonic()
+        with self._lock:
+            for path in paths:
+                attempts = self._retries.get(path, 0) + 1
+                if attempts > self.max_retries:
+                    self._retries.pop(path, None)
+                    logging.error(f"파일 처리 재시도 중단 ({self.max_retries}회 실패): {path}")
+                    continue
+                self._retries[path] = attempts
+                pending = self._changed.setdefault(path, _PendingFile(now))
+                # 이벤트 시각을 미래로 두면 그때부터 debounce가 다시 시작됨
+                pending.last_event = max(pending.last_event, now + self.retry_sec)
+
+    def _take_ready(self) -> Tuple[List[str], List[str]]:
+        """이벤트가 멈추고 크기가 안정된 변경 파일과, 대기 시간이 지난 삭제 경로"""
+        now = time.monotonic()
+        changed = []
+        with self._lock:
+            for path, pending in list(self._changed.items()):
+                if now - pending.last_event < self.debounce_sec:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    del self._changed[path]    # 생성 직후 삭제됐거나 임시 파일
+                    continue
+                if os.path.isdir(path):
+                    del self._changed[path]
+                    # 이동해 온 디렉토리는 이벤트가 안에 있는 파일마다 오지 않으므로 직접 추가
+                    for file_path in _snapshot([path]):
+                        entry = self._changed.setdefault(file_path, _PendingFile(now))
+                        entry.first_event = min(entry.first_event, pending.first_event)
+                    continue
+
+                current = (stat.st_size, stat.st_mtime_ns)
+                if current != pending.last_stat:
+                    pending.last_stat = current
+                    pending.stable_since = now    # 아직 쓰는 중
+                    continue
+                if now - pending.stable_since >= self.stable_sec:
+                    changed.append(path)
+                    del self._changed[path]
+
+            # 삭제보다 먼저 들어온 변경이 남아 있으면 기다림 (이동 대상이 먼저 처리되도록)
+            wait = self.debounce_sec + self.stable_sec
+            oldest_change = min((pending.first_event for pending in self._changed.values()), default=now)
+            deleted = [
+                path for path, since in self._deleted.items()
+                if now - since >= wait and since < oldest_change
+            ]
+            for path in deleted:
+                del self._deleted[path]
+        return changed, deleted
+
+    def _dispatch_loop(self):
+        tick = max(0.2, min(self.debounce_sec, self.stable_sec) / 2)
+        while not self._stop.wait(tick):
+            changed, deleted = self._take_ready()
+            # 변경(이동 대상 포함)을 먼저 처리해야 수집 기록이 이동을 알아봄
+            if changed:
+                try:
+                    failed = list(self.on_changed(changed) or [])
+                except Exception as e:
+                    logging.error(f"파일 감시 처리 중 오류: {str(e)}", exc_info=True)
+                    failed = changed
+                with self._lock:
+                    for path in set(changed) - set(failed):
+                        self._retries.pop(path, None)
+                if failed:
+                    self._retry_later(failed)
+
+            if deleted:
+                try:
+                    self.on_deleted(deleted)
+                except Exception as e:
+                    logging.error(f"파일 감시 처리 중 오류: {str(e)}", exc_info=True)
+
+    def _poll_loop(self, previous: Dict[str, Tuple[int, int]]):
+        while not self._stop.wait(self.poll_interval):
+            current = _snapshot(self.roots)
+            for path, signature in current.items():
+                if previous.get(path) != signature:
+                    self.notify_changed(path)
+            for path in previous.keys() - current.keys():
+                self.notify_deleted(path)
+            previous = current
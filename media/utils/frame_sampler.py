@@ -0,0 +1,125 @@
+import logging
+from typing import Iterable, Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .constants import VIDEO_SEEK_TOLERANCE_SEC, VIDEO_SEEK_MIN_GAP_SEC
+
+
+class FrameSampler:
+    """
+    필요한 프레임만 디코딩하는 비디오 프레임 샘플러
+
+    다음 목표 프레임이 VIDEO_SEEK_MIN_GAP_SEC보다 가까우면 grab()으로 건너뛰고, 멀리 떨어진
+    목표만 seek한다 (seek하면 FFmpeg가 직전 키프레임부터 다시 디코딩하므로 촘촘한 목표는 순차가 더 빠름).
+    seek 결과 위치가 목표와 VIDEO_SEEK_TOLERANCE_SEC 이상 차이 나거나 seek가 실패하는 컨테이너는
+    처음부터 다시 열어 grab()으로 건너뛰고 목표 프레임만 retrieve()하는 순차 방식으로 전환한다.
+    """
+
+    def __init__(self, video_path: str):
+        self.video_path = video_path
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise Exception("비디오 파일을 열 수 없습니다.")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self.duration = self.total_frames / self.fps if self.fps > 0 else 0.0
+        self.mode = 'seek'
+        self.decoded_frames = 0    # grab()으로 디코딩한 프레임 수 (건너뛴 프레임 포함, seek 내부 디코딩 제외)
+        self.seeks = 0             # seek 횟수
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def timestamp(self, frame_index: int) -> float:
+        return frame_index / self.fps if self.fps > 0 else 0.0
+
+    def frames_every(self, interval_sec: float) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """interval_sec 간격으로 (프레임 번호, 초, BGR 프레임) 생성"""
+        step = max(1, int(self.fps * interval_sec)) if self.fps > 0 else 1
+        if self.total_frames <= 0:
+            # 길이를 모르는 스트림은 끝까지 순차로 건너뛰며 샘플링
+            self.mode = 'sequential'
+            yield from self._sequential(iter(range(0, 2 ** 63, step)))
+            return
+        yield from self.frames_at(range(0, self.total_frames, step))
+
+    def frames_at(self, frame_indices: Iterable[int]) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """지정한 프레임 번호들의 (프레임 번호, 초, BGR 프레임) 생성 (오름차순)"""
+        targets = iter(sorted(set(frame_indices)))
+        if self.mode == 'sequential':
+            yield from self._sequential(targets)
+            return
+
+        tolerance = max(2, int(self.fps * VIDEO_SEEK_TOLERANCE_SEC))
+        min_gap = max(1, int(self.fps * VIDEO_SEEK_MIN_GAP_SEC))
+        position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES) or 0)    # 다음 grab()이 읽을 프레임
+        for target in targets:
+            if 0 <= target - position < min_gap:
+                # 가까운 목표는 seek 없이 grab()으로 건너뜀
+                position, frame = self._read_until(position, target)
+                if position is None:
+                    return
+                if frame is not None:
+                    yield target, self.timestamp(target), frame
+                continue
+
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            self.seeks += 1
+            grabbed = self.cap.grab()
+            actual = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+            if grabbed and abs(actual - target) <= tolerance:
+                self.decoded_frames += 1
+                position = actual + 1
+                ret, frame = self.cap.retrieve()
+                if ret:
+                    yield target, self.timestamp(target), frame
+                    continue
+
+            # seek를 신뢰할 수 없는 컨테이너 → 처음부터 순차 디코딩으로 전환
+            logging.info(f"seek 불가 컨테이너, 순차 디코딩으로 전환: {self.video_path}")
+            self.mode = 'sequential'
+            self.cap.release()
+            self.cap = cv2.VideoCapture(self.video_path)
+            yield from self._sequential(self._chain(target, targets))
+            return
+
+    @staticmethod
+    def _chain(first: int, rest: Iterator[int]) -> Iterator[int]:
+        yield first
+        yield from rest
+
+    def _read_until(self, position: int, target: int) -> Tuple[Optional[int], Optional[np.ndarray]]:
+        """
+        position(다음 grab()이 읽을 프레임)부터 target까지 grab()으로 건너뛰고 target만 retrieve()
+
+        Returns:
+            (다음 grab()이 읽을 프레임, 목표 프레임) (스트림이 끝나면 (None, None), retrieve 실패 시 프레임은 None)
+        """
+        while position <= target:
+            if not self.cap.grab():
+                return None, None
+            self.decoded_frames += 1
+            position += 1
+        ret, frame = self.cap.retrieve()
+        return position, frame if ret else None
+
+    def _sequential(self, targets: Iterator[int]) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """grab()으로 건너뛰고 목표 프레임만 retrieve()"""
+        position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES) or 0)
+        for target in targets:
+            position, frame = self._read_until(position, target)
+            if position is None:
+                return
+            if frame is not None:
+                yield target, self.timestamp(target), frame
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from .constants import (
+    INGEST_LEDGER_PATH,
+    INGEST_PROCESSOR_VERSION,
+    TRANSLATION_MODE
+)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_content_hash(path: str) -> str:
+    """파일 내용 SHA-256 (1MB씩 읽어 계산)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def processor_version() -> str:
+    """수집 결과에 영향을 주는 설정까지 포함한 처리 버전"""
+    return f"{INGEST_PROCESSOR_VERSION}:{TRANSLATION_MODE}"
+
+
+class IngestLedger:
+    """
+    로컬 파일 수집 기록 (SQLite)
+
+    경로별로 크기/수정 시각, 내용 해시, 처리 버전, 생성된 벡터 ID를 보관한다.
+    크기와 수정 시각이 같은 파일은 해시도 계산하지 않고 건너뛰고, 내용 해시가 같은 기록이
+    사라진 경로에 있으면 이동/이름 변경으로 보고 벡터를 다시 만들지 않는다.
+    """
+
+    def __init__(self, db_path: str = INGEST_LEDGER_PATH, version: Optional[str] = None):
+        self.version = version or processor_version()
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                media_type TEXT NOT NULL,
+                version TEXT NOT NULL,
+                vector_ids TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_hash ON entries(content_hash)")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row) -> Optional[Dict]:
+        if row is None:
+            return None
+        entry = dict(row)
+        entry['vector_ids'] = json.loads(entry['vector_ids'])
+        return entry
+
+    def get(self, path: str) -> Optional[Dict]:
+        with self._lock:
+            return self._to_dict(self._conn.execute("SELECT * FROM entries WHERE path = ?", (path,)).fetchone())
+
+    def find_by_hash(self, content_hash: str) -> List[Dict]:
+        """같은 내용으로 현재 처리 버전에서 수집된 기록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM entries WHERE content_hash = ? AND version = ?", (content_hash, self.version)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def is_unchanged(self, path: str, stat: os.stat_result) -> bool:
+        """크기/수정 시각/처리 버전이 기록과 같으면 True (해시 계산 없음)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, version FROM entries WHERE path = ?", (path,)
+            ).fetchone()
+        return (row is not None and row['size'] == stat.st_size
+                and row['mtime_ns'] == stat.st_mtime_ns and row['version'] == self.version)
+
+    def record(self, path: str, stat: os.stat_result, content_hash: str, media_type: str, vector_ids: List[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(path, size, mtime_ns, content_hash, media_type, version, vector_ids, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, content_hash, media_type, self.version,
+                 json.dumps(sorted(vector_ids)), time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, path: str, stat: os.stat_result):
+        """내용은 같고 수정 시각만 바뀐 파일의 stat 갱신"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET size = ?, mtime_ns = ?, updated_at = ? WHERE path = ?",
+                (stat.st_size, stat.st_mtime_ns, time.time(), path)
+            )
+            self._conn.commit()
+
+    def move(self, old_path: str, new_path: str, stat: os.stat_result, vector_ids: List[str]):
+        """기록을 새 경로로 옮김 (벡터 ID는 새 경로 기준으로 바뀐 목록)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE path = ?", (new_path,))
+            self._conn.execute(
+                "UPDATE entries SET path = ?, size = ?, mtime_ns = ?, vector_ids = ?, updated_at = ? WHERE path = ?",
+                (new_path, stat.st_size, stat.st_mtime_ns, json.dumps(sorted(vector_ids)), time.time(), old_path)
+            )
+            self._conn.commit()
+
+    def remove(self, path: str) -> Optional[Dict]:
+        """기록 삭제 후 삭제한 기록 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._to_dict(self._conn.execute("SELECT * FROM entries WHERE path = ?", (path,)).fetchone())
+            if entry is not None:
+                self._conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+                self._conn.commit()
+            return entry
+
+    def paths_under(self, directory: str) -> List[str]:
+        """디렉토리 아래에 기록된 경로 목록"""
+        prefix = os.path.join(os.path.normpath(directory), '')
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM entries WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+        return [row['path'] for row in rows]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {'entries': count, 'version': self.version}
@@ -0,0 +1,87 @@
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class LazyResource:
+    """
+    처음 사용할 때 로드되는 무거운 리소스 핸들 (모델, API 클라이언트, 브라우저 등)
+
+    여러 스레드가 동시에 get()을 호출해도 로더는 한 번만 실행된다. 로드에 실패하면
+    상태를 'failed'로 기록하고 다음 get() 호출 때 다시 시도한다.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self._loader = loader
+        self._value = None
+        self._lock = threading.Lock()
+        self.state = 'unloaded'    # unloaded / loading / ready / failed
+        self.error = None
+        self.load_seconds = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.state == 'ready'
+
+    def get(self) -> Any:
+        if self.state == 'ready':
+            return self._value
+
+        with self._lock:
+            if self.state == 'ready':
+                return self._value
+
+            self.state = 'loading'
+            logging.info(f"리소스 로드 시작: {self.name}")
+            start = time.perf_counter()
+            try:
+                self._value = self._loader()
+            except Exception as e:
+                self.state = 'failed'
+                self.error = str(e)
+                logging.error(f"리소스 로드 실패: {self.name} - {str(e)}")
+                raise
+
+            self.load_seconds = round(time.perf_counter() - start, 2)
+            self.error = None
+            self.state = 'ready'
+            logging.info(f"리소스 로드 완료: {self.name} ({self.load_seconds}초)")
+            return self._value
+
+    def warm_up(self) -> bool:
+        """미리 로드 (실패해도 예외를 던지지 않음)"""
+        try:
+            self.get()
+            return True
+        except Exception:
+            return False
+
+    def status(self) -> Dict:
+        return {
+            'state': self.state,
+            'error': self.error,
+            'load_seconds': self.load_seconds
+        }
+
+
+def resolve(value: Any) -> Any:
+    """LazyResource면 로드된 값을, 아니면 그대로 반환"""
+    return value.get() if isinstance(value, LazyResource) else value
+
+
+def start_warm_up(resources: Iterable[LazyResource]) -> Optional[threading.Thread]:
+    """백그라운드 스레드에서 리소스들을 순서대로 미리 로드"""
+    resources = list(resources)
+    if not resources:
+        return None
+
+    def run():
+        for resource in resources:
+            resource.warm_up()
+        logging.info("리소스 사전 로드 완료")
+
+    thread = threading.Thread(target=run, name="resource-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,237 @@
+import os
+import re
+import json
+import math
+import sqlite3
+import logging
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .vector_store import match_filter
+from .constants import (
+    LEXICAL_INDEX_PATH,
+    LEXICAL_BM25_K1,
+    LEXICAL_BM25_B,
+    RRF_K
+)
+
+# 어휘 색인에 포함할 메타데이터 필드
+LEXICAL_FIELDS = ('title', 'caption', 'tags', 'ocr', 'summary', 'chunk_text')
+
+_TOKEN_PATTERN = re.compile(r'[가-힣]+|[0-9a-z]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어/영어 토큰화
+
+    형태소 분석기 없이도 조사·어미가 붙은 형태를 찾을 수 있도록 한글은 음절 bigram으로,
+    영문/숫자는 단어 단위로 분리한다.
+    """
+    text = unicodedata.normalize('NFC', text or '').lower()
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text):
+        if '가' <= word[0] <= '힣':
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def lexical_text(metadata: Dict) -> str:
+    """벡터 메타데이터에서 어휘 색인용 텍스트 추출 (캡션, 태그, OCR, 문서 청크 등)"""
+    parts = []
+    for field in LEXICAL_FIELDS:
+        value = metadata.get(field)
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value)
+        elif value:
+            parts.append(str(value))
+    # 청크 텍스트가 없는 문서는 본문 사용
+    if not metadata.get('chunk_text') and metadata.get('content'):
+        parts.append(str(metadata['content']))
+    return '\n'.join(parts)
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[str]], k: int = RRF_K) -> Dict[str, float]:
+    """여러 순위 목록을 RRF 점수(sum 1 / (k + rank))로 합침"""
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return dict(scores)
+
+
+class _Bm25Namespace:
+    """네임스페이스 하나의 역색인"""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)  # term → {doc_id: tf}
+        self.doc_terms = {}                # doc_id → Counter
+        self.doc_length = {}               # doc_id → 토큰 수
+        self.metadata = {}                 # doc_id → metadata
+        self.total_length = 0
+
+    def add(self, doc_id: str, text: str, metadata: Dict):
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        if not terms:
+            return
+        for term, tf in terms.items():
+            self.postings[term][doc_id] = tf
+        self.doc_terms[doc_id] = terms
+        self.doc_length[doc_id] = sum(terms.values())
+        self.metadata[doc_id] = metadata
+        self.total_length += self.doc_length[doc_id]
+
+    def remove(self, doc_id: str):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.metadata.pop(doc_id, None)
+        self.total_length -= self.doc_length.pop(doc_id)
+
+    def search(self, query: str, top_k: int, filter: Optional[Dict],
+               k1: float, b: float) -> List[Tuple[str, float, Dict]]:
+        doc_count = len(self.doc_terms)
+        if doc_count == 0:
+            return []
+        avg_length = self.total_length / doc_count
+
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                length = self.doc_length[doc_id]
+                scores[doc_id] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_length))
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        results = []
+        for doc_id, score in ranked:
+            metadata = self.metadata[doc_id]
+            if filter and not match_filter(metadata, filter):
+                continue
+            results.append((doc_id, score, metadata))
+            if len(results) >= top_k:
+                break
+        return results
+
+
+class LexicalIndex:
+    """
+    캡션/태그/OCR/문서 청크에 대한 BM25 어휘 색인
+
+    문서는 SQLite에 저장되고 역색인은 메모리에 유지된다. 벡터가 저장될 때마다
+    BaseManager에서 증분으로 갱신하고, 색인 전에 저장된 벡터는 BaseManager.backfill_lexical_index로 채운다.
+    """
+
+    def __init__(self, db_path: Optional[str] = LEXICAL_INDEX_PATH,
+                 k1: float = LEXICAL_BM25_K1, b: float = LEXICAL_BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._namespaces = defaultdict(_Bm25Namespace)
+
+        self._conn = None
+        if db_path:
+            try:
+                db_dir = os.path.dirname(db_path)
+                if db_dir:
+                    os.makedirs(db_dir, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute(
+                    """CREATE TABLE IF NOT EXISTS documents (
+                        namespace TEXT NOT NULL,
+                        id TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        metadata TEXT NOT NULL,
+                        PRIMARY KEY (namespace, id)
+                    )"""
+                )
+                self._conn.commit()
+                for namespace, doc_id, text, metadata in self._conn.execute(
+                    "SELECT namespace, id, text, metadata FROM documents"
+                ):
+                    self._namespaces[namespace].add(doc_id, text, json.loads(metadata))
+            except Exception as e:
+                logging.error(f"어휘 색인 저장소 초기화 실패 (메모리 색인만 사용): {str(e)}")
+                self._conn = None
+
+    def add_vectors(self, namespace: str, vectors: List[Dict]):
+        """저장된 벡터들의 메타데이터를 색인에 반영"""
+        records = []
+        with self._lock:
+            index = self._namespaces[namespace]
+            for vector in vectors:
+                metadata = vector.get('metadata') or {}
+                text = lexical_text(metadata)
+                if not text.strip():
+                    index.remove(vector['id'])
+                    continue
+                index.add(vector['id'], text, metadata)
+                records.append((namespace, vector['id'], text, json.dumps(metadata, ensure_ascii=False, default=str)))
+
+            if self._conn is not None and records:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO documents (namespace, id, text, metadata) VALUES (?, ?, ?, ?)",
+                        records
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    logging.error(f"어휘 색인 저장 실패: {str(e)}")
+
+    def remove(self, namespace: str, ids: List[str]):
+        with self._lock:
+            index = self._namespaces[namespace]
+            for doc_id in ids:
+                index.remove(doc_id)
+            if self._conn is not None:
+                self._conn.executemany(
+                    "DELETE FROM documents WHERE namespace = ? AND id = ?", [(namespace, doc_id) for doc_id in ids]
+                )
+                self._conn.commit()
+
+    def indexed_ids(self, namespace: str, ids: Iterable[str]) -> set:
+        """주어진 ID 중 색인에 있는 것"""
+        with self._lock:
+            index = self._namespaces[namespace]
+            return {doc_id for doc_id in ids if doc_id in index.doc_terms}
+
+    def update_metadata(self, namespace: str, ids: List[str], set_metadata: Dict):
+        """색인된 문서의 메타데이터 일부 변경 (파일 이동 등)"""
+        vectors = []
+        with self._lock:
+            index = self._namespaces[namespace]
+            for doc_id in ids:
+                if doc_id in index.metadata:
+                    vectors.append({'id': doc_id, 'metadata': {**index.metadata[doc_id], **set_metadata}})
+        if vectors:
+            self.add_vectors(namespace, vectors)
+
+    def clear(self, namespace: str):
+        with self._lock:
+            self._namespaces.pop(namespace, None)
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM documents WHERE namespace = ?", (namespace,))
+                self._conn.commit()
+
+    def search(self, namespace: str, query: str, top_k: int = 10,
+               filter: Optional[Dict] = None) -> List[Tuple[str, float, Dict]]:
+        """BM25 검색 결과 (id, 점수, 메타데이터) 목록"""
+        with self._lock:
+            return self._namespaces[namespace].search(query, top_k, filter, self.k1, self.b)
@@ -0,0 +1,19 @@
+import logging
+from typing import Callable, Optional
+
+
+def progress_reporter(progress_callback: Optional[Callable[[str, float], None]] = None) -> Callable[[str, float], None]:
+    """
+    단계별 진행률 콜백 (stage, progress) 래퍼
+
+    콜백이 없으면 아무것도 하지 않고, 콜백 오류는 로그만 남겨 처리를 멈추지 않는다.
+    """
+    def report(stage: str, progress: float):
+        if progress_callback is None:
+            return
+        try:
+            progress_callback(stage, progress)
+        except Exception as e:
+            logging.warning(f"진행률 갱신 실패 ({stage}): {str(e)}")
+
+    return report
@@ -0,0 +1,126 @@
+from typing import Iterable, Iterator, Tuple
+
+import cv2
+import numpy as np
+
+from .constants import (
+    VIDEO_MIN_FRAMES_PER_MINUTE,
+    VIDEO_MAX_FRAMES_PER_MINUTE,
+    VIDEO_SCENE_CUT_DISTANCE,
+    VIDEO_DUPLICATE_HASH_DISTANCE,
+    VIDEO_DUPLICATE_HIST_DISTANCE
+)
+
+
+class FrameSignature:
+    """프레임 비교용 특징 (64비트 dHash + 축소 휘도 히스토그램)"""
+
+    __slots__ = ('hash', 'histogram')
+
+    def __init__(self, frame_bgr: np.ndarray):
+        gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+
+        # dHash: 9x8로 줄인 뒤 가로로 인접한 픽셀 밝기 비교
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        self.hash = int(np.packbits(bits).view('>u8')[0])
+
+        # 64x36 휘도 32구간 히스토그램 (합이 1이 되도록 정규화)
+        thumb = cv2.resize(gray, (64, 36), interpolation=cv2.INTER_AREA)
+        histogram = np.bincount((thumb // 8).ravel(), minlength=32).astype(np.float32)
+        self.histogram = histogram / histogram.sum()
+
+    def hash_distance(self, other: 'FrameSignature') -> int:
+        return bin(self.hash ^ other.hash).count('1')
+
+    def hist_distance(self, other: 'FrameSignature') -> float:
+        """히스토그램 총변동 거리 (0: 동일 ~ 1: 완전히 다름)"""
+        return float(np.abs(self.histogram - other.histogram).sum() / 2)
+
+
+class SceneSelector:
+    """
+    추론 전에 프레임을 고르는 장면 선택기
+
+    촘촘하게 샘플링한 프레임 중 장면 전환 지점(직전 프레임과 히스토그램 거리가 큰 프레임)과
+    마지막으로 고른 프레임과 충분히 다른 프레임만 남기고, 거의 같은 프레임(dHash 해밍 거리와
+    히스토그램 거리가 모두 작은 프레임)은 버린다. 분당 최소/최대 프레임 수 예산을 지켜서
+    정적인 장면도 최소한은 기록하고 전환이 잦은 장면도 일정 수 이상은 고르지 않는다.
+
+    최대 예산 때문에 바로 고를 수 없는 장면 전환 프레임은 버리지 않고 보류했다가 예산이 허락하는
+    첫 샘플(또는 영상 끝)에서 내보낸다. 보류 중에 다시 전환이 일어나면 가장 최근 장면으로 바꾼다.
+    """
+
+    def __init__(self, min_per_minute: float = VIDEO_MIN_FRAMES_PER_MINUTE,
+                 max_per_minute: float = VIDEO_MAX_FRAMES_PER_MINUTE,
+                 scene_cut_distance: float = VIDEO_SCENE_CUT_DISTANCE,
+                 duplicate_hash_distance: int = VIDEO_DUPLICATE_HASH_DISTANCE,
+                 duplicate_hist_distance: float = VIDEO_DUPLICATE_HIST_DISTANCE):
+        self.max_gap = 60.0 / min_per_minute if min_per_minute else float('inf')
+        self.min_gap = 60.0 / max_per_minute if max_per_minute else 0.0
+        self.scene_cut_distance = scene_cut_distance
+        self.duplicate_hash_distance = duplicate_hash_distance
+        self.duplicate_hist_distance = duplicate_hist_distance
+
+        # 통계
+        self.probed = 0
+        self.kept = 0
+        self.scene_cuts = 0
+
+    def is_duplicate(self, signature: FrameSignature, reference: FrameSignature) -> bool:
+        return (signature.hash_distance(reference) <= self.duplicate_hash_distance
+                and signature.hist_distance(reference) <= self.duplicate_hist_distance)
+
+    def select(self, frames: Iterable[Tuple[int, float, np.ndarray]]) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """(프레임 번호, 초, BGR 프레임) 중 추론할 프레임만 순서대로 생성"""
+        last_kept = None
+        last_kept_time = None
+        previous = None
+        pending = None    # 보류한 장면 전환 프레임 (프레임 번호, 초, 프레임, 특징)
+
+        for frame_index, timestamp, frame in frames:
+            self.probed += 1
+            signature = FrameSignature(frame)
+            scene_cut = previous is not None and signature.hist_distance(previous) >= self.scene_cut_distance
+            if scene_cut:
+                self.scene_cuts += 1
+            previous = signature
+
+            if pending is not None and timestamp - last_kept_time >= self.min_gap:
+                # 예산이 허락하는 첫 샘플에서 보류한 전환 프레임을 내보냄 (예산은 내보낸 시각 기준)
+                last_kept = pending[3]
+                last_kept_time = timestamp
+                self.kept += 1
+                yield pending[:3]
+                pending = None
+
+            if last_kept is None:
+                keep = True
+            else:
+                elapsed = timestamp - last_kept_time
+                if elapsed >= self.max_gap:
+                    keep = True     # 최소 예산: 정적인 장면도 일정 간격마다 기록
+                elif elapsed < self.min_gap:
+                    keep = False    # 최대 예산 초과 (장면 전환이면 보류)
+                    if scene_cut:
+                        pending = (frame_index, timestamp, frame, signature)
+                else:
+                    keep = scene_cut or not self.is_duplicate(signature, last_kept)
+
+            if keep:
+                last_kept = signature
+                last_kept_time = timestamp
+                self.kept += 1
+                yield frame_index, timestamp, frame
+
+        if pending is not None:
+            self.kept += 1
+            yield pending[:3]
+
+    def stats(self) -> dict:
+        return {
+            'probed': self.probed,
+            'kept': self.kept,
+            'scene_cuts': self.scene_cuts,
+            'reduction': 1 - self.kept / self.probed if self.probed else 0.0
+        }
@@ -0,0 +1,123 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .embedding_cache import normalize_text
+from .constants import (
+    SEARCH_CACHE_TTL,
+    SEARCH_CACHE_MAX_ITEMS,
+    SEARCH_CACHE_SEMANTIC_DISTANCE
+)
+
+
+class SearchResultCache:
+    """
+    검색 결과 캐시 (정확 일치 + 의미 유사 2단계)
+
+    1단계: 정규화된 검색어 + 검색 조건(top_k, threshold, filter, namespace)이 같으면 결과 재사용
+    2단계: 검색 조건이 같고 검색어 임베딩의 코사인 거리가 semantic_distance 이내면 결과 재사용
+
+    모든 항목은 저장 당시 네임스페이스 쓰기 세대(generation)를 기록하며, 업서트/삭제로
+    세대가 바뀌면 무효가 되어 새로 수집된 미디어가 캐시에 가려지지 않는다.
+    """
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL, max_items: int = SEARCH_CACHE_MAX_ITEMS,
+                 semantic_distance: Optional[float] = SEARCH_CACHE_SEMANTIC_DISTANCE):
+        self.ttl = ttl
+        self.max_items = max_items
+        self.semantic_distance = semantic_distance
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_params(top_k: int, threshold: float, filter: Optional[Dict], namespace: str) -> str:
+        """검색 조건 키"""
+        return json.dumps([top_k, threshold, filter or {}, namespace], sort_keys=True, ensure_ascii=False)
+
+    @staticmethod
+    def make_key(query: str, params: str) -> str:
+        """정확 일치 캐시 키 (정규화된 검색어 + 검색 조건)"""
+        return f"{normalize_text(query).lower()}\x00{params}"
+
+    def get(self, key: str, generation: int) -> Optional[List[Dict]]:
+        """정확 일치 조회"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_valid(entry, generation):
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry['results']
+            if entry is not None:
+                del self._entries[key]
+            return None
+
+    def get_similar(self, embedding: List[float], params: str, generation: int) -> Optional[List[Dict]]:
+        """의미 유사 조회 (검색 조건이 같은 항목 중 임베딩이 가장 가까운 결과)"""
+        if self.semantic_distance is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        query = self._normalize(embedding)
+        with self._lock:
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if entry['params'] == params and self._is_valid(entry, generation)
+            ]
+            if candidates:
+                matrix = np.stack([entry['embedding'] for _, entry in candidates])
+                similarities = matrix @ query
+                best = int(np.argmax(similarities))
+                if 1.0 - similarities[best] <= self.semantic_distance:
+                    key, entry = candidates[best]
+                    self._entries.move_to_end(key)
+                    self.semantic_hits += 1
+                    return entry['results']
+            self.misses += 1
+            return None
+
+    def put(self, key: str, params: str, embedding: List[float], results: List[Dict], generation: int):
+        with self._lock:
+            self._entries[key] = {
+                'params': params,
+                'embedding': self._normalize(embedding),
+                'results': results,
+                'generation': generation,
+                'expires_at': time.monotonic() + self.ttl
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                'exact_hits': self.exact_hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'hit_rate': (self.exact_hits + self.semantic_hits) / total if total else 0.0,
+                'items': len(self._entries)
+            }
+
+    def _is_valid(self, entry: Dict, generation: int) -> bool:
+        return entry['generation'] == generation and entry['expires_at'] > time.monotonic()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
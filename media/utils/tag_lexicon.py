@@ -0,0 +1,210 @@
+import os
+import re
+import sys
+import json
+import logging
+import argparse
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .constants import TAG_LEXICON_PATH, TAG_LEXICON_REQUIRED
+
+_HANGUL_PATTERN = re.compile(r'[가-힣]')
+
+
+def normalize_tag(tag: str) -> str:
+    return ' '.join(str(tag).strip().lower().split())
+
+
+class TagLexicon:
+    """
+    RAM++ 태그 → 한국어 사전
+
+    RAM++ 태그 어휘는 고정되어 있으므로 미리 만든 사전으로 태그를 번역하고,
+    사전에 없는 태그만 fallback 번역 함수로 한 번에 번역한다.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, str]] = None):
+        self.entries = {normalize_tag(tag): korean for tag, korean in (entries or {}).items()}
+
+    @classmethod
+    def load(cls, path: str = TAG_LEXICON_PATH) -> 'TagLexicon':
+        if not os.path.exists(path):
+            logging.warning(f"태그 사전 파일이 없어 모든 태그를 번역 API로 처리합니다: {path}")
+            return cls()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        except Exception as e:
+            logging.error(f"태그 사전 로드 실패: {str(e)}")
+            return cls()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, tag: str) -> Optional[str]:
+        return self.entries.get(normalize_tag(tag))
+
+    def translate(self, tags: List[str], fallback: Callable[[List[str]], List[str]]) -> List[str]:
+        return self.translate_many([tags], fallback)[0]
+
+    def translate_many(self, tag_lists: List[List[str]],
+                       fallback: Callable[[List[str]], List[str]]) -> List[List[str]]:
+        """
+        여러 태그 목록 번역 (사전에 없는 태그는 모아서 fallback 한 번으로 번역)
+
+        Args:
+            fallback: 영문 태그 목록을 받아 같은 순서의 한국어 목록을 돌려주는 함수
+        """
+        missing = list(dict.fromkeys(
+            tag for tags in tag_lists for tag in tags if tag and self.lookup(tag) is None
+        ))
+        translated_missing = {}
+        if missing:
+            try:
+                translated_missing = dict(zip(missing, fallback(missing)))
+            except Exception as e:
+                logging.error(f"사전에 없는 태그 번역 실패: {str(e)}")
+
+        return [
+            [self.lookup(tag) or translated_missing.get(tag) or tag for tag in tags if tag]
+            for tags in tag_lists
+        ]
+
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+
+def get_tag_lexicon() -> TagLexicon:
+    """프로세스 전역 태그 사전 (처음 호출할 때 한 번만 로드)"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = TagLexicon.load()
+    return _lexicon
+
+
+def check_tag_lexicon(required: bool = TAG_LEXICON_REQUIRED) -> TagLexicon:
+    """
+    서버 시작 시 태그 사전 확인
+
+    사전이 없거나 설치된 RAM 태그 목록 중 빠진 태그가 있으면 오류 로그를 남기고,
+    required면 예외로 시작을 막는다 (사전이 없으면 모든 태그가 번역 API로 번역됨).
+
+    Raises:
+        RuntimeError: required인데 사전이 없거나 불완전할 때
+    """
+    lexicon = get_tag_lexicon()
+    problem = None
+    if not len(lexicon):
+        problem = f"태그 사전이 없습니다: {TAG_LEXICON_PATH}"
+    else:
+        tag_list_path = default_tag_list_path()
+        if tag_list_path:
+            with open(tag_list_path, 'r', encoding='utf-8') as f:
+                tags = [line.strip() for line in f if line.strip()]
+            report = verify_lexicon(tags, lexicon.entries)
+            if report['missing']:
+                problem = f"태그 사전에 없는 RAM 태그 {len(report['missing'])}/{report['total']}개"
+
+    if problem is None:
+        logging.info(f"태그 사전 로드: {len(lexicon)}개")
+        return lexicon
+
+    message = f"{problem} (python -m media.utils.tag_lexicon build 로 생성 후 verify로 확인)"
+    if required:
+        raise RuntimeError(message)
+    logging.error(f"{message} - 사전에 없는 태그는 번역 API로 처리합니다")
+    return lexicon
+
+
+def default_tag_list_path() -> Optional[str]:
+    """설치된 RAM 패키지에 포함된 영문 태그 목록 경로"""
+    try:
+        import ram
+    except ImportError:
+        return None
+    path = os.path.join(os.path.dirname(ram.__file__), 'data', 'ram_tag_list.txt')
+    return path if os.path.exists(path) else None
+
+
+def verify_lexicon(tags: List[str], entries: Dict[str, str]) -> Dict:
+    """모든 태그에 번역이 있는지, 한글이 포함됐는지 확인"""
+    normalized = {normalize_tag(tag): value for tag, value in entries.items()}
+    missing = [tag for tag in tags if not normalized.get(normalize_tag(tag), '').strip()]
+    missing_set = set(missing)
+    non_korean = [
+        tag for tag in tags
+        if tag not in missing_set and not _HANGUL_PATTERN.search(normalized[normalize_tag(tag)])
+    ]
+    return {'total': len(tags), 'missing': missing, 'non_korean': non_korean}
+
+
+def build_lexicon(client, tags: List[str], batch_size: int = 100, retries: int = 2) -> Dict[str, str]:
+    """영문 태그 목록을 번역 서비스(번역 메모리 + 일괄 번역)로 번역해 사전 생성 (누락된 태그는 재시도)"""
+    from .translation_utils import TranslationService
+
+    translator = TranslationService(client, batch_size=batch_size)
+    entries = {}
+    pending = list(dict.fromkeys(tags))
+    for attempt in range(retries + 1):
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            for tag, korean in zip(batch, translator.translate_many(batch, is_caption=False)):
+                # 번역 실패 시 원문이 그대로 돌아오므로 마지막 시도 전까지는 다시 번역
+                if korean and korean.strip() and (korean.strip().lower() != tag.lower() or attempt == retries):
+                    entries[tag] = korean.strip()
+            print(f"번역 진행: {min(start + batch_size, len(pending))}/{len(pending)} (시도 {attempt + 1})")
+        pending = [tag for tag in pending if tag not in entries]
+        if not pending:
+            break
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RAM++ 태그 한국어 사전 생성/검증")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="태그 목록을 번역해 사전 생성")
+    build_parser.add_argument('--tag-list', default=default_tag_list_path(), help="영문 태그 목록 (한 줄에 하나)")
+    build_parser.add_argument('--output', default=TAG_LEXICON_PATH)
+    build_parser.add_argument('--batch-size', type=int, default=100)
+
+    verify_parser = subparsers.add_parser('verify', help="사전이 태그 목록을 모두 포함하는지 확인")
+    verify_parser.add_argument('--tag-list', default=default_tag_list_path())
+    verify_parser.add_argument('--lexicon', default=TAG_LEXICON_PATH)
+
+    args = parser.parse_args(argv)
+    if not args.tag_list or not os.path.exists(args.tag_list):
+        print("태그 목록 파일을 찾을 수 없습니다. --tag-list로 ram_tag_list.txt 경로를 지정하세요.")
+        return 1
+
+    with open(args.tag_list, 'r', encoding='utf-8') as f:
+        tags = [line.strip() for line in f if line.strip()]
+
+    if args.command == 'build':
+        from openai import OpenAI
+        from config import OPENAI_API_KEY
+
+        entries = build_lexicon(OpenAI(api_key=OPENAI_API_KEY), tags, batch_size=args.batch_size)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(entries.items())), f, ensure_ascii=False, indent=1)
+        lexicon_path = args.output
+    else:
+        lexicon_path = args.lexicon
+
+    with open(lexicon_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    report = verify_lexicon(tags, entries)
+    print(f"태그 {report['total']}개 중 누락 {len(report['missing'])}개, 한글 없음 {len(report['non_korean'])}개")
+    if report['missing']:
+        print(f"누락된 태그 (일부): {report['missing'][:20]}")
+    if report['non_korean']:
+        print(f"한글이 없는 번역 (일부): {report['non_korean'][:20]}")
+    return 1 if report['missing'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import re
 import logging
-from typing import List, Dict
+from collections import deque
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 
 def create_text_chunks(text: str, chunk_size: int = 500, overlap: int = 100) -> List[Dict]:
     """텍스트를 청크로 분할"""
@@ -30,4 +31,44 @@ def create_text_chunks(text: str, chunk_size: int = 500, overlap: int = 100) ->
             
     except Exception as e:
         logging.error(f"텍스트 청킹 실패: {str(e)}")
-        return [] 
\ No newline at end of file
+        return []
+
+
+def iter_text_chunks(pages: Iterable[Tuple[Optional[int], str]], chunk_size: int = 1000,
+                     overlap: int = 200) -> Iterator[Dict]:
+    """
+    (페이지 번호, 텍스트)를 차례로 받으며 청크를 바로 생성 (문서 전체를 모으지 않음)
+
+    단어 단위로 chunk_size자까지 채우면 청크를 내보내고 끝의 overlap자 이내만 남겨 다음 청크에 잇는다.
+    청크마다 시작/끝 페이지 번호가 붙는다 (페이지가 없는 문서는 None).
+    """
+    window = deque()    # (단어, 페이지 번호)
+    length = 0
+    pending = False     # 마지막 청크 이후 새 단어가 들어왔는지
+    chunk_index = 0
+
+    for page_number, text in pages:
+        for word in (text or '').split():
+            window.append((word, page_number))
+            length += len(word) + 1
+            pending = True
+            if length < chunk_size:
+                continue
+
+            yield _window_chunk(window, chunk_index)
+            chunk_index += 1
+            pending = False
+            while window and length > overlap:
+                length -= len(window.popleft()[0]) + 1
+
+    if pending:
+        yield _window_chunk(window, chunk_index)
+
+
+def _window_chunk(window: deque, chunk_index: int) -> Dict:
+    return {
+        'chunk_index': chunk_index,
+        'text': " ".join(word for word, _ in window),
+        'page_start': window[0][1],
+        'page_end': window[-1][1]
+    }
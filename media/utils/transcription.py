@@ -0,0 +1,211 @@
+import wave
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .audio_analysis import analyze_audio
+from .workspace import JobWorkspace
+from .constants import (
+    AUDIO_ANALYSIS_SAMPLE_RATE,
+    TRANSCRIPTION_WORKERS,
+    TRANSCRIPTION_TARGET_SEGMENT_SEC,
+    TRANSCRIPTION_MAX_SEGMENT_SEC,
+    TRANSCRIPTION_MIN_SILENCE_SEC,
+    TRANSCRIPTION_SILENCE_RMS,
+    TRANSCRIPTION_RETRIES
+)
+
+_WINDOW_SEC = 0.05    # 무음 판단 창 길이 (초)
+
+
+class TranscriptSegment:
+    """원본 오디오 기준 시작/끝 시각(초)이 있는 전사 구간"""
+
+    __slots__ = ('start', 'end', 'text')
+
+    def __init__(self, start: float, end: float, text: str):
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def __repr__(self):
+        return f"TranscriptSegment({self.start:.2f}-{self.end:.2f}, {self.text!r})"
+
+
+def window_rms(wav_path: str, window_sec: float = _WINDOW_SEC) -> np.ndarray:
+    """16비트 모노 WAV의 창별 RMS (파일을 조금씩 읽어 계산)"""
+    with wave.open(wav_path, 'rb') as reader:
+        window = max(1, int(reader.getframerate() * window_sec))
+        block = window * 200
+        values = []
+        while True:
+            data = reader.readframes(block)
+            if not data:
+                break
+            samples = np.frombuffer(data, dtype='<i2').astype(np.float64)
+            full = len(samples) // window * window
+            if full:
+                values.append(np.sqrt((samples[:full].reshape(-1, window) ** 2).mean(axis=1)))
+            if len(samples) > full:
+                values.append(np.array([np.sqrt((samples[full:] ** 2).mean())]))
+    return np.concatenate(values) if values else np.zeros(0)
+
+
+def plan_segments(energies: np.ndarray, window_sec: float = _WINDOW_SEC,
+                  target_sec: float = TRANSCRIPTION_TARGET_SEGMENT_SEC,
+                  max_sec: float = TRANSCRIPTION_MAX_SEGMENT_SEC,
+                  min_silence_sec: float = TRANSCRIPTION_MIN_SILENCE_SEC,
+                  silence_rms: float = TRANSCRIPTION_SILENCE_RMS) -> List[Tuple[int, int]]:
+    """
+    창별 RMS로 (시작 창, 끝 창) 구간 목록 생성
+
+    구간이 target_sec 이상이 되면 다음 무음 구간(min_silence_sec 이상)의 가운데에서 자르고,
+    max_sec까지 무음이 없으면 뒤쪽 절반에서 가장 조용한 창에서 자른다.
+    각 구간의 앞뒤 무음은 잘라내고, 전체가 무음인 구간은 버린다.
+    """
+    silent = energies < silence_rms
+    target = max(1, int(target_sec / window_sec))
+    longest = max(target, int(max_sec / window_sec))
+    min_silence = max(1, int(min_silence_sec / window_sec))
+
+    cuts = []
+    start = 0
+    run_start = None
+    index = 0
+    total = len(energies)
+    while index < total:
+        if silent[index]:
+            if run_start is None:
+                run_start = index
+        else:
+            if run_start is not None and index - run_start >= min_silence and run_start - start >= target:
+                cut = (run_start + index) // 2
+                cuts.append((start, cut))
+                start = cut
+            run_start = None
+
+        if index - start + 1 >= longest:
+            search_from = start + longest // 2
+            cut = search_from + int(np.argmin(energies[search_from:index + 1])) + 1
+            cuts.append((start, cut))
+            start = cut
+            run_start = None
+        index += 1
+    if start < total:
+        cuts.append((start, total))
+
+    segments = []
+    for begin, end in cuts:
+        voiced = np.flatnonzero(~silent[begin:end])
+        if len(voiced):
+            segments.append((begin + int(voiced[0]), begin + int(voiced[-1]) + 1))
+    return segments
+
+
+class TranscriptionEngine:
+    """
+    무음 기준으로 나눈 구간을 병렬로 Whisper에 보내는 음성 인식기
+
+    구간별로 segment 단위 타임스탬프(verbose_json)를 받아 원본 기준 시각으로 옮긴 뒤
+    순서대로 합친다. 구간 하나가 API 파일 크기 제한을 넘지 않도록 길이에 상한을 둔다.
+    재시도 후에도 변환하지 못한 구간은 gaps에 (시작 초, 끝 초)로 남긴다.
+    """
+
+    def __init__(self, client, workers: int = TRANSCRIPTION_WORKERS):
+        self.client = client
+        self.workers = workers
+        self.gaps = []
+
+    def transcribe(self, audio_path: str) -> List[TranscriptSegment]:
+        self.gaps = []
+        with JobWorkspace("transcribe") as workspace:
+            wav_path = self._ensure_wav(audio_path, workspace)
+            if not wav_path:
+                return []
+
+            segments = plan_segments(window_rms(wav_path))
+            if not segments:
+                logging.info("음성 구간이 없습니다")
+                return []
+            logging.info(f"음성 구간 {len(segments)}개로 분할, {min(self.workers, len(segments))}개씩 병렬 변환")
+
+            pieces = self._write_segments(wav_path, segments, workspace)
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="whisper") as executor:
+                results = list(executor.map(lambda piece: self._transcribe_piece(*piece), pieces))
+
+        self.gaps = [
+            (offset, offset + duration)
+            for (_, offset, duration), result in zip(pieces, results) if result is None
+        ]
+        if self.gaps:
+            logging.error(f"음성 인식 실패 구간 {len(self.gaps)}개: "
+                          + ', '.join(f"{start:.1f}-{end:.1f}s" for start, end in self.gaps))
+        return [segment for result in results if result for segment in result]
+
+    def _ensure_wav(self, audio_path: str, workspace: JobWorkspace):
+        """분석 형식(16비트 모노 WAV)이 아니면 ffmpeg로 한 번 변환"""
+        try:
+            with wave.open(audio_path, 'rb') as reader:
+                if (reader.getnchannels(), reader.getsampwidth(), reader.getframerate()) == \
+                        (1, 2, AUDIO_ANALYSIS_SAMPLE_RATE):
+                    return audio_path
+        except (wave.Error, EOFError):
+            pass
+
+        analysis = analyze_audio(
+            audio_path,
+            output_path=workspace.file("transcribe.wav"),
+            max_output_bytes=workspace.remaining_bytes()
+        )
+        return analysis.output_path
+
+    def _write_segments(self, wav_path: str, segments: List[Tuple[int, int]], workspace: JobWorkspace):
+        """구간별 WAV 파일 기록 → (경로, 시작 초) 목록"""
+        pieces = []
+        with wave.open(wav_path, 'rb') as reader:
+            rate = reader.getframerate()
+            window = max(1, int(rate * _WINDOW_SEC))
+            for number, (begin, end) in enumerate(segments):
+                reader.setpos(min(begin * window, reader.getnframes()))
+                frames = reader.readframes((end - begin) * window)
+                path = workspace.file(f"segment_{number:05d}.wav")
+                with wave.open(path, 'wb') as writer:
+                    writer.setnchannels(1)
+                    writer.setsampwidth(2)
+                    writer.setframerate(rate)
+                    writer.writeframes(frames)
+                pieces.append((path, begin * window / rate, len(frames) // 2 / rate))
+        return pieces
+
+    def _transcribe_piece(self, path: str, offset: float, duration: float) -> Optional[List[TranscriptSegment]]:
+        """구간 하나 변환 (재시도 후에도 실패하면 None)"""
+        for attempt in range(TRANSCRIPTION_RETRIES + 1):
+            try:
+                with open(path, 'rb') as audio_file:
+                    response = self.client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=audio_file,
+                        response_format="verbose_json",
+                        timestamp_granularities=["segment"]
+                    )
+                break
+            except Exception as e:
+                logging.error(f"Whisper 구간 변환 실패 ({offset:.1f}s, 시도 {attempt + 1}): {str(e)}")
+        else:
+            return None
+
+        segments = [
+            TranscriptSegment(offset + float(_field(item, 'start')), offset + float(_field(item, 'end')),
+                              _field(item, 'text').strip())
+            for item in (getattr(response, 'segments', None) or [])
+        ]
+        if not segments and getattr(response, 'text', '').strip():
+            segments = [TranscriptSegment(offset, offset + duration, response.text.strip())]
+        return [segment for segment in segments if segment.text]
+
+
+def _field(item, name):
+    """응답 segment가 객체/딕셔너리 어느 쪽이어도 값 읽기"""
+    return item[name] if isinstance(item, dict) else getattr(item, name)
@@ -0,0 +1,120 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .embedding_cache import normalize_text
+from .constants import (
+    TRANSLATION_CACHE_PATH,
+    TRANSLATION_CACHE_MEMORY_ITEMS
+)
+
+
+def make_translation_key(mode: str, text: str) -> str:
+    """번역 종류(mode) + 정규화된 원문의 해시로 키 생성"""
+    return hashlib.sha256(f"{mode}\x00{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """
+    번역 메모리 (메모리 LRU + SQLite 디스크 2단계)
+
+    같은 캡션/태그/검색어가 반복해서 들어오므로 원문과 번역 종류(mode)별로 번역 결과를 보관한다.
+    """
+
+    def __init__(self, db_path: Optional[str] = TRANSLATION_CACHE_PATH,
+                 max_memory_items: int = TRANSLATION_CACHE_MEMORY_ITEMS):
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 히트/미스 카운터
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        if db_path:
+            try:
+                db_dir = os.path.dirname(db_path)
+                if db_dir:
+                    os.makedirs(db_dir, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    """CREATE TABLE IF NOT EXISTS translations (
+                        key TEXT PRIMARY KEY,
+                        mode TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        translation TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    )"""
+                )
+                self._conn.commit()
+            except Exception as e:
+                logging.error(f"번역 메모리 디스크 저장소 초기화 실패 (메모리만 사용): {str(e)}")
+                self._conn = None
+
+    def get(self, mode: str, text: str) -> Optional[str]:
+        """저장된 번역 조회 (없으면 None)"""
+        key = make_translation_key(mode, text)
+        with self._lock:
+            translation = self._memory.get(key)
+            if translation is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return translation
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT translation FROM translations WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        self._remember(key, row[0])
+                        self.disk_hits += 1
+                        return row[0]
+                except Exception as e:
+                    logging.error(f"번역 메모리 조회 실패: {str(e)}")
+
+            self.misses += 1
+            return None
+
+    def put(self, mode: str, text: str, translation: str):
+        if not translation:
+            return
+        key = make_translation_key(mode, text)
+        with self._lock:
+            self._remember(key, translation)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO translations (key, mode, source, translation, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, mode, normalize_text(text), translation, time.time())
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    logging.error(f"번역 메모리 저장 실패: {str(e)}")
+
+    def _remember(self, key: str, translation: str):
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / total if total else 0.0,
+                'memory_items': len(self._memory)
+            }
@@ -1,20 +1,153 @@
+import json
 import logging
+from collections import OrderedDict
+from typing import Dict, List
+
+from .translation_memory import TranslationMemory
+from .constants import TRANSLATION_BATCH_SIZE
+
+
+def _system_content(is_caption: bool) -> str:
+    return "You are a translator that converts English {} to Korean.".format(
+        "image descriptions" if is_caption else "tags"
+    )
+
+
+def _request_translation(client, text: str, is_caption: bool) -> str:
+    response = client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": _system_content(is_caption)},
+            {"role": "user", "content": f"Translate this to Korean: {text}"}
+        ],
+        temperature=0.3
+    )
+    return response.choices[0].message.content
+
+
+def _request_query_translation(client, text: str) -> str:
+    response = client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": "You are a translator that converts Korean search queries to English. "
+                                          "Reply with only the translated query."},
+            {"role": "user", "content": text}
+        ],
+        temperature=0.0
+    )
+    return response.choices[0].message.content.strip()
+
+
+def _request_translations(client, texts: List[str], is_caption: bool) -> List[str]:
+    """JSON 배열로 여러 텍스트를 한 번에 번역 (응답 개수가 다르면 예외)"""
+    system_content = _system_content(is_caption) + (
+        " The input is a JSON array of strings. Reply with only a JSON array of the translations"
+        " in the same order and with the same length."
+    )
+    response = client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": json.dumps(texts, ensure_ascii=False)}
+        ],
+        temperature=0.3
+    )
+    translated = json.loads(response.choices[0].message.content)
+    if not isinstance(translated, list) or len(translated) != len(texts):
+        raise ValueError(f"일괄 번역 결과 개수 불일치 ({len(texts)}건)")
+    return [str(item) for item in translated]
+
 
 def translate_text(client, text: str, is_caption: bool = True) -> str:
     """번역 유틸리티"""
     try:
-        system_content = "You are a translator that converts English {} to Korean.".format(
-            "image descriptions" if is_caption else "tags"
-        )
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_content},
-                {"role": "user", "content": f"Translate this to Korean: {text}"}
-            ],
-            temperature=0.3
-        )
-        return response.choices[0].message.content
+        return _request_translation(client, text, is_caption)
     except Exception as e:
         logging.error(f"번역 실패: {str(e)}")
-        return text 
\ No newline at end of file
+        return text
+
+
+class TranslationService:
+    """
+    번역 메모리를 거치는 번역 서비스
+
+    번역 메모리에 있는 원문은 바로 돌려주고, 없는 원문만 중복을 제거해 batch_size개씩
+    JSON 일괄 요청으로 번역한 뒤 인덱스로 결과를 되돌린다. 실패한 항목은 원문을 그대로
+    반환하며 번역 메모리에 저장하지 않는다.
+    """
+
+    def __init__(self, client, memory: TranslationMemory = None, batch_size: int = TRANSLATION_BATCH_SIZE):
+        self.client = client
+        self.memory = memory if memory is not None else TranslationMemory()
+        self.batch_size = batch_size
+        self.requests = 0
+
+    def translate(self, text: str, is_caption: bool = True) -> str:
+        return self.translate_many([text], is_caption)[0]
+
+    def translate_query(self, text: str) -> str:
+        """한국어 검색어를 영어로 번역 (번역 메모리 사용, 실패 시 원문)"""
+        if not text or not text.strip():
+            return text
+        cached = self.memory.get('query', text)
+        if cached is not None:
+            return cached
+
+        self.requests += 1
+        try:
+            translation = _request_query_translation(self.client, text)
+        except Exception as e:
+            logging.error(f"검색어 번역 실패: {str(e)}")
+            return text
+        if translation:
+            self.memory.put('query', text, translation)
+        return translation or text
+
+    def translate_many(self, texts: List[str], is_caption: bool = True) -> List[str]:
+        mode = 'caption' if is_caption else 'tags'
+        results = list(texts)
+        missing = OrderedDict()   # 원문 → 결과를 채울 인덱스 목록
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            cached = self.memory.get(mode, text)
+            if cached is not None:
+                results[index] = cached
+            else:
+                missing.setdefault(text, []).append(index)
+
+        sources = list(missing.keys())
+        for start in range(0, len(sources), self.batch_size):
+            batch = sources[start:start + self.batch_size]
+            for source, translation in zip(batch, self._translate_batch(batch, is_caption)):
+                if translation:
+                    self.memory.put(mode, source, translation)
+                    for index in missing[source]:
+                        results[index] = translation
+        return results
+
+    def _translate_batch(self, texts: List[str], is_caption: bool) -> List:
+        """일괄 번역 후 실패하면 하나씩 번역 (실패한 항목은 None)"""
+        self.requests += 1
+        try:
+            if len(texts) == 1:
+                return [_request_translation(self.client, texts[0], is_caption)]
+            return _request_translations(self.client, texts, is_caption)
+        except Exception as e:
+            if len(texts) == 1:
+                logging.error(f"번역 실패: {str(e)}")
+                return [None]
+            logging.warning(f"일괄 번역 실패, 개별 번역으로 전환: {str(e)}")
+
+        translations = []
+        for text in texts:
+            self.requests += 1
+            try:
+                translations.append(_request_translation(self.client, text, is_caption))
+            except Exception as e:
+                logging.error(f"번역 실패: {str(e)}")
+                translations.append(None)
+        return translations
+
+    def stats(self) -> Dict:
+        return {'requests': self.requests, **self.memory.stats()}
@@ -0,0 +1,438 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .constants import (
+    EMBEDDING_DIMENSION,
+    VECTOR_STORE_BACKEND,
+    LOCAL_VECTOR_STORE_PATH
+)
+
+
+class QueryMatch:
+    """검색 결과 항목 (Pinecone 응답과 같은 속성 제공)"""
+
+    def __init__(self, id: str, score: float, metadata: Optional[Dict] = None,
+                 lexical_score: Optional[float] = None):
+        self.id = id
+        self.score = score
+        self.metadata = metadata or {}
+        self.lexical_score = lexical_score    # 하이브리드 검색 시 BM25 점수
+
+    def __repr__(self):
+        return f"QueryMatch(id={self.id!r}, score={self.score:.4f})"
+
+
+class QueryResult:
+    def __init__(self, matches: List[QueryMatch]):
+        self.matches = matches
+
+
+class IndexStats:
+    def __init__(self, total_vector_count: int, dimension: int, namespaces: Dict[str, int]):
+        self.total_vector_count = total_vector_count
+        self.dimension = dimension
+        self.namespaces = namespaces
+
+
+class VectorStore:
+    """벡터 저장소 공통 인터페이스 (Pinecone Index와 같은 메서드 이름 사용)"""
+
+    def upsert(self, vectors: List[Dict], namespace: str = ""):
+        raise NotImplementedError
+
+    def query(self, vector: List[float], top_k: int = 10, namespace: str = "",
+              filter: Optional[Dict] = None, include_metadata: bool = True) -> QueryResult:
+        raise NotImplementedError
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False,
+               namespace: str = "", filter: Optional[Dict] = None):
+        raise NotImplementedError
+
+    def update(self, id: str, set_metadata: Dict, namespace: str = ""):
+        """벡터 값은 그대로 두고 메타데이터 일부만 변경"""
+        raise NotImplementedError
+
+    def fetch(self, ids: List[str], namespace: str = "") -> Dict[str, Dict]:
+        """ID로 벡터 조회 → {id: {'id', 'values', 'metadata'}} (없는 ID는 빠짐)"""
+        raise NotImplementedError
+
+    def list_ids(self, namespace: str = "", page_size: int = 100) -> Iterator[List[str]]:
+        """네임스페이스의 벡터 ID를 페이지 단위로 나열"""
+        raise NotImplementedError
+
+    def describe_index_stats(self) -> IndexStats:
+        raise NotImplementedError
+
+
+class PineconeVectorStore(VectorStore):
+    """Pinecone 백엔드"""
+
+    def __init__(self, api_key: str, index_name: str, dimension: int = EMBEDDING_DIMENSION):
+        from pinecone import Pinecone
+
+        self.pc = Pinecone(api_key=api_key)
+        existing_indexes = self.pc.list_indexes().names()
+
+        if index_name not in existing_indexes:
+            print(f"인덱스 '{index_name}' 생성 중...")
+            self.pc.create_index(
+                name=index_name,
+                dimension=dimension,
+                metric='cosine',
+                spec={"serverless": {"cloud": "aws", "region": "us-west-2"}}
+            )
+            print("인덱스 생성 완료")
+
+        self.index = self.pc.Index(index_name)
+        print("Pinecone 연결 성공")
+
+    def upsert(self, vectors, namespace=""):
+        return self.index.upsert(vectors=vectors, namespace=namespace)
+
+    def query(self, vector, top_k=10, namespace="", filter=None, include_metadata=True):
+        results = self.index.query(
+            vector=vector,
+            top_k=top_k,
+            namespace=namespace,
+            filter=filter or None,
+            include_metadata=include_metadata
+        )
+        return QueryResult([
+            QueryMatch(match.id, match.score, match.metadata) for match in results.matches
+        ])
+
+    def delete(self, ids=None, delete_all=False, namespace="", filter=None):
+        if delete_all:
+            return self.index.delete(delete_all=True, namespace=namespace)
+        if filter:
+            return self.index.delete(filter=filter, namespace=namespace)
+        return self.index.delete(ids=ids, namespace=namespace)
+
+    def update(self, id, set_metadata, namespace=""):
+        return self.index.update(id=id, set_metadata=set_metadata, namespace=namespace)
+
+    def fetch(self, ids, namespace=""):
+        response = self.index.fetch(ids=ids, namespace=namespace)
+        return {
+            vector_id: {'id': vector_id, 'values': list(vector.values), 'metadata': dict(vector.metadata or {})}
+            for vector_id, vector in (response.vectors or {}).items()
+        }
+
+    def list_ids(self, namespace="", page_size=100):
+        for ids in self.index.list(namespace=namespace, limit=page_size):
+            yield list(ids)
+
+    def describe_index_stats(self):
+        stats = self.index.describe_index_stats()
+        namespaces = {
+            name: summary.vector_count for name, summary in (stats.namespaces or {}).items()
+        }
+        return IndexStats(stats.total_vector_count, stats.dimension, namespaces)
+
+
+def match_filter(metadata: Dict, filter: Dict) -> bool:
+    """Pinecone 형식 메타데이터 필터 평가 ($eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $and, $or)"""
+    for key, condition in filter.items():
+        if key == '$and':
+            if not all(match_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+        if key == '$or':
+            if not any(match_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {'$eq': condition}
+
+        # 리스트 값(tags 등)은 원소 중 하나라도 일치하면 일치로 처리
+        values = value if isinstance(value, list) else [value]
+        for op, target in condition.items():
+            if op == '$eq':
+                ok = target in values
+            elif op == '$ne':
+                ok = target not in values
+            elif op == '$in':
+                ok = any(v in target for v in values)
+            elif op == '$nin':
+                ok = not any(v in target for v in values)
+            elif op in ('$gt', '$gte', '$lt', '$lte'):
+                try:
+                    ok = {
+                        '$gt': lambda v: v > target,
+                        '$gte': lambda v: v >= target,
+                        '$lt': lambda v: v < target,
+                        '$lte': lambda v: v <= target
+                    }[op](value)
+                except TypeError:
+                    ok = False
+            else:
+                raise ValueError(f"지원하지 않는 필터 연산자: {op}")
+            if not ok:
+                return False
+    return True
+
+
+class _LocalNamespace:
+    """로컬 저장소의 네임스페이스 하나 (float32 memmap 행렬 + SQLite 메타데이터)"""
+
+    def __init__(self, root: str, name: str, dimension: int, conn: sqlite3.Connection):
+        self.name = name
+        self.dimension = dimension
+        self.conn = conn
+        self.matrix_path = os.path.join(root, f"{name or '_default'}.f32")
+
+        # 메타데이터 로드 (행 번호 → id/메타데이터)
+        rows = conn.execute(
+            "SELECT row, id, metadata FROM vectors WHERE namespace = ? ORDER BY row", (name,)
+        ).fetchall()
+        size = rows[-1][0] + 1 if rows else 0
+        self.ids = [None] * size
+        self.metadata = [None] * size
+        self.row_of = {}
+        for row, vector_id, metadata in rows:
+            self.ids[row] = vector_id
+            self.metadata[row] = json.loads(metadata)
+            self.row_of[vector_id] = row
+        self.free_rows = [row for row in range(size) if self.ids[row] is None]
+
+        capacity = max(1024, size)
+        if os.path.exists(self.matrix_path):
+            capacity = max(capacity, os.path.getsize(self.matrix_path) // (4 * dimension))
+        self.matrix = self._open_matrix(capacity)
+
+        # 유효 행 마스크 (행렬 용량만큼 할당)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.valid[:size] = [vector_id is not None for vector_id in self.ids]
+        self._mask_cache = {}
+
+    def _open_matrix(self, capacity: int) -> np.memmap:
+        mode = 'r+' if os.path.exists(self.matrix_path) else 'w+'
+        if mode == 'r+' and os.path.getsize(self.matrix_path) < capacity * self.dimension * 4:
+            # 용량이 부족하면 파일 크기만 늘림 (기존 데이터 유지)
+            with open(self.matrix_path, 'r+b') as f:
+                f.truncate(capacity * self.dimension * 4)
+        return np.memmap(self.matrix_path, dtype=np.float32, mode=mode, shape=(capacity, self.dimension))
+
+    def _ensure_capacity(self, rows: int):
+        capacity = self.matrix.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        self.matrix.flush()
+        del self.matrix
+        self.matrix = self._open_matrix(capacity)
+        self.valid = np.concatenate([self.valid, np.zeros(capacity - len(self.valid), dtype=bool)])
+
+    def upsert(self, vectors: List[Dict]):
+        values = np.asarray([vector['values'] for vector in vectors], dtype=np.float32)
+        if values.shape[1] != self.dimension:
+            raise ValueError(f"벡터 차원 불일치: {values.shape[1]} (기대값 {self.dimension})")
+        norms = np.linalg.norm(values, axis=1, keepdims=True)
+        values = values / np.where(norms == 0, 1, norms)
+
+        records = []
+        for vector, normalized in zip(vectors, values):
+            vector_id = vector['id']
+            row = self.row_of.get(vector_id)
+            if row is None:
+                if self.free_rows:
+                    row = self.free_rows.pop()
+                else:
+                    row = len(self.ids)
+                    self.ids.append(None)
+                    self.metadata.append(None)
+                    self._ensure_capacity(row + 1)
+            self.matrix[row] = normalized
+            self.ids[row] = vector_id
+            self.metadata[row] = vector.get('metadata') or {}
+            self.valid[row] = True
+            self.row_of[vector_id] = row
+            records.append((self.name, row, vector_id, json.dumps(self.metadata[row], ensure_ascii=False)))
+
+        self.matrix.flush()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO vectors (namespace, row, id, metadata) VALUES (?, ?, ?, ?)", records
+        )
+        self.conn.commit()
+        self._mask_cache.clear()
+
+    def delete(self, ids: List[str]):
+        removed = []
+        for vector_id in ids:
+            row = self.row_of.pop(vector_id, None)
+            if row is None:
+                continue
+            self.matrix[row] = 0
+            self.ids[row] = None
+            self.metadata[row] = None
+            self.valid[row] = False
+            self.free_rows.append(row)
+            removed.append((self.name, vector_id))
+        if removed:
+            self.matrix.flush()
+            self.conn.executemany("DELETE FROM vectors WHERE namespace = ? AND id = ?", removed)
+            self.conn.commit()
+            self._mask_cache.clear()
+
+    def update(self, vector_id: str, set_metadata: Dict):
+        row = self.row_of.get(vector_id)
+        if row is None:
+            return
+        self.metadata[row] = {**self.metadata[row], **set_metadata}
+        self.conn.execute(
+            "UPDATE vectors SET metadata = ? WHERE namespace = ? AND id = ?",
+            (json.dumps(self.metadata[row], ensure_ascii=False), self.name, vector_id)
+        )
+        self.conn.commit()
+        self._mask_cache.clear()
+
+    def fetch(self, ids: List[str]) -> Dict[str, Dict]:
+        vectors = {}
+        for vector_id in ids:
+            row = self.row_of.get(vector_id)
+            if row is not None:
+                vectors[vector_id] = {
+                    'id': vector_id,
+                    'values': self.matrix[row].tolist(),
+                    'metadata': dict(self.metadata[row])
+                }
+        return vectors
+
+    def filter_mask(self, filter: Optional[Dict]) -> np.ndarray:
+        """필터에 맞는 행 마스크 (같은 필터는 쓰기 전까지 캐시)"""
+        size = len(self.ids)
+        if not filter:
+            return self.valid[:size]
+        key = json.dumps(filter, sort_keys=True, ensure_ascii=False)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = np.array([
+                metadata is not None and match_filter(metadata, filter)
+                for metadata in self.metadata
+            ], dtype=bool)
+            self._mask_cache[key] = mask
+        return mask
+
+    def query(self, vector: List[float], top_k: int, filter: Optional[Dict]) -> List[QueryMatch]:
+        size = len(self.ids)
+        if size == 0:
+            return []
+        mask = self.filter_mask(filter)
+        candidates = int(mask.sum())
+        if candidates == 0:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        scores = self.matrix[:size] @ query
+        scores = np.where(mask, scores, -np.inf)
+
+        k = min(top_k, candidates)
+        if k < size:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(size)
+        top = top[np.argsort(-scores[top])]
+        return [QueryMatch(self.ids[row], float(scores[row]), self.metadata[row]) for row in top if mask[row]]
+
+
+class LocalVectorStore(VectorStore):
+    """
+    로컬(in-process) 백엔드
+
+    네임스페이스마다 정규화된 float32 벡터를 memmap 행렬에 저장하고, 메타데이터는
+    SQLite 사이드카에 둔다. 검색은 NumPy 내적 + argpartition으로 코사인 top-k를 구한다.
+    """
+
+    def __init__(self, root: str = LOCAL_VECTOR_STORE_PATH, dimension: int = EMBEDDING_DIMENSION):
+        self.root = root
+        self.dimension = dimension
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(root, "metadata.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS vectors (
+                namespace TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                id TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                PRIMARY KEY (namespace, row)
+            )"""
+        )
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_vectors_id ON vectors(namespace, id)")
+        self._conn.commit()
+        self._namespaces = {}
+        print(f"로컬 벡터 저장소 사용: {root}")
+
+    def _namespace(self, name: str) -> _LocalNamespace:
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            namespace = _LocalNamespace(self.root, name, self.dimension, self._conn)
+            self._namespaces[name] = namespace
+        return namespace
+
+    def upsert(self, vectors, namespace=""):
+        if not vectors:
+            return
+        with self._lock:
+            self._namespace(namespace).upsert(vectors)
+
+    def query(self, vector, top_k=10, namespace="", filter=None, include_metadata=True):
+        with self._lock:
+            matches = self._namespace(namespace).query(vector, top_k, filter)
+        if not include_metadata:
+            for match in matches:
+                match.metadata = {}
+        return QueryResult(matches)
+
+    def delete(self, ids=None, delete_all=False, namespace="", filter=None):
+        with self._lock:
+            store = self._namespace(namespace)
+            if delete_all:
+                ids = list(store.row_of.keys())
+            elif filter:
+                mask = store.filter_mask(filter)
+                ids = [store.ids[row] for row in np.flatnonzero(mask)]
+            store.delete(ids or [])
+
+    def update(self, id, set_metadata, namespace=""):
+        with self._lock:
+            self._namespace(namespace).update(id, set_metadata)
+
+    def fetch(self, ids, namespace=""):
+        with self._lock:
+            return self._namespace(namespace).fetch(ids)
+
+    def list_ids(self, namespace="", page_size=100):
+        with self._lock:
+            ids = list(self._namespace(namespace).row_of.keys())
+        for start in range(0, len(ids), page_size):
+            yield ids[start:start + page_size]
+
+    def describe_index_stats(self):
+        with self._lock:
+            names = {row[0] for row in self._conn.execute("SELECT DISTINCT namespace FROM vectors")}
+            namespaces = {name: len(self._namespace(name).row_of) for name in names}
+        return IndexStats(sum(namespaces.values()), self.dimension, namespaces)
+
+
+def create_vector_store(backend: str = VECTOR_STORE_BACKEND) -> VectorStore:
+    """설정된 백엔드의 벡터 저장소 생성 ('pinecone' 또는 'local')"""
+    if backend == 'local':
+        return LocalVectorStore()
+    if backend == 'pinecone':
+        from config import PINECONE_API_KEY, PINECONE_INDEX_NAME
+        return PineconeVectorStore(PINECONE_API_KEY, PINECONE_INDEX_NAME)
+    raise ValueError(f"지원하지 않는 벡터 저장소 백엔드: {backend}")
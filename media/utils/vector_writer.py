@@ -0,0 +1,239 @@
+import json
+import time
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from .constants import (
+    VECTOR_WRITE_BATCH_SIZE,
+    VECTOR_WRITE_MAX_BYTES,
+    VECTOR_WRITE_WORKERS
+)
+
+
+def estimate_vector_bytes(vector: Dict) -> int:
+    """업서트 요청에서 벡터 하나가 차지하는 크기 추정 (값 하나당 JSON 약 12바이트)"""
+    metadata = vector.get('metadata') or {}
+    metadata_bytes = len(json.dumps(metadata, ensure_ascii=False, default=str).encode('utf-8'))
+    return len(vector['id']) + len(vector['values']) * 12 + metadata_bytes
+
+
+class _WriteTracker:
+    """track() 블록 하나가 버퍼에 넣은 벡터와 그중 업서트가 끝난 벡터 ID"""
+
+    def __init__(self):
+        self.written = []       # (벡터 ID, file_path)
+        self.pending = set()
+        self.upserted = set()
+
+
+class _FlushScope:
+    """스레드 하나가 마지막 flush() 이후 버퍼에 넣은 벡터의 업서트 작업과 실패 수"""
+
+    def __init__(self):
+        self.futures = set()
+        self.failed = 0
+
+
+class BulkVectorWriter:
+    """
+    네임스페이스별로 벡터를 모아 배치 단위로 업서트하는 쓰기 버퍼
+
+    벡터 수(batch_size) 또는 요청 크기(max_batch_bytes)에 도달하면 워커 스레드에서
+    병렬로 업서트하고, 작업이 끝날 때 flush()로 남은 벡터를 모두 기록한다.
+
+    버퍼는 여러 작업 스레드가 함께 쓰므로 실패는 벡터를 넣은 스레드별로 기록하고,
+    flush()는 호출한 스레드의 벡터가 든 배치만 기다려 그 결과만 돌려준다.
+    """
+
+    def __init__(self, vector_store, batch_size: int = VECTOR_WRITE_BATCH_SIZE,
+                 max_batch_bytes: int = VECTOR_WRITE_MAX_BYTES,
+                 max_workers: int = VECTOR_WRITE_WORKERS,
+                 on_flush: Optional[Callable[[str, List[Dict]], None]] = None):
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.on_flush = on_flush
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vector-writer")
+        self._lock = threading.RLock()
+        self._buffers = defaultdict(list)
+        self._buffer_bytes = defaultdict(int)
+        self._owners = defaultdict(set)    # namespace → 버퍼에 벡터를 넣은 스레드의 _FlushScope
+        self._pending = set()
+        self._trackers = []
+        self._local = threading.local()
+
+        # 통계
+        self.flush_count = 0
+        self.vector_count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+        atexit.register(self.close)
+
+    def add(self, vectors: List[Dict], namespace: str):
+        """벡터를 버퍼에 추가 (한도에 도달한 배치는 바로 업서트 시작)"""
+        with self._lock:
+            tracker = getattr(self._local, 'tracker', None)
+            if tracker is not None:
+                for vector in vectors:
+                    tracker.written.append((vector['id'], (vector.get('metadata') or {}).get('file_path')))
+                    tracker.pending.add(vector['id'])
+
+            scope = self._scope()
+            for vector in vectors:
+                size = estimate_vector_bytes(vector)
+                if self._buffers[namespace] and self._buffer_bytes[namespace] + size > self.max_batch_bytes:
+                    self._submit(namespace)
+
+                self._buffers[namespace].append(vector)
+                self._buffer_bytes[namespace] += size
+                self._owners[namespace].add(scope)
+
+                if len(self._buffers[namespace]) >= self.batch_size:
+                    self._submit(namespace)
+
+    @contextmanager
+    def track(self):
+        """
+        with 블록 안에서 현재 스레드가 추가한 벡터를 file_path별 ID 목록으로 모음 (수집 기록용)
+
+        업서트가 끝난 벡터만 모으며, 업서트에 실패했거나 아직 버퍼에 남은 벡터가 하나라도 있는
+        file_path는 통째로 빠진다. 블록 안에서 flush()까지 호출해야 한다.
+
+        Yields:
+            dict: file_path → 벡터 ID 목록 (블록이 끝날 때 채워짐)
+        """
+        tracker = _WriteTracker()
+        previous = getattr(self._local, 'tracker', None)
+        self._local.tracker = tracker
+        with self._lock:
+            self._trackers.append(tracker)
+
+        by_path = defaultdict(list)
+        try:
+            yield by_path
+        finally:
+            with self._lock:
+                self._trackers.remove(tracker)
+                if previous is not None:
+                    previous.written.extend(tracker.written)
+                    previous.pending.update(tracker.pending)
+                    previous.upserted.update(tracker.upserted)
+            self._local.tracker = previous
+
+            incomplete = {file_path for vector_id, file_path in tracker.written if vector_id not in tracker.upserted}
+            for vector_id, file_path in tracker.written:
+                if file_path not in incomplete:
+                    by_path[file_path].append(vector_id)
+            if incomplete:
+                logging.error(f"업서트되지 않은 벡터가 있는 파일 {len(incomplete)}개는 수집 기록에서 제외")
+
+    def flush(self, wait_for_completion: bool = True) -> bool:
+        """
+        버퍼에 남은 벡터를 모두 업서트
+
+        Returns:
+            bool: 현재 스레드가 마지막 flush 이후 넣은 벡터가 모두 업서트됐으면 True
+                  (다른 스레드의 실패는 영향을 주지 않음)
+        """
+        with self._lock:
+            for namespace in list(self._buffers.keys()):
+                if self._buffers[namespace]:
+                    self._submit(namespace)
+            scope = self._scope()
+            pending = list(scope.futures)
+
+        if not wait_for_completion:
+            return True
+
+        wait(pending)
+        with self._lock:
+            failed, scope.failed = scope.failed, 0
+        if failed:
+            logging.error(f"벡터 업서트 실패 배치 수: {failed}")
+        return failed == 0
+
+    def _scope(self) -> _FlushScope:
+        """현재 스레드의 flush 범위"""
+        scope = getattr(self._local, 'scope', None)
+        if scope is None:
+            scope = self._local.scope = _FlushScope()
+        return scope
+
+    def close(self):
+        """종료 시 남은 벡터를 현재 스레드에서 직접 기록"""
+        with self._lock:
+            batches = [(namespace, batch) for namespace, batch in self._buffers.items() if batch]
+            owners = {namespace: self._owners.pop(namespace, set()) for namespace, _ in batches}
+            self._buffers.clear()
+            self._buffer_bytes.clear()
+            pending = list(self._pending)
+
+        wait(pending)
+        for namespace, batch in batches:
+            self._write(namespace, batch, owners[namespace])
+        self._executor.shutdown(wait=True)
+
+    def _submit(self, namespace: str):
+        """현재 버퍼를 떼어 워커 스레드에 업서트 작업으로 제출 (lock 보유 상태에서 호출)"""
+        batch = self._buffers.pop(namespace)
+        self._buffer_bytes.pop(namespace, None)
+        owners = self._owners.pop(namespace, set())
+        future = self._executor.submit(self._write, namespace, batch, owners)
+        self._pending.add(future)
+        for scope in owners:
+            scope.futures.add(future)
+        future.add_done_callback(lambda done: self._discard(done, owners))
+
+    def _discard(self, future, owners=()):
+        """끝난 업서트 작업 정리 (실패 여부는 _write에서 스레드별로 이미 기록됨)"""
+        with self._lock:
+            self._pending.discard(future)
+            for scope in owners:
+                scope.futures.discard(future)
+
+    def _write(self, namespace: str, batch: List[Dict], owners=()):
+        """배치 업서트 (실패하면 배치에 벡터를 넣은 스레드들의 실패 수 증가)"""
+        start = time.perf_counter()
+        try:
+            self.vector_store.upsert(vectors=batch, namespace=namespace)
+        except Exception as e:
+            logging.error(f"벡터 배치 업서트 실패 ({len(batch)}개, namespace={namespace}): {str(e)}")
+            with self._lock:
+                for scope in owners:
+                    scope.failed += 1
+            return
+
+        latency = time.perf_counter() - start
+        with self._lock:
+            for tracker in self._trackers:
+                tracker.upserted.update(vector['id'] for vector in batch if vector['id'] in tracker.pending)
+            self.flush_count += 1
+            self.vector_count += len(batch)
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+        if self.on_flush:
+            try:
+                self.on_flush(namespace, batch)
+            except Exception as e:
+                logging.error(f"업서트 후처리 실패: {str(e)}")
+
+    def stats(self) -> Dict:
+        """업서트 지연 시간 및 배치 크기 통계"""
+        with self._lock:
+            return {
+                'flushes': self.flush_count,
+                'vectors': self.vector_count,
+                'avg_batch_size': self.vector_count / self.flush_count if self.flush_count else 0.0,
+                'avg_latency_ms': self.total_latency / self.flush_count * 1000 if self.flush_count else 0.0,
+                'max_latency_ms': self.max_latency * 1000,
+                'buffered': sum(len(batch) for batch in self._buffers.values()),
+                'in_flight': len(self._pending)
+            }
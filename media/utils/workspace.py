@@ -0,0 +1,120 @@
+import os
+import re
+import shutil
+import logging
+import tempfile
+from typing import Optional
+
+from .constants import (
+    WORKSPACE_ROOT,
+    WORKSPACE_QUOTA_BYTES,
+    WORKSPACE_TMPFS_RESERVE
+)
+
+_PREFIX = "media-job-"
+_TMPFS_PATH = "/dev/shm"
+
+
+class WorkspaceQuotaExceeded(Exception):
+    """작업 공간 할당량 초과"""
+
+
+def workspace_root(quota_bytes: int = WORKSPACE_QUOTA_BYTES) -> str:
+    """
+    작업 공간을 만들 상위 디렉토리
+
+    WORKSPACE_ROOT가 지정되면 그대로 쓰고, 아니면 여유 공간이 충분한 tmpfs(/dev/shm)를,
+    그것도 안 되면 시스템 임시 디렉토리를 쓴다.
+    """
+    if WORKSPACE_ROOT:
+        os.makedirs(WORKSPACE_ROOT, exist_ok=True)
+        return WORKSPACE_ROOT
+    if os.path.isdir(_TMPFS_PATH) and os.access(_TMPFS_PATH, os.W_OK):
+        try:
+            if shutil.disk_usage(_TMPFS_PATH).free >= quota_bytes * WORKSPACE_TMPFS_RESERVE:
+                return _TMPFS_PATH
+        except OSError:
+            pass
+    return tempfile.gettempdir()
+
+
+class JobWorkspace:
+    """
+    작업 하나가 쓰는 격리된 임시 디렉토리
+
+    작업마다 고유한 디렉토리를 만들어 다운로드/추출 파일 이름이 다른 작업과 겹치지 않게 하고,
+    with 블록을 벗어나면 성공/실패와 관계없이 디렉토리 전체를 삭제한다.
+    """
+
+    def __init__(self, name: str = "job", quota_bytes: int = WORKSPACE_QUOTA_BYTES, root: Optional[str] = None):
+        self.quota_bytes = quota_bytes
+        safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', name)[:32]
+        self.path = tempfile.mkdtemp(
+            prefix=f"{_PREFIX}{os.getpid()}-{safe_name}-",
+            dir=root or workspace_root(quota_bytes)
+        )
+        logging.info(f"작업 공간 생성: {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+    def file(self, name: str) -> str:
+        """작업 공간 안의 파일 경로 (경로 구분자는 제거한 파일 이름만 사용)"""
+        base_name = os.path.basename(name or '') or 'file'
+        return os.path.join(self.path, base_name)
+
+    def used_bytes(self) -> int:
+        total = 0
+        for root, _, files in os.walk(self.path):
+            for file in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, file))
+                except OSError:
+                    pass
+        return total
+
+    def remaining_bytes(self) -> int:
+        return max(0, self.quota_bytes - self.used_bytes())
+
+    def check_quota(self):
+        used = self.used_bytes()
+        if used > self.quota_bytes:
+            raise WorkspaceQuotaExceeded(f"작업 공간 할당량 초과: {used} > {self.quota_bytes} bytes")
+
+    def cleanup(self):
+        if self.path and os.path.exists(self.path):
+            shutil.rmtree(self.path, ignore_errors=True)
+            logging.info(f"작업 공간 삭제: {self.path}")
+
+
+def cleanup_stale_workspaces(root: Optional[str] = None) -> int:
+    """종료된 프로세스가 남긴 작업 공간 삭제 (서버 시작 시 호출)"""
+    roots = [root] if root else list(dict.fromkeys([workspace_root(), _TMPFS_PATH, tempfile.gettempdir()]))
+    removed = 0
+    for directory in roots:
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.listdir(directory):
+            match = re.match(rf'{_PREFIX}(\d+)-', entry)
+            if not match or _process_alive(int(match.group(1))):
+                continue
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+            removed += 1
+    if removed:
+        logging.info(f"남아 있던 작업 공간 {removed}개 삭제")
+    return removed
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -1,24 +1,13 @@
-from pinecone import Pinecone
-from langchain_openai import OpenAIEmbeddings
-from config import (
-    OPENAI_API_KEY,
-    PINECONE_API_KEY,
-    PINECONE_ENVIRONMENT,
-    PINECONE_INDEX_NAME,
-    PINECONE_NAMESPACE
-)
+from config import PINECONE_NAMESPACE
 import logging
 from datetime import datetime
 
 class MediaSearcher:
     def __init__(self, base_manager):
         self.base_manager = base_manager
-        self.pc = Pinecone(api_key=PINECONE_API_KEY, environment=PINECONE_ENVIRONMENT)
-        self.index = self.pc.Index(PINECONE_INDEX_NAME)
-        self.embeddings = OpenAIEmbeddings(api_key=OPENAI_API_KEY, model="text-embedding-3-small")
+        self.vector_store = base_manager.vector_store
 
     def search_media(self, query: str, top_k: int = 10):
-        vector = self.embeddings.embed_query(query)
         """미디어 검색"""
         try:
             # 쿼리에서 타입 필터 확인 및 검색어 정제
@@ -32,8 +21,10 @@ class MediaSearcher:
                 media_type = "video"
                 search_query = query.replace("영상", "").replace("비디오", "").replace("동영상", "").strip()
 
-            # 정제된 쿼리로 벡터 검색
-            vector = self.embeddings.embed_query(search_query)
+            # 정제된 쿼리로 벡터 검색 (BaseManager 임베딩 캐시 사용)
+            vector = self.base_manager.create_embedding(search_query)
+            if not vector:
+                return None
             
             # 타입 필터 적용
             filter_dict = {}  
@@ -45,54 +36,31 @@ class MediaSearcher:
                 filter_dict = {"type": "audio"}
 
             
-            results = self.index.query(
-                vector=vector,
+            # 벡터 검색 + 태그/캡션/OCR 어휘 검색을 RRF로 합친 결과 (태그 일치 항목도 함께 반환)
+            matches = self.base_manager.search_vectors(
+                search_query,
+                vector,
                 top_k=top_k,
-                include_metadata=True,
-                filter=filter_dict,  
+                filter=filter_dict or None,
                 namespace=PINECONE_NAMESPACE
             )
 
-                # 유사도 임계값 설정
-            SIMILARITY_THRESHOLD = 0.0
-
-            if results.matches:
-                unique_results = {}
-                
-                for match in results.matches:
-                    file_path = match.metadata.get('file_path')
-                    
-                    # 유사도가 낮은 경우 태그 매칭 확인
-                    if match.score < SIMILARITY_THRESHOLD:
-                        tags = match.metadata.get('tags', [])
-                        query_words = search_query.lower().split()
-                        
-                        # 쿼리의 단어가 태그에 있는지 확인
-                        if any(any(query_word in tag.lower() for query_word in query_words) for tag in tags):
-                            if file_path not in unique_results or match.score > unique_results[file_path].score:
-                                unique_results[file_path] = match
-                    else:
-                        # 유사도가 높은 경우 그대로 저장
-                        if file_path not in unique_results or match.score > unique_results[file_path].score:
-                            unique_results[file_path] = match
-
-                # 유사도 기준 정렬
-                sorted_matches = sorted(unique_results.values(), key=lambda x: x.score, reverse=True)[:3]
-                
+            if matches:
                 # 결과 포맷팅
                 formatted_results = []
-                for match in results.matches:
-                    print(f"검색 결과: {match.metadata}")
+                metadatas = self.base_manager.localize_metadata([match.metadata or {} for match in matches])
+                for match, metadata in zip(matches, metadatas):
+                    print(f"검색 결과: {metadata}")
                     formatted_results.append({
-                        "id": str(hash(match.metadata.get('file_path', ''))),
+                        "id": str(hash(metadata.get('file_path', ''))),
                         "score": float(match.score),
                         "metadata": {
-                            "type": match.metadata.get("type", "unknown"),
-                            "file_path": match.metadata.get("file_path"), 
-                            "summary": match.metadata.get("summary", ""), 
-                            "caption": match.metadata.get("caption"),
-                            "tags": match.metadata.get("tags", []),
-                            "timestamp": match.metadata.get("timestamp", datetime.now().isoformat()),
+                            "type": metadata.get("type", "unknown"),
+                            "file_path": metadata.get("file_path"), 
+                            "summary": metadata.get("summary", ""), 
+                            "caption": metadata.get("caption"),
+                            "tags": metadata.get("tags", []),
+                            "timestamp": metadata.get("timestamp", datetime.now().isoformat()),
                         }
                     })
                 return formatted_results
@@ -0,0 +1,23 @@
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# media/__init__.py와 media/processors/__init__.py는 모델/클라우드 클라이언트(torch, google-cloud-vision 등)를
+# 모두 불러오므로, 단위 테스트는 패키지 초기화 없이 필요한 하위 모듈만 불러온다
+for name, path in (('media', 'media'), ('media.processors', os.path.join('media', 'processors'))):
+    if name not in sys.modules:
+        package = types.ModuleType(name)
+        package.__path__ = [os.path.join(ROOT, path)]
+        sys.modules[name] = package
+
+# config.py(API 키 등)는 저장소에 포함되지 않으므로 없으면 테스트용 값 사용
+try:
+    import config  # noqa: F401
+except ImportError:
+    config = types.ModuleType('config')
+    config.OPENAI_API_KEY = 'test'
+    config.PINECONE_NAMESPACE = 'test'
+    sys.modules['config'] = config
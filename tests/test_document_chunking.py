@@ -0,0 +1,111 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from media.processors import document_processor
+from media.processors.document_processor import DocumentProcessor
+from media.utils.text_utils import iter_text_chunks
+
+PAGES = 9
+WORDS_PER_PAGE = 60
+
+
+def write_pdf(path, page_count=PAGES, words_per_page=WORDS_PER_PAGE):
+    """페이지마다 'p<페이지>w<번호>' 단어가 적힌 최소 PDF 생성"""
+    font_id = 3 + 2 * page_count
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(page_count))}] /Count {page_count} >>",
+    ]
+    for page in range(page_count):
+        words = ' '.join(f"p{page + 1}w{j}" for j in range(words_per_page))
+        stream = f"BT /F1 8 Tf 20 700 Td ({words}) Tj ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * page} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    body = "%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    body += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    path.write_text(body, encoding='latin-1')
+    return str(path)
+
+
+def word_pages(text):
+    return [int(page) for page in re.findall(r'p(\d+)w\d+', text)]
+
+
+def test_page_chunks_match_full_text_chunks(tmp_path):
+    path = write_pdf(tmp_path / "doc.pdf")
+    processor = DocumentProcessor(None)
+
+    pages = list(processor.iter_pdf_file_pages(path, workers=1))
+    with open(path, 'rb') as file_obj:
+        full_text = processor.extract_pdf_content(file_obj)['content']
+
+    page_chunks = list(iter_text_chunks(pages, 300, 60))
+    full_chunks = list(iter_text_chunks([(None, full_text)], 300, 60))
+
+    assert [page for page, _ in pages] == list(range(1, PAGES + 1))
+    assert len(page_chunks) > PAGES    # 청크가 페이지 경계를 넘나듦
+    assert [chunk['text'] for chunk in page_chunks] == [chunk['text'] for chunk in full_chunks]
+    assert [chunk['chunk_index'] for chunk in page_chunks] == [chunk['chunk_index'] for chunk in full_chunks]
+
+    # 청크의 시작/끝 페이지는 청크 첫/마지막 단어가 있던 페이지
+    for chunk in page_chunks:
+        numbers = word_pages(chunk['text'])
+        assert (chunk['page_start'], chunk['page_end']) == (numbers[0], numbers[-1])
+    assert any(chunk['page_start'] != chunk['page_end'] for chunk in page_chunks)
+
+
+def test_parallel_page_ranges_match_sequential_pages(tmp_path, monkeypatch):
+    path = write_pdf(tmp_path / "doc.pdf")
+    processor = DocumentProcessor(None)
+    monkeypatch.setattr(document_processor, 'PDF_PARALLEL_PAGE_THRESHOLD', 2)
+    monkeypatch.setattr(document_processor, 'PDF_PAGE_RANGE_SIZE', 4)
+
+    sequential = list(processor.iter_pdf_file_pages(path, workers=1))
+    # 구간 추출 순서/결합만 확인하므로 프로세스 대신 스레드 풀 사용 (제한 시간 없음)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        parallel = list(processor.iter_pdf_file_pages(path, workers=2, timeout=0, pool=pool))
+
+    assert parallel == sequential
+    assert list(iter_text_chunks(parallel, 300, 60)) == list(iter_text_chunks(sequential, 300, 60))
+
+class RecordingManager:
+    """문서 임베딩 저장 요청만 기록하는 BaseManager 대역"""
+
+    def __init__(self):
+        self.documents = {}
+
+    def create_document_embedding(self, file_path, extracted):
+        self.documents[file_path] = extracted['content']
+        return True
+
+
+def test_process_files_reuses_one_extract_pool(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"note{i}.txt"
+        path.write_text(f"note {i}", encoding='utf-8')
+        paths.append(str(path))
+    manager = RecordingManager()
+    processor = DocumentProcessor(manager, workers=1)
+    try:
+        first = list(processor.process_files(paths[:2]))
+        pool = processor._pool
+        second = list(processor.process_files(paths[2:]))
+
+        # 호출마다 새 풀을 띄우지 않고 같은 spawn 워커를 재사용
+        assert pool is not None and processor._pool is pool
+        assert sorted(result['file_path'] for result in first + second) == paths
+        assert manager.documents[paths[2]] == "note 2"
+    finally:
+        processor.close()
+    assert processor._pool is None
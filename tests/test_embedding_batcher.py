@@ -0,0 +1,74 @@
+import threading
+
+from media.utils.embedding_batcher import EmbeddingBatcher
+
+
+class ApiError(Exception):
+    """상태 코드를 가진 API 오류"""
+
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class FakeEmbedder:
+    """호출 기록을 남기고 지정한 오류를 던지는 임베딩 함수"""
+
+    def __init__(self, error=None, bad_texts=()):
+        self.error = error
+        self.bad_texts = set(bad_texts)
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        if self.bad_texts.intersection(texts):
+            raise ApiError(400)
+        return [[float(len(text))] for text in texts]
+
+
+def test_rate_limit_fails_whole_batch_without_per_item_retries():
+    embedder = FakeEmbedder(error=ApiError(429))
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=50)
+
+    assert batcher.embed_many(['a', 'bb', 'ccc']) == [None, None, None]
+    assert len(embedder.calls) == 1
+
+
+def test_connection_error_fails_whole_batch():
+    embedder = FakeEmbedder(error=ConnectionError("reset"))
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=50)
+
+    assert batcher.embed_many(['a', 'bb']) == [None, None]
+    assert len(embedder.calls) == 1
+
+
+def test_input_error_only_fails_the_bad_text():
+    embedder = FakeEmbedder(bad_texts={'bad'})
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=50)
+
+    assert batcher.embed_many(['a', 'bad', 'ccc']) == [[1.0], None, [3.0]]
+
+
+def test_priority_request_does_not_wait_behind_bulk_batch():
+    release = threading.Event()
+    bulk_started = threading.Event()
+
+    def embed(texts):
+        if 'query' not in texts:
+            bulk_started.set()
+            release.wait(5)
+        return [[1.0] for _ in texts]
+
+    batcher = EmbeddingBatcher(embed, max_wait_ms=1)
+    try:
+        bulk = [batcher.submit(f"chunk {i}") for i in range(3)]
+        assert bulk_started.wait(5)
+
+        # 수집 배치가 끝나지 않았어도 검색어는 바로 처리됨
+        assert batcher.submit('query', priority=True).result(timeout=2) == [1.0]
+        assert not any(future.done() for future in bulk)
+    finally:
+        release.set()
+    assert all(future.result(timeout=5) == [1.0] for future in bulk)
@@ -0,0 +1,126 @@
+import os
+import time
+import threading
+
+import pytest
+
+from media.utils.file_watcher import FileWatcher
+
+
+class Recorder:
+    """콜백 호출을 순서대로 기록 (on_changed는 fail_times만큼 실패 경로를 돌려줌)"""
+
+    def __init__(self, fail_times=0):
+        self.calls = []
+        self.fail_times = fail_times
+        self.lock = threading.Lock()
+
+    def changed(self, paths):
+        with self.lock:
+            self.calls.append(('changed', sorted(paths)))
+            if self.fail_times:
+                self.fail_times -= 1
+                return paths
+        return []
+
+    def deleted(self, paths):
+        with self.lock:
+            self.calls.append(('deleted', sorted(paths)))
+
+    def events(self, kind):
+        with self.lock:
+            return [paths for call_kind, paths in self.calls if call_kind == kind]
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def make_watcher(tmp_path):
+    watchers = []
+
+    def factory(recorder, **options):
+        settings = dict(debounce_sec=0.2, stable_sec=0.2, poll_interval=0.05, use_polling=True,
+                        retry_sec=0.2, max_retries=2)
+        settings.update(options)
+        watcher = FileWatcher([str(tmp_path)], on_changed=recorder.changed, on_deleted=recorder.deleted,
+                              **settings)
+        watcher.start(initial_scan=False)
+        watchers.append(watcher)
+        return watcher
+
+    yield factory
+    for watcher in watchers:
+        watcher.stop()
+
+
+def test_rapid_writes_are_debounced_into_one_change(tmp_path, make_watcher):
+    recorder = Recorder()
+    make_watcher(recorder)
+    path = tmp_path / "clip.mp4"
+
+    for i in range(5):
+        with open(path, 'ab') as f:
+            f.write(b"x" * 1024)
+        time.sleep(0.06)
+
+    assert wait_for(lambda: recorder.events('changed'))
+    time.sleep(0.8)
+    assert recorder.events('changed') == [[str(path)]]
+
+
+def test_deleted_file_is_reported(tmp_path, make_watcher):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(b"image")
+    recorder = Recorder()
+    make_watcher(recorder)
+
+    path.unlink()
+
+    assert wait_for(lambda: recorder.events('deleted'))
+    assert recorder.events('deleted') == [[str(path)]]
+    assert recorder.events('changed') == []
+
+
+def test_move_reports_new_path_before_old_path_is_deleted(tmp_path, make_watcher):
+    source = tmp_path / "report.pdf"
+    source.write_bytes(b"%PDF")
+    target_dir = tmp_path / "archive"
+    target_dir.mkdir()
+    recorder = Recorder()
+    make_watcher(recorder)
+
+    target = target_dir / "report.pdf"
+    os.rename(source, target)
+
+    assert wait_for(lambda: recorder.events('deleted'))
+    assert recorder.calls[0] == ('changed', [str(target)])
+    assert recorder.calls[1] == ('deleted', [str(source)])
+
+
+def test_failed_file_is_retried_until_it_succeeds(tmp_path, make_watcher):
+    recorder = Recorder(fail_times=1)
+    make_watcher(recorder)
+    path = tmp_path / "voice.mp3"
+    path.write_bytes(b"audio")
+
+    assert wait_for(lambda: len(recorder.events('changed')) == 2)
+    time.sleep(0.8)
+    assert recorder.events('changed') == [[str(path)], [str(path)]]
+
+
+def test_retries_stop_after_max_retries(tmp_path, make_watcher):
+    recorder = Recorder(fail_times=10)
+    make_watcher(recorder, max_retries=2)
+    path = tmp_path / "broken.docx"
+    path.write_bytes(b"docx")
+
+    assert wait_for(lambda: len(recorder.events('changed')) == 3)
+    time.sleep(1.0)
+    assert len(recorder.events('changed')) == 3
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+import pytest
+
+from media.utils import frame_sampler
+from media.utils.frame_sampler import FrameSampler
+
+FPS = 10
+FRAMES = 100
+
+
+def write_video(path, frame_count=FRAMES, fps=FPS):
+    """프레임 번호를 밝기로 새긴 MJPG 비디오 생성"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, (32, 32))
+    if not writer.isOpened():
+        pytest.skip("MJPG 인코더 없음")
+    for index in range(frame_count):
+        writer.write(np.full((32, 32, 3), index * 2, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def matches_index(frame, index):
+    """JPEG 압축 오차를 감안해 프레임 밝기가 프레임 번호와 맞는지"""
+    return abs(frame.mean() / 2 - index) < 1
+
+
+def test_dense_probes_grab_sequentially_without_seeking(tmp_path):
+    path = write_video(tmp_path / "clip.avi")
+
+    with FrameSampler(path) as sampler:
+        frames = list(sampler.frames_every(2.0))
+
+    assert [index for index, _, _ in frames] == list(range(0, FRAMES, 20))
+    assert all(matches_index(frame, index) for index, _, frame in frames)
+    assert sampler.seeks == 0
+    assert sampler.decoded_frames == 81    # 마지막 목표(80)까지 grab()한 프레임 수
+
+
+def test_sparse_targets_seek(tmp_path, monkeypatch):
+    path = write_video(tmp_path / "clip.avi")
+    monkeypatch.setattr(frame_sampler, 'VIDEO_SEEK_MIN_GAP_SEC', 1.0)
+
+    with FrameSampler(path) as sampler:
+        frames = list(sampler.frames_at([0, 5, 50, 90]))
+
+    assert [index for index, _, _ in frames] == [0, 5, 50, 90]
+    if sampler.mode == 'seek':
+        # 가까운 목표(0, 5)는 grab(), 먼 목표만 seek
+        assert sampler.seeks == 2
+        assert all(matches_index(frame, index) for index, _, frame in frames)
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from job_manager import JobManager, JobQueueFullError
+
+
+def wait_finished(manager, job):
+    manager.shutdown()
+    return job.to_dict()
+
+
+def test_job_reports_processor_stages_and_result():
+    def runner(job):
+        for stage in ('download', 'inference', 'embedding', 'storing'):
+            job.update_stage(stage, 0.0)
+            job.update_stage(stage, 1.0)
+        return {'ok': True}
+
+    manager = JobManager(runner, concurrency={'image': 1})
+    job, created = manager.submit('http://example.com/a.jpg', 'image', 'a.jpg')
+    data = wait_finished(manager, job)
+
+    assert created
+    assert data['state'] == 'completed'
+    assert data['result'] == {'ok': True}
+    assert list(data['stages']) == ['download', 'inference', 'embedding', 'storing']
+    assert data['started_at'] and data['finished_at']
+
+
+def test_failed_job_records_error_and_finish_time():
+    def runner(job):
+        job.update_stage('download', 1.0)
+        raise RuntimeError("boom")
+
+    manager = JobManager(runner, concurrency={'image': 1})
+    job, _ = manager.submit('http://example.com/b.jpg', 'image', 'b.jpg')
+    data = wait_finished(manager, job)
+
+    assert data['state'] == 'failed'
+    assert data['error'] == 'boom'
+    assert data['finished_at'] is not None
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def blocking_runner(release):
+    """release가 설정될 때까지 작업을 붙잡아 두는 runner"""
+    def runner(job):
+        release.wait(5)
+        return {'url': job.file_url}
+    return runner
+
+
+def test_same_url_and_type_returns_the_active_job():
+    release = threading.Event()
+    manager = JobManager(blocking_runner(release), concurrency={'image': 1, 'document': 1})
+    try:
+        job, created = manager.submit('http://example.com/a.pdf', 'pdf', 'a.pdf')
+        retry, retry_created = manager.submit('http://example.com/a.pdf', 'pdf', 'a.pdf')
+        # 같은 URL이라도 타입이 다르면 별도 작업
+        other_type, other_created = manager.submit('http://example.com/a.pdf', 'image', 'a.pdf')
+    finally:
+        release.set()
+
+    assert created and not retry_created and other_created
+    assert retry is job and other_type is not job
+    assert wait_finished(manager, job)['state'] == 'completed'
+    assert len(manager.list()) == 2
+
+
+def test_queue_depth_rejects_new_jobs_until_one_finishes():
+    release = threading.Event()
+    manager = JobManager(blocking_runner(release), max_queue_depth=2, concurrency={'image': 1})
+    try:
+        first, _ = manager.submit('http://example.com/1.jpg', 'image', '1.jpg')
+        manager.submit('http://example.com/2.jpg', 'image', '2.jpg')
+        with pytest.raises(JobQueueFullError):
+            manager.submit('http://example.com/3.jpg', 'image', '3.jpg')
+
+        # 진행 중인 작업의 재요청은 대기열이 가득 차도 기존 작업을 돌려줌
+        assert manager.submit('http://example.com/1.jpg', 'image', '1.jpg') == (first, False)
+        release.set()
+        assert wait_until(lambda: len(manager._active) < 2)    # 끝난 작업이 대기열에서 빠질 때까지
+        # 작업이 끝나 자리가 나면 다시 받음
+        third, created = manager.submit('http://example.com/3.jpg', 'image', '3.jpg')
+        assert created
+    finally:
+        release.set()
+    assert wait_finished(manager, third)['state'] == 'completed'
+    assert [job.state for job in manager.list()] == ['completed'] * 3
+
+
+def test_media_types_run_on_separate_pools():
+    release = threading.Event()
+    started = threading.Event()
+
+    def runner(job):
+        if job.file_type == 'video':
+            release.wait(5)    # 영상 풀을 계속 점유
+        else:
+            started.set()
+        return {}
+
+    manager = JobManager(runner, concurrency={'video': 1, 'image': 1})
+    try:
+        video, _ = manager.submit('http://example.com/v.mp4', 'video', 'v.mp4')
+        queued_video, _ = manager.submit('http://example.com/w.mp4', 'video', 'w.mp4')
+        image, _ = manager.submit('http://example.com/i.jpg', 'image', 'i.jpg')
+
+        # 영상 풀이 막혀 있어도 이미지 작업은 바로 실행됨
+        assert started.wait(5)
+        assert queued_video.state == 'queued'
+    finally:
+        release.set()
+    assert wait_finished(manager, image)['state'] == 'completed'
+    assert video.state == 'completed' and queued_video.state == 'completed'
+
+    with pytest.raises(ValueError):
+        manager.submit('http://example.com/a.mp3', 'audio', 'a.mp3')
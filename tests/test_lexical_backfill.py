@@ -0,0 +1,69 @@
+import threading
+
+from base_manager import BaseManager
+from media.utils.vector_store import LocalVectorStore
+from media.utils.lexical_index import LexicalIndex
+
+
+def make_manager(tmp_path):
+    """모델/API 클라이언트 없이 저장소 관련 속성만 갖춘 BaseManager"""
+    manager = BaseManager.__new__(BaseManager)
+    manager.vector_store = LocalVectorStore(root=str(tmp_path / "vectors"), dimension=4)
+    manager.lexical_index = LexicalIndex(db_path=None)
+    manager.bump_generation = lambda namespace='': None
+    manager.lexical_backfill = {'state': 'idle', 'indexed': 0, 'error': None}
+    manager._lexical_lock = threading.Lock()
+    return manager
+
+
+def caption_vector(vector_id, caption):
+    return {
+        'id': vector_id,
+        'values': [1.0, 0.0, 0.0, 0.0],
+        'metadata': {'file_path': f"/photos/{vector_id}.jpg", 'type': 'image', 'caption': caption}
+    }
+
+
+def test_backfill_indexes_vectors_stored_before_the_lexical_index(tmp_path):
+    manager = make_manager(tmp_path)
+    # 어휘 색인을 거치지 않고 저장된 기존 데이터
+    manager.vector_store.upsert([
+        caption_vector('old1', '바닷가에서 노는 강아지'),
+        caption_vector('old2', '눈 덮인 산'),
+    ], namespace='test')
+    manager.lexical_index.add_vectors('test', [caption_vector('new1', '도시의 야경')])
+
+    assert manager.lexical_index.search('test', '강아지') == []
+    assert manager.backfill_lexical_index('test') == 2
+    assert manager.lexical_backfill == {'state': 'done', 'indexed': 2, 'error': None}
+
+    hits = manager.lexical_index.search('test', '강아지')
+    assert [doc_id for doc_id, _, _ in hits] == ['old1']
+
+
+def test_backfill_skips_vectors_already_indexed(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.vector_store.upsert([caption_vector('a', '고양이'), caption_vector('b', '자전거')], namespace='test')
+
+    assert manager.backfill_lexical_index('test') == 2
+    assert manager.backfill_lexical_index('test') == 0
+
+
+def test_backfill_failure_returns_none(tmp_path):
+    manager = make_manager(tmp_path)
+
+    def broken_list_ids(namespace='', page_size=100):
+        raise RuntimeError("list failed")
+        yield
+
+    manager.vector_store.list_ids = broken_list_ids
+    assert manager.backfill_lexical_index('test') is None
+    assert manager.lexical_backfill['state'] == 'failed'
+
+def test_has_lexical_match_uses_min_score(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.lexical_index.add_vectors('test', [caption_vector('dog', '바닷가에서 노는 강아지')])
+
+    assert manager.has_lexical_match('강아지', 'test', min_score=0.0)
+    assert not manager.has_lexical_match('강아지', 'test', min_score=1e6)
+    assert not manager.has_lexical_match('고양이', 'test', min_score=0.0)
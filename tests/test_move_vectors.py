@@ -0,0 +1,91 @@
+import os
+import threading
+
+from base_manager import BaseManager
+from media.utils.vector_store import LocalVectorStore
+from media.utils.vector_writer import BulkVectorWriter
+from media.utils.lexical_index import LexicalIndex
+from media.utils.ingest_ledger import IngestLedger
+
+DIMENSION = 4
+
+
+def make_manager(tmp_path):
+    """모델/API 클라이언트 없이 저장소 관련 속성만 갖춘 BaseManager"""
+    manager = BaseManager.__new__(BaseManager)
+    manager.vector_store = LocalVectorStore(root=str(tmp_path / "vectors"), dimension=DIMENSION)
+    manager.lexical_index = LexicalIndex(db_path=None)
+    manager.vector_writer = BulkVectorWriter(manager.vector_store, max_workers=1)
+    manager.bump_generation = lambda namespace='': None
+    manager.lexical_backfill = {'state': 'idle', 'indexed': 0, 'error': None}
+    manager._lexical_lock = threading.Lock()
+    return manager
+
+
+def image_vector(manager, file_path, value):
+    return {
+        'id': manager.create_safe_id(file_path, 'image'),
+        'values': [value, 1.0, 0.0, 0.0],
+        'metadata': {'file_path': file_path, 'type': 'image', 'caption': os.path.basename(file_path)}
+    }
+
+
+def test_move_rekeys_vectors_so_old_path_can_be_reused(tmp_path):
+    manager = make_manager(tmp_path)
+    old_path, new_path = "/photos/a.jpg", "/photos/renamed/a.jpg"
+    moved = image_vector(manager, old_path, 0.5)
+    manager.vector_store.upsert([moved], namespace='test')
+
+    new_ids = manager.move_vectors([moved['id']], old_path, new_path, namespace='test')
+
+    assert new_ids == [manager.create_safe_id(new_path, 'image')]
+    stored = manager.vector_store.fetch(new_ids + [moved['id']], namespace='test')
+    assert list(stored) == new_ids
+    assert stored[new_ids[0]]['metadata']['file_path'] == new_path
+
+    # 예전 경로에 새 파일이 생겨도 옮긴 벡터를 덮어쓰지 않음
+    manager.vector_store.upsert([image_vector(manager, old_path, -0.5)], namespace='test')
+    stored = manager.vector_store.fetch(new_ids, namespace='test')
+    assert stored[new_ids[0]]['metadata']['file_path'] == new_path
+    manager.vector_writer.close()
+
+
+def test_move_rekeys_legacy_document_chunk_ids(tmp_path):
+    manager = make_manager(tmp_path)
+    old_path, new_path = "/docs/보고서.pdf", "/docs/archive/보고서.pdf"
+    vectors = [{
+        'id': f"{old_path}_{i}",
+        'values': [1.0, float(i), 0.0, 0.0],
+        'metadata': {'file_path': old_path, 'type': 'document', 'chunk_index': i, 'chunk_text': f"chunk {i}"}
+    } for i in range(3)]
+    manager.vector_store.upsert(vectors, namespace='test')
+
+    new_ids = manager.move_vectors([vector['id'] for vector in vectors], old_path, new_path, namespace='test')
+
+    prefix = manager.create_safe_id(new_path, 'document')
+    assert new_ids == [f"{prefix}_{i}" for i in range(3)]
+    assert all(vector_id.isascii() for vector_id in new_ids)
+    assert manager.vector_store.describe_index_stats().total_vector_count == 3
+    manager.vector_writer.close()
+
+
+def test_move_fails_when_vectors_are_missing(tmp_path):
+    manager = make_manager(tmp_path)
+    missing_id = manager.create_safe_id("/photos/gone.jpg", 'image')
+
+    assert manager.move_vectors([missing_id], "/photos/gone.jpg", "/photos/new.jpg", namespace='test') is None
+    manager.vector_writer.close()
+
+
+def test_ledger_move_stores_new_vector_ids(tmp_path):
+    ledger = IngestLedger(db_path=str(tmp_path / "ledger.sqlite3"), version="test")
+    source = tmp_path / "a.jpg"
+    source.write_bytes(b"image")
+    ledger.record(str(source), os.stat(source), "hash", 'image', ["old_image"])
+
+    target = tmp_path / "b.jpg"
+    source.rename(target)
+    ledger.move(str(source), str(target), os.stat(target), ["new_image"])
+
+    assert ledger.get(str(source)) is None
+    assert ledger.get(str(target))['vector_ids'] == ["new_image"]
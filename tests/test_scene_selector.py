@@ -0,0 +1,55 @@
+import numpy as np
+
+from media.utils.scene_selector import SceneSelector
+
+
+def solid(level):
+    return np.full((36, 64, 3), level, dtype=np.uint8)
+
+
+def probes(levels, interval=2.0):
+    return [(index, index * interval, solid(level)) for index, level in enumerate(levels)]
+
+
+def selected_indices(selector, levels, interval=2.0):
+    return [frame_index for frame_index, _, _ in selector.select(probes(levels, interval))]
+
+
+def test_cut_inside_min_gap_is_emitted_once_budget_allows():
+    # 분당 최대 6개 → 최소 간격 10초, 2초 간격 샘플
+    selector = SceneSelector(min_per_minute=1, max_per_minute=6)
+    # 0초 어두운 장면 → 4초에 밝은 장면으로 전환 (최소 간격 안) → 이후 계속 밝은 장면
+    levels = [0, 0, 250, 250, 250, 250, 250, 250]
+
+    selected = selected_indices(selector, levels)
+
+    # 4초의 전환 프레임은 버려지지 않고 10초 샘플에서 내보내짐
+    assert selected == [0, 2]
+    assert selector.stats()['scene_cuts'] == 1
+
+
+def test_pending_cut_is_emitted_at_end_of_stream():
+    selector = SceneSelector(min_per_minute=1, max_per_minute=6)
+    levels = [0, 0, 250]
+
+    assert selected_indices(selector, levels) == [0, 2]
+
+
+def test_latest_cut_replaces_pending_cut_within_budget():
+    selector = SceneSelector(min_per_minute=1, max_per_minute=6)
+    # 2초, 4초에 연달아 전환 → 최근 장면(4초)만 보류했다가 내보냄
+    levels = [0, 250, 0, 0, 0, 0, 0]
+
+    assert selected_indices(selector, levels) == [0, 2]
+    assert selector.stats()['scene_cuts'] == 2
+
+
+def test_cuts_respect_max_budget():
+    selector = SceneSelector(min_per_minute=1, max_per_minute=6)
+    # 2초마다 전환되는 1분 영상
+    levels = [0 if index % 2 == 0 else 250 for index in range(30)]
+
+    selected = list(selector.select(probes(levels)))
+
+    assert len(selected) <= 6 + 1
+    assert [timestamp for _, timestamp, _ in selected] == sorted(timestamp for _, timestamp, _ in selected)
@@ -0,0 +1,74 @@
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+
+from media.utils import transcription
+from media.utils.transcription import TranscriptionEngine, plan_segments
+
+RATE = 16000
+
+
+def write_wav(path, pattern):
+    """(초, 소리 여부) 목록으로 16kHz 모노 WAV 생성"""
+    chunks = []
+    for seconds, voiced in pattern:
+        count = int(seconds * RATE)
+        if voiced:
+            chunks.append((np.sin(np.arange(count) * 0.1) * 8000).astype('<i2'))
+        else:
+            chunks.append(np.zeros(count, dtype='<i2'))
+    with wave.open(str(path), 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(RATE)
+        writer.writeframes(np.concatenate(chunks).tobytes())
+
+
+class FakeWhisper:
+    """지정한 순번의 요청을 항상 실패시키는 Whisper 클라이언트"""
+
+    def __init__(self, fail_calls=()):
+        self.fail_calls = set(fail_calls)
+        self.calls = 0
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self.create))
+
+    def create(self, model, file, response_format, timestamp_granularities):
+        with wave.open(file, 'rb') as reader:
+            duration = reader.getnframes() / reader.getframerate()
+        # 구간 길이로 어느 구간인지 구분 (앞 구간 2초, 뒤 구간 3초)
+        if round(duration) in self.fail_calls:
+            raise RuntimeError("whisper unavailable")
+        return SimpleNamespace(segments=[{'start': 0.0, 'end': duration, 'text': f"{round(duration)}초 구간"}],
+                               text='')
+
+
+def short_segments(monkeypatch):
+    monkeypatch.setattr(transcription, 'plan_segments',
+                        lambda energies: plan_segments(energies, target_sec=1.0, max_sec=10.0))
+
+
+def test_failed_piece_is_reported_as_gap(tmp_path, monkeypatch):
+    short_segments(monkeypatch)
+    audio = tmp_path / "speech.wav"
+    write_wav(audio, [(2, True), (1, False), (3, True)])
+    engine = TranscriptionEngine(FakeWhisper(fail_calls={3}), workers=2)
+
+    segments = engine.transcribe(str(audio))
+
+    assert [segment.text for segment in segments] == ["2초 구간"]
+    assert len(engine.gaps) == 1
+    start, end = engine.gaps[0]
+    assert 2.5 < start < 3.5 and 5.5 < end < 6.5
+
+
+def test_complete_transcript_has_no_gaps(tmp_path, monkeypatch):
+    short_segments(monkeypatch)
+    audio = tmp_path / "speech.wav"
+    write_wav(audio, [(2, True), (1, False), (3, True)])
+    engine = TranscriptionEngine(FakeWhisper(), workers=2)
+
+    segments = engine.transcribe(str(audio))
+
+    assert [segment.text for segment in segments] == ["2초 구간", "3초 구간"]
+    assert engine.gaps == []
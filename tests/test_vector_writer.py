@@ -0,0 +1,142 @@
+import threading
+
+from media.utils.vector_writer import BulkVectorWriter
+
+
+class FlakyStore:
+    """지정한 ID가 들어 있는 배치의 업서트를 실패시키는 벡터 저장소"""
+
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.vectors = {}
+
+    def upsert(self, vectors, namespace):
+        if any(vector['id'] in self.fail_ids for vector in vectors):
+            raise RuntimeError("upsert failed")
+        for vector in vectors:
+            self.vectors[vector['id']] = vector
+
+
+def make_vectors(file_path, count):
+    return [
+        {'id': f"{file_path}_{i}", 'values': [0.0], 'metadata': {'file_path': file_path}}
+        for i in range(count)
+    ]
+
+
+def test_track_excludes_files_with_failed_upsert():
+    store = FlakyStore(fail_ids={'b.jpg_1'})
+    writer = BulkVectorWriter(store, batch_size=2, max_workers=1)
+    try:
+        with writer.track() as written:
+            writer.add(make_vectors('a.jpg', 2), 'ns')
+            writer.add(make_vectors('b.jpg', 2), 'ns')
+            assert writer.flush() is False
+
+        assert dict(written) == {'a.jpg': ['a.jpg_0', 'a.jpg_1']}
+
+        # 저장소가 복구된 뒤 다시 처리하면 기록됨
+        store.fail_ids.clear()
+        with writer.track() as written:
+            writer.add(make_vectors('b.jpg', 2), 'ns')
+            assert writer.flush() is True
+
+        assert dict(written) == {'b.jpg': ['b.jpg_0', 'b.jpg_1']}
+    finally:
+        writer.close()
+
+
+def test_track_excludes_file_with_one_failed_batch_of_many():
+    store = FlakyStore(fail_ids={'c.pdf_3'})
+    writer = BulkVectorWriter(store, batch_size=2, max_workers=2)
+    try:
+        with writer.track() as written:
+            writer.add(make_vectors('c.pdf', 6), 'ns')
+            writer.add(make_vectors('d.pdf', 1), 'ns')
+            writer.flush()
+
+        assert dict(written) == {'d.pdf': ['d.pdf_0']}
+        assert 'c.pdf_0' in store.vectors    # 다른 배치는 저장됐지만 파일은 다시 처리 대상
+    finally:
+        writer.close()
+
+
+def test_track_excludes_vectors_never_flushed():
+    writer = BulkVectorWriter(FlakyStore(), batch_size=10, max_workers=1)
+    try:
+        with writer.track() as written:
+            writer.add(make_vectors('e.mp3', 1), 'ns')
+
+        assert dict(written) == {}
+    finally:
+        writer.close()
+
+
+def test_nested_track_reports_to_outer_block():
+    writer = BulkVectorWriter(FlakyStore(), batch_size=10, max_workers=1)
+    try:
+        with writer.track() as outer:
+            with writer.track() as inner:
+                writer.add(make_vectors('f.png', 1), 'ns')
+                writer.flush()
+
+        assert dict(inner) == {'f.png': ['f.png_0']}
+        assert dict(outer) == {'f.png': ['f.png_0']}
+    finally:
+        writer.close()
+
+
+def test_concurrent_jobs_only_see_their_own_failures():
+    store = FlakyStore(fail_ids={'a.jpg_0'})
+    writer = BulkVectorWriter(store, batch_size=1, max_workers=2)
+    a_added = threading.Event()
+    b_flushed = threading.Event()
+    results = {}
+
+    def job_a():
+        writer.add(make_vectors('a.jpg', 1), 'ns')    # 실패하는 배치
+        a_added.set()
+        b_flushed.wait(5.0)
+        results['A'] = writer.flush()
+
+    def job_b():
+        a_added.wait(5.0)
+        writer.add(make_vectors('b.jpg', 1), 'ns')
+        results['B'] = writer.flush()
+        b_flushed.set()
+
+    try:
+        threads = [threading.Thread(target=job_a), threading.Thread(target=job_b)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10.0)
+
+        assert results == {'A': False, 'B': True}
+        # 실패는 한 번만 보고됨
+        assert writer.flush() is True
+    finally:
+        writer.close()
+
+
+def test_flush_does_not_wait_for_other_threads_batches():
+    release = threading.Event()
+
+    class SlowStore(FlakyStore):
+        def upsert(self, vectors, namespace):
+            if any(vector['id'].startswith('slow') for vector in vectors):
+                release.wait(5.0)
+            super().upsert(vectors, namespace)
+
+    writer = BulkVectorWriter(SlowStore(), batch_size=1, max_workers=2)
+    try:
+        other = threading.Thread(target=lambda: writer.add(make_vectors('slow.mp4', 1), 'ns'))
+        other.start()
+        other.join()
+
+        writer.add(make_vectors('fast.jpg', 1), 'ns')
+        assert writer.flush() is True
+        assert 'slow.mp4_0' not in writer.vector_store.vectors
+    finally:
+        release.set()
+        writer.close()